@@ -4,14 +4,19 @@ import json
 import logging
 import os
 import re
-from typing import Any, Dict
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor as Pool
+from typing import Any, Dict, List
 
 import numpy
+import pandas as pd
 from requests import Response, Session
 from requests.adapters import HTTPAdapter
 from urllib3 import Retry
 
-from cognite.client.exceptions import APIError
+from cognite.client import _utils
+from cognite.client.exceptions import APIError, BulkOperationError
 
 log = logging.getLogger("cognite-sdk")
 
@@ -54,6 +59,8 @@ def _raise_API_error(res: Response):
         else:
             msg = error["message"]
             extra = error.get("extra")
+            if "missing" in error:
+                extra = dict(extra or {}, missing=error["missing"])
     except:
         msg = res.content
 
@@ -184,6 +191,165 @@ class APIClient:
         _log_request(res, body=body)
         return res
 
+    def _bulk_request(
+        self, method: str, url: str, items: List, limit: int = None, workers: int = None
+    ) -> List[Dict[str, Any]]:
+        """Sends items as {"items": [...]} bodies in chunks of at most `limit` items, in parallel.
+
+        If all items fit in a single request, errors are raised as is. Otherwise the remaining chunks are still sent
+        when a chunk fails, and a BulkOperationError with the items of the successful and failed chunks is raised.
+
+        Args:
+            method (str): "post" or "put".
+            url (str): The url to send the items to.
+            items (List): The items to send.
+            limit (int): Max number of items per request. Defaults to _LIMIT.
+            workers (int): Max number of requests to send in parallel. Defaults to the number of workers of the client.
+
+        Returns:
+            List[Dict]: The json bodies of the responses, in the same order as the items.
+        """
+        request = {"post": self._post, "put": self._put}[method]
+        chunks = _utils.split_into_chunks(items, limit or self._LIMIT)
+        if len(chunks) <= 1:
+            return [request(url, body={"items": chunk}).json() for chunk in chunks or [[]]]
+
+        with Pool(min(len(chunks), workers or self._num_of_workers or 1)) as p:
+            futures = [p.submit(request, url, body={"items": chunk}) for chunk in chunks]
+
+        responses = []
+        successful = []
+        failed = []
+        errors = []
+        for chunk, future in zip(chunks, futures):
+            try:
+                responses.append(future.result().json())
+                successful.extend(chunk)
+            except Exception as e:
+                failed.extend(chunk)
+                errors.append(e)
+        if errors:
+            first_error = errors[0]
+            raise BulkOperationError(
+                "{} of {} requests failed: {}".format(
+                    len(errors), len(chunks), getattr(first_error, "message", str(first_error))
+                ),
+                code=getattr(first_error, "code", None),
+                x_request_id=getattr(first_error, "x_request_id", None),
+                successful=successful,
+                failed=failed,
+                errors=errors,
+                responses=responses,
+            )
+        return responses
+
+    def _retrieve_by_ids(
+        self, url: str, ids: List[int], ignore_missing: bool = False, workers: int = None
+    ) -> List[Dict[str, Any]]:
+        """Retrieves items from a byids endpoint, in chunks of at most _LIMIT ids which are fetched in parallel.
+
+        Duplicate ids are only retrieved once. When a chunk is rejected because of unknown ids, the ids listed as
+        missing in the error are left out and the rest of the chunk is retrieved again.
+
+        Args:
+            url (str): The url of the byids endpoint.
+            ids (List[int]): The ids of the items to retrieve.
+            ignore_missing (bool): Whether or not to leave out missing ids instead of raising an APIError listing them
+                                   under extra["missing"].
+            workers (int): Max number of requests to send in parallel. Defaults to the number of workers of the client.
+
+        Returns:
+            List[Dict]: The items, in the order their ids were first given.
+        """
+        unique_ids = list(OrderedDict.fromkeys(ids))
+        chunks = _utils.split_into_chunks(unique_ids, self._LIMIT)
+        items_by_id = {}
+        if chunks:
+            with Pool(min(len(chunks), workers or self._num_of_workers or 1)) as p:
+                for items in p.map(lambda chunk: self._retrieve_chunk_by_ids(url, chunk), chunks):
+                    for item in items:
+                        items_by_id[item["id"]] = item
+
+        missing = [id for id in unique_ids if id not in items_by_id]
+        if missing and not ignore_missing:
+            raise APIError(
+                "{} of the requested ids were not found".format(len(missing)), 400, extra={"missing": missing}
+            )
+        return [items_by_id[id] for id in unique_ids if id in items_by_id]
+
+    def _retrieve_chunk_by_ids(self, url, ids):
+        try:
+            return self._post(url, body={"items": ids}).json()["data"]["items"]
+        except APIError as e:
+            missing = self._get_missing_ids(e)
+            remaining = [id for id in ids if id not in missing]
+            if e.code not in (400, 404) or len(remaining) == len(ids):
+                raise
+            return self._retrieve_chunk_by_ids(url, remaining) if remaining else []
+
+    @staticmethod
+    def _get_missing_ids(error):
+        missing = (error.extra or {}).get("missing") or []
+        return {item.get("id") if isinstance(item, dict) else item for item in missing}
+
+    def _search_with_partitions(self, url: str, params: Dict[str, Any], workers: int = None) -> List[Dict[str, Any]]:
+        """Gets all results of a search endpoint by partitioning the query on created time.
+
+        Search endpoints return at most _LIMIT results per query. Each partition of the minCreatedTime/maxCreatedTime
+        range is queried with the max limit, and partitions which hit the limit are bisected and queried again. All
+        partitions at the same level are queried in parallel.
+
+        Args:
+            url (str): The url of the search endpoint.
+            params (Dict): The query parameters of the search.
+            workers (int): Max number of requests to send in parallel. Defaults to the number of workers of the client.
+
+        Returns:
+            List[Dict]: The results of all partitions ordered by partition, without duplicates.
+        """
+
+        def search(partition):
+            partition_params = dict(params, minCreatedTime=partition[0], maxCreatedTime=partition[1])
+            partition_params.update(limit=self._LIMIT, offset=None)
+            return self._get(url, params=partition_params).json()["data"]["items"]
+
+        min_created_time = params.get("minCreatedTime") or 0
+        max_created_time = params.get("maxCreatedTime")
+        if max_created_time is None:
+            max_created_time = int(round(time.time() * 1000))
+
+        partitions = [(int(min_created_time), int(max_created_time))]
+        completed = []
+        with Pool(workers or self._num_of_workers or 1) as p:
+            while partitions:
+                next_partitions = []
+                for partition, items in zip(partitions, p.map(search, partitions)):
+                    if len(items) < self._LIMIT:
+                        completed.append((partition, items))
+                    elif partition[0] >= partition[1]:
+                        log.warning("More than %d results created at %d, some are left out", self._LIMIT, partition[0])
+                        completed.append((partition, items))
+                    else:
+                        middle = (partition[0] + partition[1]) // 2
+                        next_partitions.extend([(partition[0], middle), (middle + 1, partition[1])])
+                partitions = next_partitions
+
+        seen = set()
+        merged = []
+        for _, items in sorted(completed, key=lambda completed_partition: completed_partition[0]):
+            for item in items:
+                if item["id"] not in seen:
+                    seen.add(item["id"])
+                    merged.append(item)
+        return merged
+
+    @staticmethod
+    def _merge_item_responses(responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        items = []
+        for res in responses:
+            items.extend(res["data"]["items"])
+        return {"data": {"items": items}}
+
     @staticmethod
     def _json_dumps_default(x):
         if isinstance(x, numpy.int_):
@@ -259,11 +425,57 @@ class CogniteCollectionResponse(CogniteResponse):
     """
 
     _RESPONSE_CLASS = None
+    _CATEGORICAL_COLUMNS = ()
 
     def to_json(self):
         """Returns data as a json object"""
         return self.internal_representation["data"]["items"]
 
+    def to_pandas(self, columns: List[str] = None, include_metadata: bool = True):
+        """Returns data as a pandas dataframe
+
+        The dataframe is built column by column in a single pass over the items, with metadata keys as columns. Fields
+        holding only integers, like ids and timestamps, are int64, or the nullable Int64 if some items lack them, so
+        that large ids keep their precision. Repetitive string fields like type and source are categorical.
+
+        Args:
+            columns (List[str]): The columns to include, in order. Defaults to all fields and metadata keys.
+            include_metadata (bool): Whether or not to include metadata fields in the resulting dataframe
+        """
+        items = self.to_json()
+        if not items:
+            return pd.DataFrame(columns=columns)
+        data = _utils.to_columns(items, columns=columns, include_metadata=include_metadata)
+        for column, values in data.items():
+            if column in self._CATEGORICAL_COLUMNS:
+                data[column] = pd.Categorical(values)
+            elif self._is_integer_column(values):
+                data[column] = (
+                    pd.array(values, dtype="Int64") if None in values else numpy.array(values, dtype=numpy.int64)
+                )
+        return pd.DataFrame(data, columns=list(data))
+
+    @staticmethod
+    def _is_integer_column(values):
+        # bool is a subclass of int, so compare types exactly
+        return any(value is not None for value in values) and all(
+            type(value) is int or value is None for value in values
+        )
+
+    def to_arrow(self, columns: List[str] = None, include_metadata: bool = True):
+        """Returns data as a pyarrow Table
+
+        Requires pyarrow. The table has the same columns as the dataframe from to_pandas(), with the categorical
+        columns dictionary encoded.
+
+        Args:
+            columns (List[str]): The columns to include, in order. Defaults to all fields and metadata keys.
+            include_metadata (bool): Whether or not to include metadata fields in the resulting table
+        """
+        pa = _utils.import_pyarrow()
+        data = _utils.to_columns(self.to_json(), columns=columns, include_metadata=include_metadata)
+        return pa.Table.from_batches([_utils.to_record_batch(data, self._CATEGORICAL_COLUMNS)])
+
     def __getitem__(self, index):
         if isinstance(index, slice):
             return self.__class__({"data": {"items": self.to_json()[index]}})
@@ -0,0 +1,226 @@
+"""Decoder for serialized TimeseriesData messages which decodes datapoints directly into numpy arrays.
+
+Going through the generated protobuf classes creates a message object per datapoint, which is as slow as downloading
+the data. This decoder reads the wire format instead, where a NumericTimeseriesData message is a sequence of
+length-delimited NumericDatapoint records of the form [0x0A, length, 0x08, varint timestamp, 0x11, 8 byte double]. The
+timestamp and value fields are left out when they are zero. Messages which do not have this layout, e.g. because of
+unknown fields, are decoded with the generated classes instead.
+
+String datapoints have a length-delimited value instead, and are decoded into a categorical, since string time series
+usually repeat a few distinct values.
+"""
+import numpy as np
+import pandas as pd
+
+from cognite.client._auxiliary._protobuf_descriptors import _api_timeseries_data_v2_pb2
+
+_STRING_DATA_FIELD = 1
+_NUMERIC_DATA_FIELD = 2
+_POINTS_TAG = 0x0A
+_TIMESTAMP_TAG = 0x08
+_VALUE_TAG = 0x11
+_STRING_VALUE_TAG = 0x12
+_MAX_VARINT_SIZE = 10
+
+
+class _UnsupportedEncoding(Exception):
+    pass
+
+
+def decode_datapoints(content: bytes):
+    """Returns the timestamps and values of the numeric or string datapoints in a serialized TimeseriesData message.
+
+    Returns:
+        Tuple[numpy.ndarray, Union[numpy.ndarray, pandas.Categorical]]: The timestamps as int64, and the values as float64
+        for numeric data or as a categorical for string data.
+    """
+    try:
+        is_string_data = any(field == _STRING_DATA_FIELD for field, _, _ in _iter_fields(content))
+    except _UnsupportedEncoding:
+        ts_data = _api_timeseries_data_v2_pb2.TimeseriesData()
+        ts_data.ParseFromString(content)
+        is_string_data = ts_data.HasField("stringData")
+    if is_string_data:
+        return decode_string_datapoints(content)
+    return decode_numeric_datapoints(content)
+
+
+def decode_string_datapoints(content: bytes):
+    """Returns the timestamps and values of the string datapoints in a serialized TimeseriesData message.
+
+    Returns:
+        Tuple[numpy.ndarray, pandas.Categorical]: The timestamps as int64 and the values as a categorical.
+    """
+    try:
+        return _decode_string_datapoints(content)
+    except _UnsupportedEncoding:
+        return _decode_string_datapoints_with_protobuf(content)
+
+
+def decode_numeric_datapoints(content: bytes):
+    """Returns the timestamps and values of the numeric datapoints in a serialized TimeseriesData message.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: The timestamps as int64 and the values as float64.
+    """
+    try:
+        return _decode_numeric_datapoints(content)
+    except _UnsupportedEncoding:
+        return _decode_numeric_datapoints_with_protobuf(content)
+
+
+def _decode_numeric_datapoints_with_protobuf(content):
+    ts_data = _api_timeseries_data_v2_pb2.TimeseriesData()
+    ts_data.ParseFromString(content)
+    points = ts_data.numericData.points
+    return (
+        np.array([p.timestamp for p in points], dtype=np.int64),
+        np.array([p.value for p in points], dtype=np.float64),
+    )
+
+
+def _decode_string_datapoints_with_protobuf(content):
+    ts_data = _api_timeseries_data_v2_pb2.TimeseriesData()
+    ts_data.ParseFromString(content)
+    points = ts_data.stringData.points
+    return np.array([p.timestamp for p in points], dtype=np.int64), pd.Categorical([p.value for p in points])
+
+
+def _decode_string_datapoints(content):
+    data = _pad(content)
+    timestamps = []
+    values = []
+    for field, start, end in _iter_fields(content):
+        if field != _STRING_DATA_FIELD:
+            continue
+        pos, record_ends = _get_records(content, data, start, end)
+        region_timestamps, pos = _decode_timestamps(data, pos, record_ends)
+        has_value = (pos < record_ends) & (data[pos] == _STRING_VALUE_TAG)
+        lengths, length_sizes = _gather_varints(data, pos + 1, has_value)
+        value_starts = np.where(has_value, pos + 1 + length_sizes, pos)
+        pos = value_starts + np.where(has_value, lengths, 0).astype(np.int64)
+        if not (pos == record_ends).all():
+            raise _UnsupportedEncoding
+        timestamps.append(region_timestamps)
+        values.extend(content[a:b] for a, b in zip(value_starts.tolist(), pos.tolist()))
+    # Values are interned as raw bytes, and only the distinct values are decoded to strings
+    codes, categories = pd.factorize(np.array(values, dtype=object))
+    values = pd.Categorical.from_codes(codes, [value.decode("utf-8") for value in categories])
+    timestamps = np.concatenate(timestamps) if timestamps else np.array([], dtype=np.int64)
+    return timestamps, values
+
+
+def _decode_numeric_datapoints(content):
+    data = _pad(content)
+    timestamps = []
+    values = []
+    for field, start, end in _iter_fields(content):
+        if field != _NUMERIC_DATA_FIELD:
+            continue
+        region_timestamps, region_values = _decode_numeric_points(content, data, start, end)
+        timestamps.append(region_timestamps)
+        values.append(region_values)
+    if not timestamps:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+    if len(timestamps) == 1:
+        return timestamps[0], values[0]
+    return np.concatenate(timestamps), np.concatenate(values)
+
+
+def _pad(content):
+    # Zero padding lets the decoding read past the last record without bounds checks
+    return np.frombuffer(content + bytes(2 * _MAX_VARINT_SIZE + 8), dtype=np.uint8)
+
+
+def _iter_fields(content, start=0, end=None):
+    """Yields the field number and value range of each length-delimited field of a message."""
+    end = len(content) if end is None else end
+    pos = start
+    while pos < end:
+        key, pos = _read_varint(content, pos)
+        if key & 7 != 2:
+            raise _UnsupportedEncoding
+        length, pos = _read_varint(content, pos)
+        if pos + length > end:
+            raise _UnsupportedEncoding
+        yield key >> 3, pos, pos + length
+        pos += length
+
+
+def _read_varint(content, pos):
+    result = 0
+    shift = 0
+    while pos < len(content):
+        byte = content[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+    raise _UnsupportedEncoding
+
+
+def _get_records(content, data, start, end):
+    """Returns where the content of each point record in a range starts and ends."""
+    # Usually all records have the same length, so they can be checked at once. Otherwise the records are walked
+    # through using only their length bytes.
+    record_size = int(data[start + 1]) + 2 if end - start >= 2 and data[start + 1] < 0x80 else 0
+    if record_size > 2 and (end - start) % record_size == 0:
+        records = data[start:end].reshape(-1, record_size)
+        if (records[:, 0] == _POINTS_TAG).all() and (records[:, 1] == record_size - 2).all():
+            pos = np.arange(start + 2, end, record_size)
+            return pos, pos + (record_size - 2)
+
+    starts = []
+    ends = []
+    pos = start
+    while pos < end:
+        if content[pos] != _POINTS_TAG:
+            raise _UnsupportedEncoding
+        length = content[pos + 1] if pos + 1 < end else 0x80
+        if length & 0x80:
+            length, pos = _read_varint(content, pos + 1)
+        else:
+            pos += 2
+        starts.append(pos)
+        pos += length
+        ends.append(pos)
+    if pos != end:
+        raise _UnsupportedEncoding
+    return np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64)
+
+
+def _gather_varints(data, pos, mask):
+    """Returns the values and sizes of the varints starting at each position, which must be valid where mask is set."""
+    varint_bytes = data[pos[:, None] + np.arange(_MAX_VARINT_SIZE)]
+    is_last_byte = varint_bytes & 0x80 == 0
+    if not is_last_byte.any(axis=1)[mask].all():
+        raise _UnsupportedEncoding
+    sizes = is_last_byte.argmax(axis=1) + 1
+    in_varint = np.arange(_MAX_VARINT_SIZE) < sizes[:, None]
+    shifted = (varint_bytes & 0x7F).astype(np.uint64) << (7 * np.arange(_MAX_VARINT_SIZE, dtype=np.uint64))
+    return np.where(in_varint, shifted, np.uint64(0)).sum(axis=1, dtype=np.uint64), sizes
+
+
+def _decode_timestamps(data, pos, record_ends):
+    """Returns the timestamps of the records and the positions after them."""
+    has_timestamp = (pos < record_ends) & (data[pos] == _TIMESTAMP_TAG)
+    timestamps, sizes = _gather_varints(data, pos + 1, has_timestamp)
+    # Negative timestamps are encoded as 64 bit two's complement varints
+    timestamps = timestamps.view(np.int64)
+    timestamps[~has_timestamp] = 0
+    return timestamps, np.where(has_timestamp, pos + 1 + sizes, pos)
+
+
+def _decode_numeric_points(content, data, start, end):
+    pos, record_ends = _get_records(content, data, start, end)
+    timestamps, pos = _decode_timestamps(data, pos, record_ends)
+
+    has_value = (pos < record_ends) & (data[pos] == _VALUE_TAG)
+    values = np.ascontiguousarray(data[(pos + 1)[:, None] + np.arange(8)]).view("<f8").ravel().astype(np.float64)
+    values[~has_value] = 0.0
+    pos = np.where(has_value, pos + 9, pos)
+
+    if not (pos == record_ends).all():
+        raise _UnsupportedEncoding
+    return timestamps, values
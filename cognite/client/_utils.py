@@ -6,11 +6,14 @@ This module provides helper methods and different utilities for the Cognite API
 This module is protected and should not used by end-users.
 """
 import datetime
+import hashlib
+import itertools
 import platform
 import re
 import time
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Callable, List
+from typing import Callable, Dict, List
 
 import cognite.client
 
@@ -146,6 +149,70 @@ def get_user_agent():
     return "{} {} {}".format(sdk_version, python_version, operating_system)
 
 
+def get_file_md5(file_path, chunk_size=2 ** 20):
+    """Returns the hex md5 digest of a file, reading it in chunks to keep memory usage bounded."""
+    md5 = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def split_into_chunks(collection: List, chunk_size: int) -> List[List]:
+    """Returns the collection split into consecutive lists of at most chunk_size elements."""
+    return [collection[i : i + chunk_size] for i in range(0, len(collection), chunk_size)]
+
+
+def to_columns(items: List[Dict], columns: List[str] = None, include_metadata: bool = True) -> OrderedDict:
+    """Returns the values of the items by column in a single pass, with None for missing values.
+
+    Metadata keys are columns of their own, except for keys which are also the name of a field of any of the items, so
+    that metadata can't overwrite fields. Columns are ordered by first appearance unless columns is given.
+    """
+    selected = set(columns) if columns is not None else None
+    field_names = set(key for item in items for key in item) if include_metadata else set()
+    num_of_rows = len(items)
+    data = OrderedDict()
+    for i, item in enumerate(items):
+        fields = item.items()
+        if include_metadata and item.get("metadata"):
+            metadata = ((key, value) for key, value in item["metadata"].items() if key not in field_names)
+            fields = itertools.chain(fields, metadata)
+        for key, value in fields:
+            values = data.get(key)
+            if values is None:
+                if key == "metadata" or (selected is not None and key not in selected):
+                    continue
+                values = data[key] = [None] * num_of_rows
+            values[i] = value
+    if columns is not None:
+        data = OrderedDict((column, data.get(column, [None] * num_of_rows)) for column in columns)
+    return data
+
+
+def import_pyarrow():
+    """Returns the pyarrow module, which is an optional dependency."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for Arrow output, install it with 'pip install cognite-sdk[arrow]'"
+        ) from e
+    return pyarrow
+
+
+def to_record_batch(columns: OrderedDict, dictionary_columns=()):
+    """Returns a pyarrow RecordBatch of the columns, with the dictionary_columns dictionary encoded."""
+    pa = import_pyarrow()
+    arrays = []
+    for name, values in columns.items():
+        array = pa.array(values)
+        if name in dictionary_columns and pa.types.is_string(array.type):
+            array = array.dictionary_encode()
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, list(columns))
+
+
 def _round_to_nearest(x, base):
     return int(base * round(float(x) / base))
 
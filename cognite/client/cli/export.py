@@ -0,0 +1,63 @@
+"""Command line tool for exporting datapoints to Parquet files, installed as ``cognite-export``.
+
+Credentials and other client settings are read from the same environment variables as CogniteClient.
+"""
+import argparse
+import sys
+
+from cognite.client import CogniteClient
+
+
+def _parse_time(value):
+    return int(value) if value.lstrip("-").isdigit() else value
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="cognite-export", description="Export datapoints to Parquet files partitioned by time series and time."
+    )
+    parser.add_argument("time_series", nargs="*", help="Names of the time series to export.")
+    parser.add_argument("--time-series-file", help="File with the names of more time series to export, one per line.")
+    parser.add_argument("--start", type=_parse_time, required=True, help="Start time in ms since epoch or e.g. 1w-ago.")
+    parser.add_argument("--end", type=_parse_time, default="now", help="End time. Defaults to now.")
+    parser.add_argument("-o", "--directory", required=True, help="Directory to write the files to.")
+    parser.add_argument("--bucket-size", default="1d", help="Time span of each file. Defaults to 1d.")
+    parser.add_argument("--aggregates", help="Comma separated aggregates to export instead of raw datapoints.")
+    parser.add_argument("--granularity", help="Granularity of the aggregates.")
+    parser.add_argument("--workers", type=int, help="Number of time series to export in parallel.")
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Ignore the progress of an earlier export. Resuming requires the same absolute start and end time.",
+    )
+    args = parser.parse_args(argv)
+
+    time_series = list(args.time_series)
+    if args.time_series_file:
+        with open(args.time_series_file) as f:
+            time_series.extend(line.strip() for line in f if line.strip())
+    if not time_series:
+        parser.error("no time series given")
+    args.time_series = time_series
+    return args
+
+
+def main(argv=None):
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    client = CogniteClient()
+    counts = client.datapoints.export_datapoints_to_parquet(
+        args.time_series,
+        start=args.start,
+        end=args.end,
+        directory=args.directory,
+        bucket_size=args.bucket_size,
+        aggregates=args.aggregates.split(",") if args.aggregates else None,
+        granularity=args.granularity,
+        workers=args.workers,
+        resume=not args.no_resume,
+    )
+    print("Exported {} datapoints from {} time series".format(sum(counts.values()), len(counts)))
+
+
+if __name__ == "__main__":
+    main()
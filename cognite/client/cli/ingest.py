@@ -0,0 +1,224 @@
+"""Command line tool for bulk loading CSV and Parquet files into time series, installed as ``cognite-ingest``.
+
+Files are either in wide format, with a timestamp column and a column per time series, or in long format, with a
+timestamp, a name and a value column. Credentials and other client settings are read from the same environment
+variables as CogniteClient.
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from cognite.client import APIError, CogniteClient, _utils
+from cognite.client.stable.time_series import TimeSeries
+
+_DATAPOINTS_PER_REQUEST = 100000
+
+
+def read_file(path, wide=True, timestamp_column="timestamp", name_column="name", value_column="value"):
+    """Returns the datapoints in a CSV or Parquet file as a dict from time series name to timestamp and value arrays.
+
+    Timestamps may be numbers in ms since epoch or date strings. Rows without a value are skipped.
+    """
+    if path.endswith(".parquet"):
+        _utils.import_pyarrow()
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+    if timestamp_column not in df.columns:
+        raise ValueError("{} has no '{}' column".format(path, timestamp_column))
+    timestamps = _to_ms(df[timestamp_column])
+
+    if wide:
+        columns = [(name, timestamps, df[name]) for name in df.columns if name != timestamp_column]
+    else:
+        columns = [
+            (name, timestamps[positions], df[value_column].iloc[positions])
+            for name, positions in df.groupby(name_column, sort=False).indices.items()
+        ]
+
+    datapoints = {}
+    for name, column_timestamps, values in columns:
+        present = values.notnull().values
+        values = values.values[present]
+        if values.dtype.kind in "biuf":
+            values = values.astype(np.float64)
+        datapoints[str(name)] = (column_timestamps[present], values)
+    return datapoints
+
+
+def _to_ms(timestamps):
+    if timestamps.dtype.kind in "iuf":
+        return timestamps.values.astype(np.int64)
+    return pd.to_datetime(timestamps, utc=True).values.astype("datetime64[ns]").astype(np.int64) // 10 ** 6
+
+
+def create_missing_time_series(client, datapoints, workers=None):
+    """Creates the time series which do not exist, and returns the names of the ones which were created.
+
+    Time series are created in chunks. When a chunk is rejected because some of its time series exist, the ones listed
+    as duplicates in the error are left out and the rest of the chunk is posted again. If the error does not list them,
+    the chunk is split in two and retried until the existing time series are singled out.
+    """
+    time_series = [
+        TimeSeries(name, is_string=values.dtype.kind not in "biuf") for name, (_, values) in datapoints.items()
+    ]
+
+    def create(chunk):
+        if not chunk:
+            return []
+        try:
+            client.time_series.post_time_series(chunk)
+            return [ts.name for ts in chunk]
+        except APIError as e:
+            if e.code != 409:
+                raise
+            duplicates = _get_duplicate_names(e)
+            remaining = [ts for ts in chunk if ts.name not in duplicates]
+            if len(remaining) < len(chunk):
+                return create(remaining)
+            if len(chunk) == 1:
+                return []
+            return create(chunk[: len(chunk) // 2]) + create(chunk[len(chunk) // 2 :])
+
+    with ThreadPoolExecutor(workers or client._num_of_workers) as p:
+        created = p.map(create, _utils.split_into_chunks(time_series, 1000))
+    return [name for names in created for name in names]
+
+
+def _get_duplicate_names(error):
+    extra = getattr(error, "extra", None) or {}
+    duplicates = extra.get("duplicates") or extra.get("duplicated") or []
+    return {duplicate.get("name") if isinstance(duplicate, dict) else duplicate for duplicate in duplicates}
+
+
+def get_batches(datapoints, batch_size=_DATAPOINTS_PER_REQUEST):
+    """Splits the datapoints into batches of at most batch_size datapoints, each becoming a single request."""
+    batches = [[]]
+    batch_count = 0
+    for name, (timestamps, values) in datapoints.items():
+        for i in range(0, len(timestamps), batch_size):
+            chunk = (name, timestamps[i : i + batch_size], values[i : i + batch_size])
+            if batch_count + len(chunk[1]) > batch_size:
+                batches.append([])
+                batch_count = 0
+            batches[-1].append(chunk)
+            batch_count += len(chunk[1])
+    return [batch for batch in batches if batch]
+
+
+def upload(client, datapoints, batch_size=_DATAPOINTS_PER_REQUEST, workers=None, retries=3, out=sys.stderr):
+    """Posts the datapoints in parallel batches, retrying failed batches, and returns the batches which still failed.
+
+    Progress is reported to out as datapoints per second.
+    """
+    batches = get_batches(datapoints, min(batch_size, _DATAPOINTS_PER_REQUEST))
+    total = sum(len(timestamps) for batch in batches for _, timestamps, _ in batch)
+    start_time = time.time()
+    uploaded = 0
+    failed = []
+
+    def post(batch):
+        for attempt in range(retries + 1):
+            try:
+                client.datapoints._post("/timeseries/data", body=_to_request_body(batch))
+                return
+            except Exception:
+                if attempt == retries:
+                    raise
+                time.sleep(2 ** attempt)
+
+    with ThreadPoolExecutor(workers or client._num_of_workers) as p:
+        futures = {p.submit(post, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            if future.exception() is not None:
+                failed.append(batch)
+                out.write("Failed to upload batch: {}\n".format(future.exception()))
+                continue
+            uploaded += sum(len(timestamps) for _, timestamps, _ in batch)
+            elapsed = max(time.time() - start_time, 1e-9)
+            out.write("Uploaded {}/{} datapoints ({:.0f} dps/s)\n".format(uploaded, total, uploaded / elapsed))
+    return failed
+
+
+def _to_request_body(batch):
+    # Batches are within the request limit, so the body is built straight from the arrays
+    return {
+        "items": [
+            {
+                "name": name,
+                "datapoints": [{"timestamp": t, "value": v} for t, v in zip(timestamps.tolist(), values.tolist())],
+            }
+            for name, timestamps, values in batch
+        ]
+    }
+
+
+def _merge(datapoints_per_file):
+    merged = {}
+    for datapoints in datapoints_per_file:
+        for name, (timestamps, values) in datapoints.items():
+            if name in merged:
+                timestamps = np.concatenate([merged[name][0], timestamps])
+                values = np.concatenate([merged[name][1], values])
+            merged[name] = (timestamps, values)
+    return merged
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(prog="cognite-ingest", description="Load CSV and Parquet files into time series.")
+    parser.add_argument("files", nargs="+", help="CSV or Parquet files to load.")
+    parser.add_argument("--long", action="store_true", help="Files are in long format instead of wide format.")
+    parser.add_argument("--timestamp-column", default="timestamp", help="Name of the timestamp column.")
+    parser.add_argument("--name-column", default="name", help="Name of the time series name column in long format.")
+    parser.add_argument("--value-column", default="value", help="Name of the value column in long format.")
+    parser.add_argument("--no-create", action="store_true", help="Do not create missing time series.")
+    parser.add_argument("--processes", type=int, help="Number of processes parsing files. Defaults to the CPU count.")
+    parser.add_argument("--workers", type=int, help="Number of parallel upload requests.")
+    parser.add_argument("--batch-size", type=int, default=_DATAPOINTS_PER_REQUEST, help="Max datapoints per request.")
+    parser.add_argument("--retries", type=int, default=3, help="Number of retries of a failed batch. Defaults to 3.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    client = CogniteClient()
+
+    start_time = time.time()
+    with ProcessPoolExecutor(args.processes) as p:
+        datapoints_per_file = p.map(
+            read_file,
+            args.files,
+            [not args.long] * len(args.files),
+            [args.timestamp_column] * len(args.files),
+            [args.name_column] * len(args.files),
+            [args.value_column] * len(args.files),
+        )
+        datapoints = _merge(datapoints_per_file)
+    num_of_rows = sum(len(timestamps) for timestamps, _ in datapoints.values())
+    elapsed = time.time() - start_time
+    print("Read {} datapoints for {} time series in {:.1f}s".format(num_of_rows, len(datapoints), elapsed))
+
+    if not args.no_create:
+        created = create_missing_time_series(client, datapoints, workers=args.workers)
+        print("Created {} time series".format(len(created)))
+
+    start_time = time.time()
+    failed = upload(client, datapoints, batch_size=args.batch_size, workers=args.workers, retries=args.retries)
+    elapsed = max(time.time() - start_time, 1e-9)
+    num_of_failed = sum(len(timestamps) for batch in failed for _, timestamps, _ in batch)
+    num_of_uploaded = num_of_rows - num_of_failed
+    print(
+        "Uploaded {} datapoints in {:.1f}s ({:.0f} dps/s)".format(num_of_uploaded, elapsed, num_of_uploaded / elapsed)
+    )
+    if failed:
+        print("Failed to upload {} datapoints in {} batches".format(num_of_failed, len(failed)))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
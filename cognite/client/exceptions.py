@@ -44,3 +44,41 @@ class APIError(Exception):
                 self.message, self.code, self.x_request_id, pretty_extra
             )
         return "{} | code: {} | X-Request-ID: {}".format(self.message, self.code, self.x_request_id)
+
+
+class BulkOperationError(APIError):
+    """Cognite Bulk Operation Error
+
+    Raised if some of the requests of an operation which was split into several requests fail.
+
+    Args:
+        message (str):  The error message of the first failed request
+        code (int):     The error code of the first failed request
+        x_request_id (str): The request-id of the first failed request.
+        successful (List):  The items which were sent in successful requests.
+        failed (List):      The items which were sent in failed requests.
+        errors (List[Exception]): The errors raised by the failed requests.
+        responses (List[Dict]): The json bodies of the successful responses.
+
+    Examples:
+        Retrying the assets which failed to be created::
+
+            from cognite.client import CogniteClient
+            from cognite.client.exceptions import BulkOperationError
+
+            client = CogniteClient()
+
+            try:
+                client.assets.post_assets(assets)
+            except BulkOperationError as e:
+                client.assets.post_assets(e.failed)
+    """
+
+    def __init__(
+        self, message, code=None, x_request_id=None, successful=None, failed=None, errors=None, responses=None
+    ):
+        super().__init__(message, code, x_request_id)
+        self.successful = successful or []
+        self.failed = failed or []
+        self.errors = errors or []
+        self.responses = responses or []
@@ -1,10 +1,24 @@
+import hashlib
+import json
+import logging
 import os
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from concurrent.futures.thread import ThreadPoolExecutor
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
+from cognite.client import _utils
 from cognite.client._api_client import APIClient, CogniteCollectionResponse, CogniteResponse
 from cognite.client.exceptions import APIError
 
+log = logging.getLogger("cognite-sdk")
+
+_ARTIFACTS_MANIFEST_FILE_NAME = ".artifacts_manifest.json"
+
 
 class ModelResponse(CogniteResponse):
     def __init__(self, internal_representation):
@@ -76,6 +90,400 @@ class PredictionError(APIError):
     pass
 
 
+class PredictionCache:
+    """Cache of online predictions, evicting the least recently used predictions first.
+
+    Pass the cache to ModelsClient.online_predict() to avoid sending instances which have already been predicted on the
+    same model version with the same args. Predictions are cached per instance, keyed on a hash of the serialized
+    instance. When predicting on a model's active version, the active version id is looked up at most every
+    active_version_ttl seconds, so that predictions made by a previously active version are not returned.
+
+    Args:
+        max_size (int): Maximum number of predictions to keep. Defaults to 10000.
+        ttl (float): Number of seconds a prediction remains valid. Defaults to None, meaning they do not expire.
+        active_version_ttl (float): Number of seconds to trust a looked up active version of a model. Defaults to 10.
+
+    Examples:
+        Caching predictions on the active version of a model::
+
+            client = CogniteClient()
+            cache = PredictionCache(max_size=100000, ttl=3600)
+            predictions = client.experimental.model_hosting.models.online_predict(
+                model_id=123, instances=[1, 2, 3], cache=cache
+            )
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = None, active_version_ttl: float = 10):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.active_version_ttl = active_version_ttl
+        self._lock = threading.Lock()
+        self._predictions = OrderedDict()
+        self._active_version_ids = {}
+
+    def __len__(self):
+        return len(self._predictions)
+
+    def clear(self) -> None:
+        """Remove all cached predictions and active versions."""
+        with self._lock:
+            self._predictions.clear()
+            self._active_version_ids.clear()
+
+    def _get(self, key):
+        with self._lock:
+            if key not in self._predictions:
+                return False, None
+            expires_at, prediction = self._predictions[key]
+            if expires_at is not None and expires_at < time.time():
+                del self._predictions[key]
+                return False, None
+            self._predictions.move_to_end(key)
+            return True, prediction
+
+    def _put(self, key, prediction):
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._predictions[key] = (expires_at, prediction)
+            self._predictions.move_to_end(key)
+            while len(self._predictions) > self.max_size:
+                self._predictions.popitem(last=False)
+
+    def _get_active_version_id(self, model_id, lookup):
+        with self._lock:
+            checked_at, version_id = self._active_version_ids.get(model_id, (None, None))
+        if checked_at is None or checked_at + self.active_version_ttl < time.time():
+            version_id = lookup()
+            with self._lock:
+                self._active_version_ids[model_id] = (time.time(), version_id)
+        return version_id
+
+
+class OnlinePredictionBatcher:
+    """Collects instances from concurrent callers and sends them to a model in batches.
+
+    Each call to predict() returns immediately with a future. Instances are gathered until max_batch_size instances
+    are waiting or the oldest one has waited max_latency_ms, and are then sent in a single online prediction request.
+    The predictions are handed back to the callers through their futures.
+
+    Args:
+        models_client (experimental.model_hosting.models.ModelsClient): The client to send predictions through.
+        model_id (int): Perform predictions on the model with this id.
+        version_id (int): Use this version instead of the active version. (optional)
+        args (Dict[str, Any]): Dictionary of keyword arguments to pass to your predict method.
+        max_batch_size (int): Maximum number of instances to send in one request. Defaults to 100.
+        max_latency_ms (float): Maximum time to wait for more instances before sending a request. Defaults to 10.
+        max_concurrent_requests (int): Maximum number of batches in flight at once. Defaults to 4.
+        cache (experimental.model_hosting.models.PredictionCache): Cache to pass on to online_predict(). (optional)
+
+    Examples:
+        Sharing a batcher between request handling threads in a web service::
+
+            client = CogniteClient()
+            batcher = OnlinePredictionBatcher(client.experimental.model_hosting.models, model_id=123)
+
+            def handle_request(instance):
+                return batcher.predict(instance).result()
+
+            # When shutting down
+            batcher.close()
+    """
+
+    _CLOSE = object()
+
+    def __init__(
+        self,
+        models_client,
+        model_id: int,
+        version_id: int = None,
+        args: Dict[str, Any] = None,
+        max_batch_size: int = 100,
+        max_latency_ms: float = 10,
+        max_concurrent_requests: int = 4,
+        cache: PredictionCache = None,
+    ):
+        self._models_client = models_client
+        self._model_id = model_id
+        self._version_id = version_id
+        self._args = args
+        self._max_batch_size = max_batch_size
+        self._max_latency = max_latency_ms / 1000
+        self._cache = cache
+        self._queue = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_concurrent_requests)
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._collect_batches, daemon=True)
+        self._thread.start()
+
+    def predict(self, instance) -> Future:
+        """Queue an instance for prediction.
+
+        Args:
+            instance: JSON serializable instance to pass to your model.
+
+        Returns:
+            concurrent.futures.Future: A future which resolves to the prediction for this instance.
+        """
+        future = Future()
+        # Checked and queued under the lock, so that nothing is queued after the close marker
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot predict using a closed batcher")
+            self._queue.put((instance, future))
+        return future
+
+    def close(self) -> None:
+        """Send any queued instances and wait for all outstanding predictions to complete."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(self._CLOSE)
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+        # Fail anything the worker did not pick up before it stopped, rather than leaving callers waiting forever
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not self._CLOSE and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(RuntimeError("The batcher was closed before the instance was sent"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _collect_batches(self):
+        closing = False
+        while not closing:
+            item = self._queue.get()
+            if item is self._CLOSE:
+                break
+            batch = [item]
+            deadline = time.time() + self._max_latency
+            while len(batch) < self._max_batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0, deadline - time.time()))
+                except queue.Empty:
+                    break
+                if item is self._CLOSE:
+                    closing = True
+                    break
+                batch.append(item)
+            self._executor.submit(self._send_batch, batch)
+
+    def _send_batch(self, batch):
+        # Callers may have cancelled their futures while waiting in the queue
+        batch = [(instance, future) for instance, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            predictions = self._models_client.online_predict(
+                self._model_id,
+                self._version_id,
+                instances=[instance for instance, _ in batch],
+                args=self._args,
+                cache=self._cache,
+            )
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        if len(predictions) != len(batch):
+            # There is no telling which prediction belongs to which instance, so fail them all
+            error = PredictionError("Got {} predictions for {} instances".format(len(predictions), len(batch)))
+            for _, future in batch:
+                future.set_exception(error)
+            return
+        for (_, future), prediction in zip(batch, predictions):
+            future.set_result(prediction)
+
+
+class ModelVersionWaiter:
+    """Waits for model versions to finish training or deployment.
+
+    All tracked versions are polled together in a background thread, using a single listing of versions per model
+    rather than one request per version. The polling interval grows exponentially with random jitter while versions
+    are pending, so that many waiters do not end up polling in lockstep.
+
+    Args:
+        models_client (experimental.model_hosting.models.ModelsClient): The client to poll through.
+        initial_poll_interval (float): Seconds to wait before the first poll. Defaults to 1.
+        max_poll_interval (float): Maximum number of seconds between polls. Defaults to 60.
+        backoff_factor (float): Factor to multiply the polling interval by after each poll. Defaults to 2.
+        timeout (float): Seconds to wait for each version before giving up. Defaults to None, meaning wait forever.
+        terminal_statuses (List[str]): Statuses which end the wait. Defaults to ["READY", "FAILED"].
+        not_found_grace_period (float): Seconds a version may be missing from the listings before it is reported as not
+                                        found, since newly created versions may take a while to be listed. Defaults
+                                        to 60.
+
+    Examples:
+        Waiting for many training jobs to complete::
+
+            client = CogniteClient()
+            models = client.experimental.model_hosting.models
+
+            with ModelVersionWaiter(models, timeout=3600) as waiter:
+                futures = [
+                    waiter.wait_for(model_id, models.train_and_deploy_model_version(...).id) for ... in ...
+                ]
+                for future in futures:
+                    version = future.result()
+                    print(version.id, version.status, version.error_msg)
+    """
+
+    def __init__(
+        self,
+        models_client,
+        initial_poll_interval: float = 1,
+        max_poll_interval: float = 60,
+        backoff_factor: float = 2,
+        timeout: float = None,
+        terminal_statuses: List[str] = None,
+        not_found_grace_period: float = 60,
+    ):
+        self._models_client = models_client
+        self._initial_poll_interval = initial_poll_interval
+        self._max_poll_interval = max_poll_interval
+        self._backoff_factor = backoff_factor
+        self._timeout = timeout
+        self._terminal_statuses = set(terminal_statuses or ["READY", "FAILED"])
+        self._not_found_grace_period = not_found_grace_period
+        self._pending = {}
+        self._missing_since = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._poll_until_closed, daemon=True)
+        self._thread.start()
+
+    def wait_for(self, model_id: int, version_id: int) -> Future:
+        """Start tracking a model version.
+
+        Args:
+            model_id (int): Id of model which has the model version.
+            version_id (int): Id of model version.
+
+        Returns:
+            concurrent.futures.Future: A future which resolves to the ModelVersionResponse of the version once it has
+            reached a terminal status.
+        """
+        deadline = time.time() + self._timeout if self._timeout is not None else None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot wait using a closed waiter")
+            # Only wake up an idle poller, so that adding versions does not cut the current polling interval short
+            was_idle = not self._pending
+            if (model_id, version_id) not in self._pending:
+                self._pending[(model_id, version_id)] = (Future(), deadline)
+            future = self._pending[(model_id, version_id)][0]
+        if was_idle:
+            self._wakeup.set()
+        return future
+
+    def close(self) -> None:
+        """Stop polling and cancel the futures of all versions which are still pending."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        with self._lock:
+            for future, _ in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _poll_until_closed(self):
+        try:
+            poll_interval = self._initial_poll_interval
+            while not self._closed:
+                if not self._pending:
+                    self._wakeup.wait()
+                    self._wakeup.clear()
+                    poll_interval = self._initial_poll_interval
+                    continue
+                self._wakeup.wait(timeout=poll_interval * random.uniform(0.5, 1.5))
+                self._wakeup.clear()
+                if self._closed:
+                    break
+                try:
+                    self._poll()
+                except Exception as e:
+                    log.warning("Failed to poll model versions: {}".format(e))
+                poll_interval = min(poll_interval * self._backoff_factor, self._max_poll_interval)
+        except BaseException as e:
+            # Nothing will resolve the pending futures once the poller is gone, so fail them instead of hanging
+            with self._lock:
+                self._closed = True
+                pending = list(self._pending.values())
+                self._pending.clear()
+            for future, _ in pending:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+
+    def _poll(self):
+        with self._lock:
+            pending = dict(self._pending)
+        for model_id in {model_id for model_id, _ in pending}:
+            try:
+                versions_by_id = {
+                    version.id: version
+                    for version in self._models_client.list_model_versions(model_id, autopaging=True)
+                }
+            except Exception as e:
+                # Keep polling, but still let versions of this model time out
+                log.warning("Failed to list versions of model {}: {}".format(model_id, e))
+                versions_by_id = None
+            for (pending_model_id, version_id), (future, deadline) in pending.items():
+                if pending_model_id != model_id:
+                    continue
+                version = versions_by_id.get(version_id) if versions_by_id is not None else None
+                if versions_by_id is not None and self._is_not_found(model_id, version_id, version):
+                    self._resolve(model_id, version_id, exception=APIError("Model version not found", code=404))
+                elif version is not None and version.status in self._terminal_statuses:
+                    self._resolve(model_id, version_id, result=version)
+                elif deadline is not None and deadline < time.time():
+                    if version is not None:
+                        message = "Model version {} still has status {}".format(version_id, version.status)
+                    elif versions_by_id is not None:
+                        message = "Timed out waiting for model version {}, which was not found".format(version_id)
+                    else:
+                        message = "Timed out waiting for model version {}, which could not be polled".format(version_id)
+                    self._resolve(model_id, version_id, exception=TimeoutError(message))
+
+    def _is_not_found(self, model_id, version_id, version):
+        # The listings are eventually consistent, so only give up on versions which have been missing for a while
+        if version is not None:
+            self._missing_since.pop((model_id, version_id), None)
+            return False
+        missing_since = self._missing_since.setdefault((model_id, version_id), time.time())
+        return time.time() - missing_since >= self._not_found_grace_period
+
+    def _resolve(self, model_id, version_id, result=None, exception=None):
+        with self._lock:
+            future, _ = self._pending.pop((model_id, version_id))
+        self._missing_since.pop((model_id, version_id), None)
+        # The caller may have cancelled the future
+        if future.done():
+            return
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+
 class ModelsClient(APIClient):
     def __init__(self, **kwargs):
         super().__init__(version="0.6", **kwargs)
@@ -351,6 +759,27 @@ class ModelsClient(APIClient):
         res = self._get(url)
         return ModelVersionResponse(res.json())
 
+    def wait_for_model_versions(
+        self, model_versions: List[Tuple[int, int]], timeout: float = None, max_poll_interval: float = 60
+    ) -> List[ModelVersionResponse]:
+        """Wait for model versions to finish training or deployment.
+
+        The versions are polled together with exponential backoff, using one listing of versions per model. See
+        ModelVersionWaiter for waiting on versions without blocking.
+
+        Args:
+            model_versions (List[Tuple[int, int]]): List of (model id, version id) pairs to wait for.
+            timeout (float): Maximum number of seconds to wait. Defaults to None, meaning wait forever.
+            max_poll_interval (float): Maximum number of seconds between polls. Defaults to 60.
+
+        Returns:
+            List[experimental.model_hosting.models.ModelVersionResponse]: The model versions in the order they were
+            given, each having status READY or FAILED.
+        """
+        with ModelVersionWaiter(self, timeout=timeout, max_poll_interval=max_poll_interval) as waiter:
+            futures = [waiter.wait_for(model_id, version_id) for model_id, version_id in model_versions]
+            return [future.result() for future in futures]
+
     def update_model_version(
         self, model_id: int, version_id: int, description: str = None, metadata: Dict[str, str] = None
     ) -> ModelVersionResponse:
@@ -403,7 +832,13 @@ class ModelsClient(APIClient):
         self._delete(url)
 
     def online_predict(
-        self, model_id: int, version_id: int = None, instances: List = None, args: Dict[str, Any] = None
+        self,
+        model_id: int,
+        version_id: int = None,
+        instances: List = None,
+        args: Dict[str, Any] = None,
+        chunk_size: int = None,
+        cache: PredictionCache = None,
     ) -> List:
         """Perform online prediction on a models active version or a specified version.
 
@@ -412,15 +847,63 @@ class ModelsClient(APIClient):
             version_id (int):   Use this version instead of the active version. (optional)
             instances (List): List of JSON serializable instances to pass to your model one-by-one.
             args (Dict[str, Any])    Dictinoary of keyword arguments to pass to your predict method.
+            chunk_size (int):   Split the instances into requests of at most this many instances and send them in
+                                parallel. (optional)
+            cache (experimental.model_hosting.models.PredictionCache): Return cached predictions for instances which
+                                have been predicted on the same model version with the same args before, and only send
+                                the remaining instances to the model. (optional)
 
         Returns:
             List: List of predictions for each instance.
         """
-        url = "/analytics/models/{}/predict".format(model_id)
         if instances:
             for i, instance in enumerate(instances):
                 if hasattr(instance, "dump"):
                     instances[i] = instance.dump()
+        if cache is not None and instances:
+            if version_id is None:
+                version_id = cache._get_active_version_id(model_id, lambda: self.get_model(model_id).active_version_id)
+            if version_id is not None:
+                return self._online_predict_with_cache(model_id, version_id, instances, args, chunk_size, cache)
+        return self._online_predict_in_chunks(model_id, version_id, instances, args, chunk_size)
+
+    def _online_predict_with_cache(self, model_id, version_id, instances, args, chunk_size, cache):
+        args_hash = self._hash_json(args or {})
+        keys = [(model_id, version_id, args_hash, self._hash_json(instance)) for instance in instances]
+        predictions = {}
+        missing = {}
+        for key, instance in zip(keys, instances):
+            found, prediction = cache._get(key)
+            if found:
+                predictions[key] = prediction
+            elif key not in missing:
+                missing[key] = instance
+        if missing:
+            missing_predictions = self._online_predict_in_chunks(
+                model_id, version_id, list(missing.values()), args, chunk_size
+            )
+            for key, prediction in zip(missing, missing_predictions):
+                cache._put(key, prediction)
+                predictions[key] = prediction
+        return [predictions[key] for key in keys]
+
+    def _hash_json(self, obj):
+        return hashlib.sha1(json.dumps(obj, sort_keys=True, default=self._json_dumps_default).encode()).hexdigest()
+
+    def _online_predict_in_chunks(self, model_id, version_id, instances, args, chunk_size):
+        if chunk_size and instances and len(instances) > chunk_size:
+            tasks = [
+                (model_id, version_id, instances[i : i + chunk_size], args)
+                for i in range(0, len(instances), chunk_size)
+            ]
+            predictions = []
+            for chunk_predictions in self._execute_tasks_concurrently(self._online_predict, tasks):
+                predictions.extend(chunk_predictions)
+            return predictions
+        return self._online_predict(model_id, version_id, instances, args)
+
+    def _online_predict(self, model_id, version_id, instances, args):
+        url = "/analytics/models/{}/predict".format(model_id)
         if version_id:
             url = "/analytics/models/{}/versions/{}/predict".format(model_id, version_id)
         body = {"instances": instances, "args": args or {}}
@@ -483,23 +966,120 @@ class ModelsClient(APIClient):
         upload_url = res.json()["data"]["uploadUrl"]
         self._upload_file(upload_url, file_path)
 
-    def upload_artifacts_from_directory(self, model_id: int, version_id: int, directory: str) -> None:
+    def upload_artifacts_from_directory(
+        self, model_id: int, version_id: int, directory: str, sync: bool = False
+    ) -> None:
         """Upload all files in directory recursively.
 
+        If sync is True, files which are already uploaded to the model version and have not changed since will be
+        skipped. A file is considered unchanged if its size matches the artifact listed on the model version and its md5
+        hash matches the one recorded in a manifest file which is kept in the directory.
+
         Args:
             model_id (int): The id of the model.
             version_id (int): The id of the model version to upload the artifacts to.
             directory (int): Absolute path of directory to upload artifacts from.
+            sync (bool): Only upload new or changed files. Defaults to False.
         Returns:
             None
         """
+        manifest = {}
+        artifact_sizes = {}
+        if sync:
+            manifest = self._read_artifacts_manifest(directory, model_id, version_id)
+            artifact_sizes = {artifact.name: artifact.size for artifact in self.list_artifacts(model_id, version_id)}
+
+        synced = {}
         upload_tasks = []
         for root, dirs, files in os.walk(directory):
             for file_name in files:
                 file_path = os.path.join(root, file_name)
                 full_file_name = os.path.relpath(file_path, directory)
-                upload_tasks.append((model_id, version_id, full_file_name, file_path))
-        self._execute_tasks_concurrently(self.upload_artifact_from_file, upload_tasks)
+                # The manifest is left behind by syncs, and is not an artifact itself
+                if full_file_name == _ARTIFACTS_MANIFEST_FILE_NAME:
+                    continue
+                if sync:
+                    entry = self._get_artifact_manifest_entry(file_path, artifact_sizes.get(full_file_name))
+                    if entry is not None and manifest.get(full_file_name) == entry:
+                        synced[full_file_name] = entry
+                        continue
+                upload_tasks.append((model_id, version_id, full_file_name, file_path, synced))
+        try:
+            self._execute_tasks_concurrently(self._upload_artifact_and_record, upload_tasks)
+        finally:
+            if sync:
+                self._write_artifacts_manifest(directory, model_id, version_id, synced)
+
+    def _upload_artifact_and_record(self, model_id, version_id, name, file_path, synced):
+        self.upload_artifact_from_file(model_id, version_id, name, file_path)
+        synced[name] = {"size": os.path.getsize(file_path), "md5": _utils.get_file_md5(file_path)}
+
+    def download_artifacts(self, model_id: int, version_id: int, directory: str = None, sync: bool = False) -> None:
+        """Download all artifacts of a model version to a directory. Defaults to current working directory.
+
+        The artifacts are downloaded in parallel, and the directory structure of the artifact names is recreated.
+
+        If sync is True, artifacts which already exist locally with the same size and an md5 hash matching the manifest
+        file kept in the directory will not be downloaded again.
+
+        Args:
+            model_id (int): Id of model
+            version_id (int): Id of model version.
+            directory (str): Directory to place artifacts in. Defaults to current working directory.
+            sync (bool): Only download new or changed artifacts. Defaults to False.
+
+        Returns:
+            None
+        """
+        directory = directory or os.getcwd()
+        manifest = self._read_artifacts_manifest(directory, model_id, version_id) if sync else {}
+
+        synced = {}
+        download_tasks = []
+        for artifact in self.list_artifacts(model_id, version_id):
+            file_path = os.path.join(directory, artifact.name)
+            if sync and os.path.isfile(file_path):
+                entry = self._get_artifact_manifest_entry(file_path, artifact.size)
+                if entry is not None and manifest.get(artifact.name) == entry:
+                    synced[artifact.name] = entry
+                    continue
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            download_tasks.append((model_id, version_id, artifact.name, directory, synced))
+        try:
+            self._execute_tasks_concurrently(self._download_artifact_and_record, download_tasks)
+        finally:
+            if sync:
+                self._write_artifacts_manifest(directory, model_id, version_id, synced)
+
+    def _download_artifact_and_record(self, model_id, version_id, name, directory, synced):
+        self.download_artifact(model_id, version_id, name, directory)
+        file_path = os.path.join(directory, name)
+        synced[name] = {"size": os.path.getsize(file_path), "md5": _utils.get_file_md5(file_path)}
+
+    @staticmethod
+    def _get_artifact_manifest_entry(file_path, artifact_size):
+        # Only hash the file if the size check passes, as hashing large artifacts is not free.
+        size = os.path.getsize(file_path)
+        if size != artifact_size:
+            return None
+        return {"size": size, "md5": _utils.get_file_md5(file_path)}
+
+    @staticmethod
+    def _read_artifacts_manifest(directory, model_id, version_id):
+        manifest_path = os.path.join(directory, _ARTIFACTS_MANIFEST_FILE_NAME)
+        if not os.path.isfile(manifest_path):
+            return {}
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+        if manifest.get("modelId") != model_id or manifest.get("versionId") != version_id:
+            return {}
+        return manifest.get("artifacts", {})
+
+    @staticmethod
+    def _write_artifacts_manifest(directory, model_id, version_id, artifacts):
+        manifest_path = os.path.join(directory, _ARTIFACTS_MANIFEST_FILE_NAME)
+        with open(manifest_path, "w") as f:
+            json.dump({"modelId": model_id, "versionId": version_id, "artifacts": artifacts}, f, sort_keys=True)
 
     @staticmethod
     def _execute_tasks_concurrently(func, tasks):
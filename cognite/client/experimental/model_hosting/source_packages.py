@@ -1,11 +1,22 @@
+import hashlib
+import json
 import os
 import pkgutil
 import re
+import shutil
 from collections import namedtuple
 from subprocess import check_call
 from typing import Dict, List, NamedTuple, Tuple
 
 from cognite.client._api_client import APIClient, CogniteCollectionResponse, CogniteResponse
+from cognite.client.exceptions import APIError
+
+DEFAULT_BUILD_CACHE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cognite", "source_package_cache")
+_BUILD_CACHE_INDEX_FILE_NAME = "index.json"
+_PACKAGE_HASH_METADATA_KEY = "packageHash"
+# Build output is only ignored at the root of the package, where setup.py writes it
+_IGNORED_PACKAGE_ROOT_DIRECTORIES = ("dist", "build")
+_IGNORED_PACKAGE_DIRECTORIES = ("__pycache__", ".git")
 
 
 class CreateSourcePackageResponse(CogniteResponse):
@@ -129,36 +140,143 @@ class SourcePackageClient(APIClient):
                 return os.path.join(dist_directory, file)
 
     def build_and_upload_source_package(
-        self, name: str, runtime_version: str, package_directory: str, description: str = None, metadata: Dict = None
+        self,
+        name: str,
+        runtime_version: str,
+        package_directory: str,
+        description: str = None,
+        metadata: Dict = None,
+        use_cache: bool = False,
+        cache_directory: str = None,
     ) -> CreateSourcePackageResponse:
         """Build a distribution for a source package and upload it to the model hosting environment.
 
         This method will recursively search through your package and infer available_operations as well as the package
         name.
 
+        If use_cache is True, the source package is identified by a hash of the package contents and the arguments to
+        this method. If a source package with the same hash has already been uploaded, its id is returned without
+        building or uploading anything. Previously uploaded packages are looked up in a local index in the cache
+        directory, and then among your source packages, as the hash is stored in the source package metadata.
+
         Args:
             name (str): Name of source package
             runtime_version (str): Version of environment in which the source-package should run. Currently only 0.1.
             description (str): Description for source package
             metadata (Dict): User defined key value pair of additional information.
             package_directory (str): Absolute path of directory containing your setup.py file.
+            use_cache (bool): Whether or not to reuse previous builds of an unchanged package. Defaults to False.
+            cache_directory (str): Directory to keep the build cache in. Defaults to ~/.cognite/source_package_cache.
 
         Returns:
             experimental.model_hosting.source_packages.CreateSourcePackageResponse: An response object containing Source package ID
             if file_path was specified. Else, both source package id and upload url.
         """
-        package_name, available_operations = self._find_model_file_and_extract_details(package_directory)
-        tar_gz_path = self._build_distribution(package_directory)
-
-        return self.upload_source_package(
+        if not use_cache:
+            package_name, available_operations = self._find_model_file_and_extract_details(package_directory)
+            tar_gz_path = self._build_distribution(package_directory)
+            return self.upload_source_package(
+                name=name,
+                package_name=package_name,
+                available_operations=available_operations,
+                runtime_version=runtime_version,
+                description=description,
+                metadata=metadata,
+                file_path=tar_gz_path,
+            )
+
+        cache_directory = cache_directory or DEFAULT_BUILD_CACHE_DIRECTORY
+        package_hash = self._get_package_hash(package_directory, name, runtime_version, description, metadata)
+        index = self._read_build_cache_index(cache_directory)
+        entry = index.get(package_hash, {})
+
+        source_package_id = self._find_uploaded_source_package(package_hash, entry.get("sourcePackageId"))
+        if source_package_id is not None:
+            entry["sourcePackageId"] = source_package_id
+            index[package_hash] = entry
+            self._write_build_cache_index(cache_directory, index)
+            return CreateSourcePackageResponse({"data": {"id": source_package_id}})
+
+        if "packageName" not in entry:
+            package_name, available_operations = self._find_model_file_and_extract_details(package_directory)
+            entry.update({"packageName": package_name, "availableOperations": available_operations})
+        tar_gz_path = os.path.join(cache_directory, "{}.tar.gz".format(package_hash))
+        if not os.path.isfile(tar_gz_path):
+            os.makedirs(cache_directory, exist_ok=True)
+            shutil.copyfile(self._build_distribution(package_directory), tar_gz_path)
+
+        metadata = dict(metadata or {}, **{_PACKAGE_HASH_METADATA_KEY: package_hash})
+        res = self.upload_source_package(
             name=name,
-            package_name=package_name,
-            available_operations=available_operations,
+            package_name=entry["packageName"],
+            available_operations=entry["availableOperations"],
             runtime_version=runtime_version,
             description=description,
             metadata=metadata,
             file_path=tar_gz_path,
         )
+        entry["sourcePackageId"] = res.id
+        index[package_hash] = entry
+        self._write_build_cache_index(cache_directory, index)
+        return res
+
+    def _find_uploaded_source_package(self, package_hash, source_package_id=None):
+        if source_package_id is not None:
+            try:
+                source_package = self.get_source_package(source_package_id)
+                if source_package.is_uploaded and not source_package.is_deprecated:
+                    return source_package.id
+            except APIError as e:
+                if e.code != 404:
+                    raise
+        for source_package in self.list_source_packages(autopaging=True):
+            if (
+                (source_package.metadata or {}).get(_PACKAGE_HASH_METADATA_KEY) == package_hash
+                and source_package.is_uploaded
+                and not source_package.is_deprecated
+            ):
+                return source_package.id
+        return None
+
+    @staticmethod
+    def _get_package_hash(package_directory, *args) -> str:
+        sha256 = hashlib.sha256(json.dumps(args, sort_keys=True).encode())
+        for root, dirs, files in os.walk(package_directory):
+            is_root = root == package_directory
+            # Sort in place so that os.walk visits directories in a deterministic order
+            dirs[:] = sorted(
+                d
+                for d in dirs
+                if d not in _IGNORED_PACKAGE_DIRECTORIES
+                and not (is_root and (d in _IGNORED_PACKAGE_ROOT_DIRECTORIES or d.endswith(".egg-info")))
+            )
+            for file_name in sorted(files):
+                if file_name.endswith(".pyc"):
+                    continue
+                file_path = os.path.join(root, file_name)
+                relative_path = os.path.relpath(file_path, package_directory).replace(os.sep, "/")
+                sha256.update(relative_path.encode() + b"\0")
+                with open(file_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(2 ** 20), b""):
+                        sha256.update(chunk)
+                sha256.update(b"\0")
+        return sha256.hexdigest()
+
+    @staticmethod
+    def _read_build_cache_index(cache_directory) -> Dict:
+        index_path = os.path.join(cache_directory, _BUILD_CACHE_INDEX_FILE_NAME)
+        if not os.path.isfile(index_path):
+            return {}
+        with open(index_path, "r") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_build_cache_index(cache_directory, index):
+        os.makedirs(cache_directory, exist_ok=True)
+        index_path = os.path.join(cache_directory, _BUILD_CACHE_INDEX_FILE_NAME)
+        with open(index_path + ".tmp", "w") as f:
+            json.dump(index, f, sort_keys=True)
+        os.replace(index_path + ".tmp", index_path)
 
     def _upload_file(self, upload_url, file_path):
         with open(file_path, "rb") as fh:
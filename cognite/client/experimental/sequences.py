@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 import json
-from typing import List
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor as Pool
+from typing import Iterator, List
 
+import numpy as np
 import pandas as pd
 
 from cognite.client._api_client import APIClient
@@ -130,42 +134,128 @@ class Row:
 class SequenceDataResponse:
     """Data transfer object for the data in a sequence, used when receiving data.
 
+    The data is stored column-wise, as a list of row numbers and one list of values per column. Row objects are only
+    created if the rows attribute is accessed.
+
     Args:
         rows (list):  List of rows with the data.
+        columns (List[Column]): The columns of the sequence. If given, their value types decide the dtypes used in
+                                to_pandas().
     """
 
-    def __init__(self, rows: List[Row]):
-        self.rows = rows
+    _VALUE_TYPE_TO_DTYPE = {"DOUBLE": "float64", "LONG": "int64"}
 
-    @staticmethod
-    def from_JSON(the_data: dict):
-        return SequenceDataResponse(rows=[Row.from_JSON(the_row) for the_row in the_data["rows"]])
+    def __init__(self, rows: List[Row], columns: List[Column] = None):
+        self.columns = columns
+        self._rows = rows
+        self._row_numbers, self._column_ids, self._column_values = self._to_columnar(
+            (row.rowNumber, ((row_value.columnId, row_value.value) for row_value in row.values)) for row in rows
+        )
 
     @staticmethod
-    def _row_has_value_for_column(row: Row, column_id: int):
-        return column_id in [value.columnId for value in row.values]
+    def from_JSON(the_data: dict, columns: List[Column] = None):
+        return SequenceDataResponse._from_columnar(
+            *SequenceDataResponse._to_columnar(
+                (the_row["rowNumber"], ((value["columnId"], value["value"]) for value in the_row["values"]))
+                for the_row in the_data["rows"]
+            ),
+            columns=columns
+        )
+
+    @classmethod
+    def _from_columnar(cls, row_numbers, column_ids, column_values, columns=None):
+        response = cls(rows=[], columns=columns)
+        response._rows = None
+        response._row_numbers = row_numbers
+        response._column_ids = column_ids
+        response._column_values = column_values
+        return response
 
     @staticmethod
-    def _get_value_for_column(row: Row, column_id: int):
-        return next(value.value for value in row.values if value.columnId == column_id)
+    def _to_columnar(rows):
+        # Build one list per column in a single pass over the rows. Missing values are NaN.
+        row_numbers = []
+        column_ids = []
+        column_positions = {}
+        column_values = []
+        for i, (row_number, values) in enumerate(rows):
+            row_numbers.append(row_number)
+            for column_values_list in column_values:
+                column_values_list.append(np.nan)
+            for column_id, value in values:
+                position = column_positions.get(column_id)
+                if position is None:
+                    position = column_positions[column_id] = len(column_ids)
+                    column_ids.append(column_id)
+                    column_values.append([np.nan] * (i + 1))
+                column_values[position][i] = value
+        return row_numbers, column_ids, column_values
+
+    @classmethod
+    def _concat(cls, responses, columns=None):
+        row_numbers = []
+        column_ids = []
+        column_positions = {}
+        column_values = []
+        for response in responses:
+            for column_id in response._column_ids:
+                if column_id not in column_positions:
+                    column_positions[column_id] = len(column_ids)
+                    column_ids.append(column_id)
+                    column_values.append([np.nan] * len(row_numbers))
+            own_values = dict(zip(response._column_ids, response._column_values))
+            num_of_rows = len(response._row_numbers)
+            for column_id, values in zip(column_ids, column_values):
+                values.extend(own_values.get(column_id) or [np.nan] * num_of_rows)
+            row_numbers.extend(response._row_numbers)
+        return cls._from_columnar(row_numbers, column_ids, column_values, columns=columns)
+
+    def __len__(self):
+        return len(self._row_numbers)
+
+    @property
+    def row_numbers(self) -> List[int]:
+        """The row numbers of the rows, in the order they were returned."""
+        return self._row_numbers
+
+    @property
+    def rows(self) -> List[Row]:
+        if self._rows is None:
+            self._rows = [
+                Row(
+                    row_number=row_number,
+                    values=[
+                        RowValue(column_id=column_id, value=values[i])
+                        for column_id, values in zip(self._column_ids, self._column_values)
+                        if values[i] is not np.nan
+                    ],
+                )
+                for i, row_number in enumerate(self._row_numbers)
+            ]
+        return self._rows
 
     def to_pandas(self):
-        """Returns data as a pandas dataframe"""
-
-        # Create the empty dataframe
-        column_ids = [value.columnId for value in self.rows[0].values]
-        my_df = pd.DataFrame(columns=column_ids)
-        # Fill the dataframe with values. We might not have data for every column, so we need to be careful
-        for row in self.rows:
-            data_this_row = []
-            for column_id in column_ids:
-                # Do we have a value for this column?
-                if self._row_has_value_for_column(row, column_id):
-                    data_this_row.append(self._get_value_for_column(row, column_id))
-                else:
-                    data_this_row.append("null")
-            my_df.loc[len(my_df)] = data_this_row
-        return my_df
+        """Returns data as a pandas dataframe
+
+        There is one column per column id, in the order they first appear in the rows. Missing and null values are NaN.
+        If the columns of the sequence are known, DOUBLE columns are float64 and LONG columns are int64 (float64 if
+        values are missing or null).
+        """
+        value_types = {column.id: column.valueType for column in self.columns or []}
+        data = {}
+        for column_id, values in zip(self._column_ids, self._column_values):
+            data[column_id] = self._to_array(values, value_types.get(column_id))
+        return pd.DataFrame(data, columns=self._column_ids, index=pd.RangeIndex(len(self._row_numbers)))
+
+    @classmethod
+    def _to_array(cls, values, value_type):
+        dtype = cls._VALUE_TYPE_TO_DTYPE.get(value_type)
+        if dtype is None:
+            return values
+        if dtype == "int64" and any(value is np.nan or value is None for value in values):
+            # Integer columns can't hold NaN, so fall back to floats when values are missing
+            dtype = "float64"
+        return np.array(values, dtype=dtype)
 
     def to_json(self):
         """Returns data as a json object"""
@@ -192,6 +282,10 @@ class SequenceDataRequest:
 class SequencesClient(APIClient):
     def __init__(self, **kwargs):
         super().__init__(version="0.6", **kwargs)
+        self._DATA_LIMIT = 10000
+        self._POST_DATA_ROW_LIMIT = 10000
+        self._POST_DATA_VALUE_LIMIT = 100000
+        self._columns_by_id = {}
 
     def post_sequences(self, sequences: List[Sequence]) -> Sequence:
         """Create a new time series.
@@ -248,6 +342,22 @@ class SequencesClient(APIClient):
         the_sequence = json_response["data"]["items"][0]
         return Sequence.from_JSON(the_sequence)
 
+    def get_multiple_sequences_by_id(self, ids: List[int], ignore_missing: bool = False) -> List[Sequence]:
+        """Returns a list of Sequence objects for the given ids.
+
+        The ids are deduplicated and requested in chunks which are fetched in parallel.
+
+        Args:
+            ids (List[int]):        IDs of the sequences to look up
+            ignore_missing (bool):  Whether or not to leave out ids which don't exist instead of raising an APIError
+                                    listing them under extra["missing"]. Defaults to False.
+
+        Returns:
+            List[test_experimental.dto.Sequence]: The sequences, in the same order as the given ids.
+        """
+        items = self._retrieve_by_ids("/sequences/byids", ids, ignore_missing=ignore_missing)
+        return [Sequence.from_JSON(item) for item in items]
+
     def list_sequences(self, external_id: str = None):
         """Returns a list of Sequence objects.
 
@@ -275,10 +385,13 @@ class SequencesClient(APIClient):
         """
         url = "/sequences/{}".format(id)
         self._delete(url=url)
+        self._columns_by_id.pop(id, None)
 
     def post_data_to_sequence(self, id: int, rows: List[Row]) -> None:
         """Posts data to a sequence.
 
+        The rows are split into requests within the api limits, which are posted in parallel.
+
         Args:
             id (int):       ID of the sequence.
             rows (list):    List of rows with the data.
@@ -286,9 +399,58 @@ class SequencesClient(APIClient):
         Returns:
             None
         """
+        self._post_row_dicts(id, [row.__dict__ for row in rows])
+
+    def post_data_frame_to_sequence(self, id: int, dataframe: pd.DataFrame) -> None:
+        """Posts the data in a pandas dataframe to a sequence.
+
+        The index of the dataframe holds the row numbers, and the column labels are the ids of the sequence columns.
+        NaN values are not posted. The rows are split into requests within the api limits, which are posted in
+        parallel.
+
+        Args:
+            id (int):                   ID of the sequence.
+            dataframe (pd.DataFrame):   The data to post.
+
+        Returns:
+            None
+        """
+        column_ids = [int(column_id) for column_id in dataframe.columns]
+        column_values = [dataframe[column_id].tolist() for column_id in dataframe.columns]
+        column_masks = [dataframe[column_id].notna().tolist() for column_id in dataframe.columns]
+        row_dicts = []
+        for i, row_number in enumerate(dataframe.index.tolist()):
+            values = [
+                {"columnId": column_id, "value": values[i]}
+                for column_id, values, mask in zip(column_ids, column_values, column_masks)
+                if mask[i]
+            ]
+            row_dicts.append({"rowNumber": int(row_number), "values": values})
+        self._post_row_dicts(id, row_dicts)
+
+    def _post_row_dicts(self, id, row_dicts):
         url = "/sequences/{}/postdata".format(id)
-        body = {"items": [{"rows": [row.__dict__ for row in rows]}]}
-        self._post(url, body=body)
+        bodies = [{"items": [{"rows": chunk}]} for chunk in self._split_rows_into_requests(row_dicts)]
+        if len(bodies) == 1:
+            self._post(url, body=bodies[0])
+            return
+        with Pool(min(len(bodies), self._num_of_workers)) as p:
+            list(p.map(lambda body: self._post(url, body=body), bodies))
+
+    def _split_rows_into_requests(self, row_dicts):
+        chunks = [[]]
+        num_of_values = 0
+        for row_dict in row_dicts:
+            row_num_of_values = len(row_dict["values"])
+            if chunks[-1] and (
+                len(chunks[-1]) >= self._POST_DATA_ROW_LIMIT
+                or num_of_values + row_num_of_values > self._POST_DATA_VALUE_LIMIT
+            ):
+                chunks.append([])
+                num_of_values = 0
+            chunks[-1].append(row_dict)
+            num_of_values += row_num_of_values
+        return chunks
 
     def get_data_from_sequence(
         self,
@@ -297,6 +459,9 @@ class SequencesClient(APIClient):
         inclusive_to: int = None,
         limit: int = 100,
         column_ids: List[int] = None,
+        autopaging: bool = False,
+        workers: int = None,
+        columns: List[Column] = None,
     ) -> SequenceDataResponse:
         """Gets data from the given sequence.
 
@@ -306,18 +471,127 @@ class SequencesClient(APIClient):
                                      that exists.
             inclusive_to (int):      Row number to get to (inclusive). If set to None, you'll get data to the last row that
                                      exists (depending on the limit).
-            limit (int):             How many rows to return.
+            limit (int):             How many rows to return. Ignored if autopaging is True.
             column_ids (List[int]):  ids of the columns to get data for.
+            autopaging (bool):       Whether or not to automatically page through all rows in the range. If both
+                                     inclusive_from and inclusive_to are given, the range is split into chunks which are
+                                     fetched in parallel.
+            workers (int):           Number of chunks to fetch in parallel when autopaging. Defaults to 10.
+            columns (List[Column]):  The columns of the sequence, whose value types decide the dtypes used in
+                                     to_pandas(). If not given, the sequence is retrieved the first time its data is
+                                     requested through this client.
 
         Returns:
             client.test_experimental.sequences.SequenceDataResponse: A data object containing the requested sequence.
         """
+        columns = columns or self._get_columns(id)
+        if autopaging:
+            return self._get_all_data_from_sequence(id, inclusive_from, inclusive_to, column_ids, workers, columns)
+        return self._get_data_page(id, inclusive_from, inclusive_to, limit, column_ids, columns)
+
+    def iter_data_from_sequence(
+        self,
+        id: int,
+        inclusive_from: int = None,
+        inclusive_to: int = None,
+        column_ids: List[int] = None,
+        block_size: int = None,
+        workers: int = None,
+        columns: List[Column] = None,
+    ) -> Iterator[SequenceDataResponse]:
+        """Iterates over the data in a sequence in blocks of rows, in row number order.
+
+        If both inclusive_from and inclusive_to are given, up to `workers` blocks are fetched in parallel ahead of the
+        block being consumed. Otherwise the rows are paged through one request at a time. Blocks without any rows are
+        skipped.
+
+        Args:
+            id (int):                id of the sequence.
+            inclusive_from (int):    Row number to get from (inclusive). If set to None, you'll get data from the first row
+                                     that exists.
+            inclusive_to (int):      Row number to get to (inclusive). If set to None, you'll get data to the last row that
+                                     exists.
+            column_ids (List[int]):  ids of the columns to get data for.
+            block_size (int):        Number of row numbers covered by each block. Defaults to 10,000.
+            workers (int):           Number of blocks to fetch in parallel. Defaults to 10.
+            columns (List[Column]):  The columns of the sequence, whose value types decide the dtypes used in
+                                     to_pandas(). If not given, the sequence is retrieved the first time its data is
+                                     requested through this client.
+
+        Yields:
+            client.test_experimental.sequences.SequenceDataResponse: The rows of each block.
+        """
+        columns = columns or self._get_columns(id)
+        if inclusive_from is None or inclusive_to is None:
+            yield from self._iter_data_pages(id, inclusive_from, inclusive_to, column_ids, columns)
+            return
+
+        block_size = block_size or self._DATA_LIMIT
+        workers = workers or self._num_of_workers
+        with Pool(workers) as p:
+            futures = deque()
+            for block_from in range(inclusive_from, inclusive_to + 1, block_size):
+                block_to = min(block_from + block_size - 1, inclusive_to)
+                futures.append(p.submit(self._get_data_in_range, id, block_from, block_to, column_ids, columns))
+                if len(futures) >= workers:
+                    block = futures.popleft().result()
+                    if len(block) > 0:
+                        yield block
+            while futures:
+                block = futures.popleft().result()
+                if len(block) > 0:
+                    yield block
+
+    def _get_columns(self, id):
+        # The columns of a sequence can't be changed, so they only need to be retrieved once
+        if id not in self._columns_by_id:
+            self._columns_by_id[id] = self.get_sequence_by_id(id).columns
+        return self._columns_by_id[id]
+
+    def _get_all_data_from_sequence(self, id, inclusive_from, inclusive_to, column_ids, workers, columns):
+        if inclusive_from is None or inclusive_to is None:
+            return self._get_data_in_range(id, inclusive_from, inclusive_to, column_ids, columns)
+
+        windows = self._get_row_windows(inclusive_from, inclusive_to, workers or self._num_of_workers)
+        with Pool(len(windows)) as p:
+            rows_per_window = p.map(
+                lambda window: self._get_data_in_range(id, window[0], window[1], column_ids, columns), windows
+            )
+
+        return SequenceDataResponse._concat(rows_per_window, columns=columns)
+
+    def _get_row_windows(self, inclusive_from, inclusive_to, num_of_workers):
+        # Don't split into windows smaller than a single page of rows
+        num_of_rows = inclusive_to - inclusive_from + 1
+        steps = max(1, min(num_of_workers, math.ceil(num_of_rows / self._DATA_LIMIT)))
+        step_size = math.ceil(num_of_rows / steps)
+        return [
+            (window_from, min(window_from + step_size - 1, inclusive_to))
+            for window_from in range(inclusive_from, inclusive_to + 1, step_size)
+        ]
+
+    def _get_data_in_range(self, id, inclusive_from, inclusive_to, column_ids, columns=None):
+        return SequenceDataResponse._concat(
+            self._iter_data_pages(id, inclusive_from, inclusive_to, column_ids, columns), columns=columns
+        )
+
+    def _iter_data_pages(self, id, inclusive_from, inclusive_to, column_ids, columns=None):
+        # The server may return fewer rows than the limit even if there are more, so only an empty page ends the range
+        while True:
+            page = self._get_data_page(id, inclusive_from, inclusive_to, self._DATA_LIMIT, column_ids, columns)
+            if len(page) == 0:
+                return
+            yield page
+            inclusive_from = page.row_numbers[-1] + 1
+            if inclusive_to is not None and inclusive_from > inclusive_to:
+                return
+
+    def _get_data_page(self, id, inclusive_from, inclusive_to, limit, column_ids, columns=None):
         url = "/sequences/{}/getdata".format(id)
         sequenceDataRequest = SequenceDataRequest(
             inclusive_from=inclusive_from, inclusive_to=inclusive_to, limit=limit, column_ids=column_ids or []
         )
         body = {"items": [sequenceDataRequest.__dict__]}
         res = self._post(url=url, body=body)
-        json_response = json.loads(res.text)
-        the_data = json_response["data"]["items"][0]
-        return SequenceDataResponse.from_JSON(the_data)
+        the_data = res.json()["data"]["items"][0]
+        return SequenceDataResponse.from_JSON(the_data, columns=columns)
@@ -69,21 +69,22 @@ class TimeSeriesClient(APIClient):
         res = self._get(url=url, params=params)
         return TimeSeriesResponse(res.json())
 
-    def get_multiple_time_series_by_id(self, ids: List[int]) -> TimeSeriesResponse:
+    def get_multiple_time_series_by_id(self, ids: List[int], ignore_missing: bool = False) -> TimeSeriesResponse:
         """Returns a TimeseriesResponse object containing the requested timeseries.
 
+        The ids are deduplicated and requested in chunks which are fetched in parallel.
+
         Args:
             ids (List[int]):           IDs of timeseries to look up
+            ignore_missing (bool):     Whether or not to leave out ids which don't exist instead of raising an APIError
+                                       listing them under extra["missing"]. Defaults to False.
 
         Returns:
-            client.experimental.time_series.TimeSeriesResponse: A data object containing the requested timeseries with several
-            getter methods with different output formats.
+            client.experimental.time_series.TimeSeriesResponse: A data object containing the requested timeseries, in the
+            same order as the given ids, with several getter methods with different output formats.
         """
-        url = "/timeseries/byids"
-        body = {"items": ids}
-        params = {}
-        res = self._post(url=url, body=body, params=params)
-        return TimeSeriesResponse(res.json())
+        items = self._retrieve_by_ids("/timeseries/byids", ids, ignore_missing=ignore_missing)
+        return TimeSeriesResponse({"data": {"items": items}})
 
     def search_for_time_series(
         self,
@@ -129,6 +130,9 @@ class TimeSeriesClient(APIClient):
             limit (int):    Return up to this many results. Maximum is 1000. Default is 25.
             offset (int):   Offset from the first result. Sum of limit and offset must not exceed 1000. Default is 0.
             boost_name (bool): Whether or not boosting name field. This option is test_experimental and can be changed.
+            autopaging (bool): Whether or not to get all results, regardless of the limit of 1000 results per query. The
+                               query is split into ranges of created time which are searched in parallel, and limit and
+                               offset are disregarded. Defaults to False.
 
         Returns:
             client.experimental.time_series.TimeSeriesResponse: A data object containing the requested timeseries with several getter methods with different
@@ -155,5 +159,7 @@ class TimeSeriesClient(APIClient):
             "offset": kwargs.get("offset"),
             "boostName": kwargs.get("boost_name"),
         }
+        if kwargs.get("autopaging"):
+            return TimeSeriesResponse({"data": {"items": self._search_with_partitions(url, params)}})
         res = self._get(url, params=params)
         return TimeSeriesResponse(res.json())
@@ -1,10 +1,17 @@
 # -*- coding: utf-8 -*-
+import copy
 import json
-from typing import Dict, List
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor as Pool
+from typing import Callable, Dict, List, Union
 
+import numpy as np
 import pandas as pd
 
+from cognite.client import _utils
 from cognite.client._api_client import APIClient, CogniteCollectionResponse, CogniteResource, CogniteResponse
+from cognite.client.exceptions import BulkOperationError
 
 
 class AssetResponse(CogniteResponse):
@@ -37,12 +44,7 @@ class AssetListResponse(CogniteCollectionResponse):
     """Assets Response Object"""
 
     _RESPONSE_CLASS = AssetResponse
-
-    def to_pandas(self):
-        """Returns data as a pandas dataframe"""
-        if len(self.to_json()) > 0:
-            return pd.DataFrame(self.internal_representation["data"]["items"])
-        return pd.DataFrame()
+    _CATEGORICAL_COLUMNS = ("source",)
 
 
 class Asset(CogniteResource):
@@ -87,6 +89,208 @@ class Asset(CogniteResource):
         self.source_id = source_id
 
 
+class AssetHierarchy:
+    """In-memory index of an asset hierarchy for answering structural queries without calling the API.
+
+    The hierarchy is stored as arrays of parent positions, depths and entry/exit times of a depth-first traversal, with
+    binary lifting tables for jumping up the hierarchy. Subtree membership checks are O(1), lowest common ancestor
+    lookups are O(log depth), and listing the ancestors, path or subtree of an asset is proportional to the number of
+    assets returned. Assets whose parent is not in the hierarchy are treated as roots.
+
+    Args:
+        assets (List[Dict]): The assets in the hierarchy, e.g. from AssetListResponse.to_json().
+
+    Examples:
+        Building the hierarchy of a subtree and querying it::
+
+            client = CogniteClient()
+            hierarchy = client.assets.get_asset_hierarchy(asset_id=123)
+            hierarchy.subtree(456, depth=2)
+            hierarchy.path(789)
+            hierarchy.lowest_common_ancestor(456, 789)
+    """
+
+    def __init__(self, assets: List[Dict]):
+        self._assets = {}
+        self.last_updated_time = None
+        self.update(assets)
+
+    def update(self, assets: List[Dict]) -> None:
+        """Adds new assets and replaces existing ones with the same id, then rebuilds the index.
+
+        Args:
+            assets (List[Dict]): The new or changed assets.
+        """
+        for asset in assets:
+            self._assets[asset["id"]] = asset
+            last_updated_time = asset.get("lastUpdatedTime")
+            if last_updated_time is not None and (
+                self.last_updated_time is None or last_updated_time > self.last_updated_time
+            ):
+                self.last_updated_time = last_updated_time
+        self._build()
+
+    def remove(self, asset_ids: List[int]) -> None:
+        """Removes assets from the hierarchy, then rebuilds the index. Children of removed assets become roots.
+
+        Args:
+            asset_ids (List[int]): The ids of the assets to remove.
+        """
+        for asset_id in asset_ids:
+            self._assets.pop(asset_id, None)
+        self._build()
+
+    def _build(self):
+        ids = list(self._assets)
+        n = len(ids)
+        self._ids = np.array(ids, dtype=np.int64)
+        self._positions = {asset_id: i for i, asset_id in enumerate(ids)}
+        parents = [self._positions.get(self._assets[asset_id].get("parentId"), -1) for asset_id in ids]
+        self._parents = np.array(parents, dtype=np.int64)
+
+        # Children of each position as contiguous slices of one array, ordered by parent
+        order = np.argsort(self._parents, kind="mergesort")
+        num_of_roots = int(np.sum(self._parents < 0))
+        self._roots = order[:num_of_roots]
+        self._children = order[num_of_roots:]
+        child_counts = np.bincount(self._parents[self._parents >= 0], minlength=n)
+        self._child_offsets = np.concatenate(([0], np.cumsum(child_counts))).astype(np.int64)
+
+        # Iterative depth-first traversal from all roots, recording the preorder
+        children = self._children.tolist()
+        offsets = self._child_offsets.tolist()
+        preorder = []
+        stack = self._roots.tolist()[::-1]
+        while stack:
+            position = stack.pop()
+            preorder.append(position)
+            stack.extend(reversed(children[offsets[position] : offsets[position + 1]]))
+        if len(preorder) != n:
+            raise ValueError("The parent ids of the assets contain a cycle")
+
+        depths = [0] * n
+        sizes = [1] * n
+        for position in preorder:
+            if parents[position] >= 0:
+                depths[position] = depths[parents[position]] + 1
+        for position in reversed(preorder):
+            if parents[position] >= 0:
+                sizes[parents[position]] += sizes[position]
+
+        self._preorder = np.array(preorder, dtype=np.int64)
+        self._depths = np.array(depths, dtype=np.int64)
+        self._tin = np.empty(n, dtype=np.int64)
+        self._tin[self._preorder] = np.arange(n)
+        self._tout = self._tin + np.array(sizes, dtype=np.int64) - 1
+
+        # Binary lifting table, _up[k][i] is the 2^k-th ancestor of i. Roots are their own ancestors.
+        up = np.where(self._parents >= 0, self._parents, np.arange(n))
+        self._up = [up]
+        max_depth = int(self._depths.max()) if n > 0 else 0
+        for _ in range(max(1, max_depth.bit_length()) - 1):
+            self._up.append(self._up[-1][self._up[-1]])
+
+    def _position(self, asset_id):
+        try:
+            return self._positions[asset_id]
+        except KeyError:
+            raise KeyError("Asset {} is not in the hierarchy".format(asset_id)) from None
+
+    def _is_ancestor(self, ancestor, position):
+        return self._tin[ancestor] <= self._tin[position] and self._tout[position] <= self._tout[ancestor]
+
+    def __len__(self):
+        return len(self._assets)
+
+    def __contains__(self, asset_id):
+        return asset_id in self._assets
+
+    def __getitem__(self, asset_id) -> AssetResponse:
+        self._position(asset_id)
+        return AssetResponse({"data": {"items": [self._assets[asset_id]]}})
+
+    def roots(self) -> List[int]:
+        """Returns the ids of the root assets."""
+        return self._ids[self._roots].tolist()
+
+    def parent(self, asset_id: int) -> int:
+        """Returns the id of the parent of an asset, or None if it is a root."""
+        parent = self._parents[self._position(asset_id)]
+        return None if parent < 0 else int(self._ids[parent])
+
+    def children(self, asset_id: int) -> List[int]:
+        """Returns the ids of the children of an asset."""
+        position = self._position(asset_id)
+        return self._ids[self._children[self._child_offsets[position] : self._child_offsets[position + 1]]].tolist()
+
+    def depth(self, asset_id: int) -> int:
+        """Returns the depth of an asset below its root."""
+        return int(self._depths[self._position(asset_id)])
+
+    def ancestors(self, asset_id: int) -> List[int]:
+        """Returns the ids of the ancestors of an asset, starting with its parent."""
+        ancestors = []
+        parent = self._parents[self._position(asset_id)]
+        while parent >= 0:
+            ancestors.append(int(self._ids[parent]))
+            parent = self._parents[parent]
+        return ancestors
+
+    def path(self, asset_id: int) -> List[int]:
+        """Returns the ids of the assets from the root down to and including the asset."""
+        return self.ancestors(asset_id)[::-1] + [asset_id]
+
+    def is_in_subtree(self, asset_id: int, root_id: int) -> bool:
+        """Returns whether an asset is in the subtree rooted at another asset, including the root itself."""
+        return bool(self._is_ancestor(self._position(root_id), self._position(asset_id)))
+
+    def subtree(self, asset_id: int, depth: int = None) -> List[int]:
+        """Returns the ids of the assets in the subtree rooted at an asset, in depth-first order.
+
+        Args:
+            asset_id (int): The id of the root of the subtree.
+            depth (int): Only include assets up to this many levels below the root.
+        """
+        position = self._position(asset_id)
+        positions = self._preorder[self._tin[position] : self._tout[position] + 1]
+        if depth is not None:
+            positions = positions[self._depths[positions] <= self._depths[position] + depth]
+        return self._ids[positions].tolist()
+
+    def lowest_common_ancestor(self, asset_id: int, other_asset_id: int) -> int:
+        """Returns the id of the deepest asset which has both assets in its subtree, or None if they have different roots."""
+        a = self._position(asset_id)
+        b = self._position(other_asset_id)
+        if self._is_ancestor(a, b):
+            return asset_id
+        for up in reversed(self._up):
+            if not self._is_ancestor(up[a], b):
+                a = up[a]
+        a = self._up[0][a]
+        return int(self._ids[a]) if self._is_ancestor(a, b) else None
+
+
+class AssetHierarchyDiff:
+    """The changes needed to turn the assets in CDP into a desired asset hierarchy.
+
+    Args:
+        create (List[stable.assets.Asset]): Assets to create. Parents which are also created are referred to with
+                                            parent_ref_id, which is the source_id of the parent.
+        update (List[Dict]): Changes to existing assets, in the format used by update_assets.
+        delete (List[int]): Ids of assets to delete.
+    """
+
+    def __init__(self, create: List[Asset], update: List[Dict], delete: List[int]):
+        self.create = create
+        self.update = update
+        self.delete = delete
+        # Asset id -> source id of a new parent which has to be created before the asset can be moved
+        self._new_parents = {}
+
+    def __len__(self):
+        return len(self.create) + len(self.update) + len(self.delete)
+
+
 class AssetsClient(APIClient):
     def __init__(self, **kwargs):
         super().__init__(version="0.5", **kwargs)
@@ -164,10 +368,33 @@ class AssetsClient(APIClient):
                 res = client.assets.get_asset(asset_id=123)
                 print(res)
         """
-        url = "/assets/{}/subtree".format(asset_id)
+        url = "/assets/{}".format(asset_id)
         res = self._get(url)
         return AssetResponse(res.json())
 
+    def get_multiple_assets_by_id(self, asset_ids: List[int], ignore_missing: bool = False) -> AssetListResponse:
+        """Returns the assets with the provided ids.
+
+        The ids are deduplicated and requested in chunks which are fetched in parallel.
+
+        Args:
+            asset_ids (List[int]):  The ids of the assets to get.
+            ignore_missing (bool):  Whether or not to leave out ids which don't exist instead of raising an APIError
+                                    listing them under extra["missing"]. Defaults to False.
+
+        Returns:
+            stable.assets.AssetListResponse: The assets, in the same order as the given ids.
+
+        Examples:
+            You can fetch several assets like this::
+
+                client = CogniteClient()
+                res = client.assets.get_multiple_assets_by_id(asset_ids=[123, 234])
+                print(res.to_pandas())
+        """
+        items = self._retrieve_by_ids("/assets/byids", asset_ids, ignore_missing=ignore_missing)
+        return AssetListResponse({"data": {"items": items}})
+
     def get_asset_subtree(self, asset_id, depth=None, **kwargs) -> AssetListResponse:
         """Returns asset subtree of asset with provided assetId.
 
@@ -204,9 +431,143 @@ class AssetsClient(APIClient):
         res = self._get(url, params=params, autopaging=autopaging)
         return AssetListResponse(res.json())
 
+    def crawl_asset_subtree(
+        self, asset_id: int, split_depth: int = 2, workers: int = None, sink: Callable[[List[Dict]], None] = None
+    ) -> AssetListResponse:
+        """Fetches the entire subtree of an asset, walking its branches in parallel.
+
+        The top `split_depth` levels of the subtree are fetched first. Then the subtrees of all assets at that depth are
+        paged through concurrently. Each asset is delivered exactly once, so the result holds the same assets as
+        get_asset_subtree(asset_id, autopaging=True).
+
+        Args:
+            asset_id (int):         The asset id of the top asset to get.
+            split_depth (int):      The number of levels below the top asset to fetch before splitting the remaining
+                                    work into branches. Defaults to 2.
+            workers (int):          Number of branches to fetch in parallel. Defaults to 10.
+            sink (Callable):        If given, this is called with each new page of assets (as a list of dicts) as soon
+                                    as it arrives, instead of collecting all assets in the response. Calls are made from
+                                    worker threads, but never concurrently.
+
+        Returns:
+            stable.assets.AssetListResponse: The assets in the subtree, or None if a sink is given.
+
+        Examples:
+            Fetching a large asset subtree into a dataframe::
+
+                client = CogniteClient()
+                df = client.assets.crawl_asset_subtree(asset_id=123, workers=20).to_pandas()
+        """
+        seen = set()
+        collected = []
+        lock = threading.Lock()
+
+        def emit(items):
+            with lock:
+                new_items = [item for item in items if item["id"] not in seen]
+                seen.update(item["id"] for item in new_items)
+                if not new_items:
+                    return
+                if sink:
+                    sink(new_items)
+                else:
+                    collected.extend(new_items)
+
+        top_levels = self.get_asset_subtree(asset_id, depth=split_depth, autopaging=True).to_json()
+        emit(top_levels)
+        root_depth = next(item["depth"] for item in top_levels if item["id"] == asset_id)
+        frontier = [item["id"] for item in top_levels if item["depth"] == root_depth + split_depth]
+
+        if frontier:
+            with Pool(min(len(frontier), workers or self._num_of_workers)) as p:
+                futures = [p.submit(self._crawl_branch, branch_id, emit) for branch_id in frontier]
+                for future in futures:
+                    future.result()
+
+        if sink:
+            return None
+        return AssetListResponse({"data": {"items": collected}})
+
+    def _crawl_branch(self, asset_id, emit):
+        cursor = None
+        while True:
+            res = self.get_asset_subtree(asset_id, limit=self._LIMIT, cursor=cursor)
+            emit(res.to_json())
+            cursor = res.next_cursor()
+            if not cursor:
+                break
+
+    def get_asset_hierarchy(self, asset_id: int = None) -> AssetHierarchy:
+        """Returns an in-memory index of the asset hierarchy.
+
+        Args:
+            asset_id (int): Only include the subtree of this asset. Defaults to including all assets.
+
+        Returns:
+            stable.assets.AssetHierarchy: The asset hierarchy.
+
+        Examples:
+            You can find all assets below an asset like this::
+
+                client = CogniteClient()
+                hierarchy = client.assets.get_asset_hierarchy()
+                print(hierarchy.subtree(123))
+        """
+        if asset_id is None:
+            res = self.get_assets(autopaging=True)
+        else:
+            res = self.get_asset_subtree(asset_id, autopaging=True)
+        return AssetHierarchy(res.to_json())
+
+    def refresh_asset_hierarchy(self, hierarchy: AssetHierarchy, asset_subtrees: List[int] = None) -> List[Dict]:
+        """Updates an asset hierarchy in place with the assets created or updated since it was last updated.
+
+        Deleted assets are not detected. Use AssetHierarchy.remove() or rebuild the hierarchy to drop them.
+
+        Args:
+            hierarchy (stable.assets.AssetHierarchy): The hierarchy to update.
+            asset_subtrees (List[int]): Only look for changes in the subtrees rooted at these assets.
+
+        Returns:
+            List[Dict]: The assets which were created or updated.
+        """
+        min_last_updated_time = hierarchy.last_updated_time or 0
+        changed = {}
+        while True:
+            items = self.search_for_assets(
+                asset_subtrees=asset_subtrees,
+                min_last_updated_time=min_last_updated_time,
+                sort="lastUpdatedTime",
+                dir="asc",
+                limit=self._LIMIT,
+            ).to_json()
+            for item in items:
+                changed[item["id"]] = item
+            if len(items) < self._LIMIT:
+                break
+            next_min_last_updated_time = items[-1]["lastUpdatedTime"]
+            if next_min_last_updated_time == min_last_updated_time:
+                # A full page with a single timestamp can't be paged through with the time filter, so get all assets
+                # updated at that time by partitioning on created time instead before moving past it
+                items = self.search_for_assets(
+                    asset_subtrees=asset_subtrees,
+                    min_last_updated_time=min_last_updated_time,
+                    max_last_updated_time=min_last_updated_time,
+                    autopaging=True,
+                ).to_json()
+                for item in items:
+                    changed[item["id"]] = item
+                next_min_last_updated_time += 1
+            min_last_updated_time = next_min_last_updated_time
+        hierarchy.update(list(changed.values()))
+        return list(changed.values())
+
     def post_assets(self, assets: List[Asset]) -> AssetListResponse:
         """Insert a list of assets.
 
+        Large lists are split into several requests which are sent in parallel. If assets refer to parents with
+        parent_ref_id or parent_name and don't fit in a single request, they are posted with post_asset_hierarchy().
+
         Args:
             assets (list[stable.assets.Asset]): List of asset data transfer objects.
 
@@ -226,10 +587,135 @@ class AssetsClient(APIClient):
                 res = client.assets.post_assets(assets_to_post)
                 print(res)
         """
+        if len(assets) > self._LIMIT and any(a.parent_ref_id is not None or a.parent_name is not None for a in assets):
+            # References to parents can only be resolved within a single request
+            return self.post_asset_hierarchy(assets)
         url = "/assets"
         items = [asset.camel_case_dict() for asset in assets]
-        res = self._post(url, body={"items": items})
-        return AssetListResponse(res.json())
+        res = self._bulk_request("post", url, items)
+        return AssetListResponse(self._merge_item_responses(res))
+
+    def post_asset_hierarchy(self, assets: List[Asset], workers: int = None) -> AssetListResponse:
+        """Insert a hierarchy of assets of any size.
+
+        The assets are sorted so that parents are created before their children, and posted level by level in chunks
+        within the api limits. The chunks of each level are posted in parallel, and the ids of the created parents are
+        filled in as parent ids for the next level. The given assets are not modified.
+
+        Assets can refer to parents in the hierarchy with parent_ref_id or parent_name, or to existing assets with
+        parent_id. Assets referred to by parent_name must have unique names within the hierarchy.
+
+        If a request fails, the remaining chunks of that level are still posted, but no further levels are. A
+        BulkOperationError is then raised, listing the created assets under `successful` and the given assets which
+        were not created under `failed`, so that the rest of the hierarchy can be posted with parent_id set.
+
+        Args:
+            assets (list[stable.assets.Asset]): List of asset data transfer objects.
+            workers (int): Number of chunks to post in parallel. Defaults to 10.
+
+        Returns:
+            stable.assets.AssetListResponse: The created assets, in the same order as the given assets.
+
+        Examples:
+            Posting a hierarchy::
+
+                from cognite.client.stable.assets import Asset
+
+                client = CogniteClient()
+
+                assets_to_post = [Asset("plant", ref_id="plant"), Asset("pump", parent_ref_id="plant")]
+                res = client.assets.post_asset_hierarchy(assets_to_post)
+                print(res)
+        """
+        levels, parents = self._get_hierarchy_levels(assets)
+        url = "/assets"
+        created = [None] * len(assets)
+        with Pool(workers or self._num_of_workers) as p:
+            for level in levels:
+                chunks = _utils.split_into_chunks(level, self._LIMIT)
+                bodies = [
+                    {"items": [self._to_hierarchy_item(assets[i], parents[i], created) for i in chunk]}
+                    for chunk in chunks
+                ]
+                futures = [p.submit(self._post, url, body=body) for body in bodies]
+                errors = []
+                for chunk, future in zip(chunks, futures):
+                    try:
+                        res = future.result().json()
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    for i, item in zip(chunk, res["data"]["items"]):
+                        created[i] = item
+                if errors:
+                    self._raise_hierarchy_error(assets, created, errors)
+        return AssetListResponse({"data": {"items": created}})
+
+    @staticmethod
+    def _raise_hierarchy_error(assets, created, errors):
+        first_error = errors[0]
+        raise BulkOperationError(
+            "Posting the asset hierarchy failed: {}".format(getattr(first_error, "message", str(first_error))),
+            code=getattr(first_error, "code", None),
+            x_request_id=getattr(first_error, "x_request_id", None),
+            successful=[item for item in created if item is not None],
+            failed=[asset for asset, item in zip(assets, created) if item is None],
+            errors=errors,
+        )
+
+    @staticmethod
+    def _get_hierarchy_levels(assets):
+        ref_ids = {}
+        names = {}
+        for i, asset in enumerate(assets):
+            if asset.ref_id is not None:
+                if asset.ref_id in ref_ids:
+                    raise ValueError("Duplicate ref_id {}".format(asset.ref_id))
+                ref_ids[asset.ref_id] = i
+            names.setdefault(asset.name, []).append(i)
+
+        parents = []
+        for asset in assets:
+            if asset.parent_ref_id is not None:
+                if asset.parent_ref_id not in ref_ids:
+                    raise ValueError("No asset with ref_id {}".format(asset.parent_ref_id))
+                parents.append(ref_ids[asset.parent_ref_id])
+            elif asset.parent_name is not None:
+                if len(names.get(asset.parent_name, [])) != 1:
+                    raise ValueError("parent_name {} does not refer to exactly one asset".format(asset.parent_name))
+                parents.append(names[asset.parent_name][0])
+            else:
+                parents.append(None)
+
+        depths = [None] * len(assets)
+        for i in range(len(assets)):
+            chain = []
+            in_chain = set()
+            current = i
+            while current is not None and depths[current] is None:
+                if current in in_chain:
+                    raise ValueError("The parent references of the assets contain a cycle")
+                chain.append(current)
+                in_chain.add(current)
+                current = parents[current]
+            depth = -1 if current is None else depths[current]
+            for j in reversed(chain):
+                depth += 1
+                depths[j] = depth
+
+        levels = [[] for _ in range(max(depths) + 1 if depths else 0)]
+        for i, depth in enumerate(depths):
+            levels[depth].append(i)
+        return levels, parents
+
+    @staticmethod
+    def _to_hierarchy_item(asset, parent, created):
+        item = asset.camel_case_dict()
+        item.pop("parentRefId", None)
+        item.pop("parentName", None)
+        if parent is not None:
+            item["parentId"] = created[parent]["id"]
+        return item
 
     def delete_assets(self, asset_ids: List[int]) -> None:
         """Delete a list of assets.
@@ -247,22 +733,25 @@ class AssetsClient(APIClient):
                 res = client.assets.delete_assets([123])
         """
         url = "/assets/delete"
-        body = {"items": asset_ids}
-        self._post(url, body=body)
+        self._bulk_request("post", url, asset_ids)
 
     @staticmethod
-    def _asset_to_patch_format(id, name=None, description=None, metadata=None, source=None, source_id=None):
+    def _asset_to_patch_format(
+        id, name=None, description=None, metadata=None, source=None, source_id=None, parent_id=None
+    ):
         patch_asset = {"id": id}
-        if name:
+        if name is not None:
             patch_asset["name"] = {"set": name}
-        if description:
+        if description is not None:
             patch_asset["description"] = {"set": description}
-        if metadata:
+        if metadata is not None:
             patch_asset["metadata"] = {"set": metadata}
-        if source:
+        if source is not None:
             patch_asset["source"] = {"set": source}
-        if source_id:
+        if source_id is not None:
             patch_asset["sourceId"] = {"set": source_id}
+        if parent_id is not None:
+            patch_asset["parentId"] = {"set": parent_id}
         return patch_asset
 
     def update_asset(
@@ -305,8 +794,180 @@ class AssetsClient(APIClient):
         items = [
             self._asset_to_patch_format(a.id, a.name, a.description, a.metadata, a.source, a.source_id) for a in assets
         ]
-        res = self._post(url, body={"items": items})
-        return AssetListResponse(res.json())
+        res = self._bulk_request("post", url, items)
+        return AssetListResponse(self._merge_item_responses(res))
+
+    def diff_asset_hierarchy(
+        self, assets: Union[List[Asset], pd.DataFrame], root_asset_id: int = None, delete: bool = False
+    ) -> AssetHierarchyDiff:
+        """Computes the changes needed to turn the assets in CDP into a desired asset hierarchy.
+
+        Assets are matched on source_id, which must be set and unique in the desired hierarchy. Parents in the
+        desired hierarchy are referred to with parent_ref_id set to the source_id of the parent, or with parent_id for
+        parents outside of it. Fields which are None in a desired asset are not compared, and existing assets without
+        a source id are never changed.
+
+        Args:
+            assets (Union[List[stable.assets.Asset], pd.DataFrame]): The desired hierarchy. A dataframe must have
+                                                                     columns named after the arguments of Asset.
+            root_asset_id (int): Only compare with the subtree of this asset. Defaults to comparing with all assets.
+            delete (bool): Whether or not to delete existing assets which are not in the desired hierarchy. Defaults
+                           to False.
+
+        Returns:
+            stable.assets.AssetHierarchyDiff: The assets to create, update and delete.
+        """
+        desired = self._to_asset_list(assets)
+        desired_source_ids = set()
+        for asset in desired:
+            if asset.source_id is None or asset.source_id in desired_source_ids:
+                raise ValueError("All assets must have a unique source_id, got {}".format(asset.source_id))
+            desired_source_ids.add(asset.source_id)
+
+        if root_asset_id is None:
+            current = self.get_assets(autopaging=True).to_json()
+        else:
+            current = self.crawl_asset_subtree(root_asset_id).to_json()
+        current_by_source_id = {item["sourceId"]: item for item in current if item.get("sourceId") is not None}
+        source_ids_by_id = {item["id"]: item.get("sourceId") for item in current}
+
+        diff = AssetHierarchyDiff(create=[], update=[], delete=[])
+        for asset in desired:
+            if asset.parent_ref_id is not None and asset.parent_ref_id not in desired_source_ids:
+                raise ValueError("No asset with source_id {}".format(asset.parent_ref_id))
+            current_item = current_by_source_id.get(asset.source_id)
+            if current_item is None:
+                diff.create.append(self._to_new_asset(asset, current_by_source_id))
+                continue
+
+            desired_fields = self._get_comparable_fields(asset)
+            current_fields = {
+                "name": current_item.get("name"),
+                "description": current_item.get("description"),
+                "metadata": current_item.get("metadata") or {},
+                "source": current_item.get("source"),
+                "parentRefId": source_ids_by_id.get(current_item.get("parentId")),
+                "parentId": current_item.get("parentId"),
+            }
+            current_fields = {key: current_fields[key] for key in desired_fields}
+            if desired_fields == current_fields:
+                continue
+
+            changed = {key: value for key, value in desired_fields.items() if current_fields[key] != value}
+            parent_id = changed.get("parentId")
+            if "parentRefId" in changed:
+                parent_item = current_by_source_id.get(changed["parentRefId"])
+                if parent_item is None:
+                    diff._new_parents[current_item["id"]] = changed["parentRefId"]
+                else:
+                    parent_id = parent_item["id"]
+            patch = self._asset_to_patch_format(
+                current_item["id"],
+                name=changed.get("name"),
+                description=changed.get("description"),
+                metadata=changed.get("metadata"),
+                source=changed.get("source"),
+                parent_id=parent_id,
+            )
+            if len(patch) > 1 or current_item["id"] in diff._new_parents:
+                diff.update.append(patch)
+
+        if delete:
+            diff.delete = [
+                item["id"]
+                for source_id, item in current_by_source_id.items()
+                if source_id not in desired_source_ids and item["id"] != root_asset_id
+            ]
+        return diff
+
+    def sync_asset_hierarchy(
+        self,
+        assets: Union[List[Asset], pd.DataFrame],
+        root_asset_id: int = None,
+        delete: bool = False,
+        workers: int = None,
+    ) -> AssetHierarchyDiff:
+        """Makes the assets in CDP match a desired asset hierarchy, only sending the assets which differ.
+
+        See diff_asset_hierarchy() for how assets are matched and compared. New assets are created with
+        post_asset_hierarchy(), then existing assets are updated (and moved), and finally removed assets are deleted.
+        Updates and deletes are sent in chunks which are posted in parallel.
+
+        Args:
+            assets (Union[List[stable.assets.Asset], pd.DataFrame]): The desired hierarchy. A dataframe must have
+                                                                     columns named after the arguments of Asset.
+            root_asset_id (int): Only sync the subtree of this asset. Defaults to syncing with all assets.
+            delete (bool): Whether or not to delete existing assets which are not in the desired hierarchy. Defaults
+                           to False.
+            workers (int): Number of requests to send in parallel. Defaults to 10.
+
+        Returns:
+            stable.assets.AssetHierarchyDiff: The changes which were applied.
+
+        Examples:
+            Syncing a hierarchy from a dataframe::
+
+                client = CogniteClient()
+                df = pd.DataFrame({"name": ["plant", "pump"], "source_id": ["p1", "p2"], "parent_ref_id": [None, "p1"]})
+                diff = client.assets.sync_asset_hierarchy(df, root_asset_id=123)
+                print(len(diff.create), len(diff.update), len(diff.delete))
+        """
+        diff = self.diff_asset_hierarchy(assets, root_asset_id=root_asset_id, delete=delete)
+        ids_by_source_id = {}
+        if diff.create:
+            created = self.post_asset_hierarchy(diff.create, workers=workers)
+            ids_by_source_id = {item["sourceId"]: item["id"] for item in created.to_json()}
+
+        updates = []
+        for patch in diff.update:
+            if patch["id"] in diff._new_parents:
+                patch = dict(patch, parentId={"set": ids_by_source_id[diff._new_parents[patch["id"]]]})
+            updates.append(patch)
+        if updates:
+            self._bulk_request("post", "/assets/update", updates, workers=workers)
+        if diff.delete:
+            self._bulk_request("post", "/assets/delete", diff.delete, workers=workers)
+        return diff
+
+    @staticmethod
+    def _to_asset_list(assets):
+        if not isinstance(assets, pd.DataFrame):
+            return assets
+        assets_list = []
+        for record in assets.to_dict("records"):
+            record = {
+                key: None if isinstance(value, float) and math.isnan(value) else value for key, value in record.items()
+            }
+            # Id columns with missing values are floats
+            for key in ("id", "parent_id"):
+                if record.get(key) is not None:
+                    record[key] = int(record[key])
+            assets_list.append(Asset(**record))
+        return assets_list
+
+    @staticmethod
+    def _to_new_asset(asset, current_by_source_id):
+        new_asset = copy.copy(asset)
+        new_asset.id = None
+        new_asset.ref_id = asset.source_id
+        if asset.parent_ref_id in current_by_source_id:
+            new_asset.parent_ref_id = None
+            new_asset.parent_id = current_by_source_id[asset.parent_ref_id]["id"]
+        return new_asset
+
+    @staticmethod
+    def _get_comparable_fields(asset):
+        fields = {
+            "name": asset.name,
+            "description": asset.description,
+            "metadata": asset.metadata,
+            "source": asset.source,
+        }
+        if asset.parent_ref_id is not None:
+            fields["parentRefId"] = asset.parent_ref_id
+        else:
+            fields["parentId"] = asset.parent_id
+        return {key: value for key, value in fields.items() if value is not None}
 
     def search_for_assets(
         self,
@@ -344,6 +1005,9 @@ class AssetsClient(APIClient):
             limit (int):            Return up to this many results. Max is 1000, default is 25.
             offset (int):           Offset from the first result. Sum of limit and offset must not exceed 1000. Default is 0.
             boost_name (str):       Whether or not boosting name field. This option is test_experimental and can be changed.
+            autopaging (bool):      Whether or not to get all results, regardless of the limit of 1000 results per
+                                    query. The query is split into ranges of created time which are searched in
+                                    parallel, and limit and offset are disregarded. Defaults to False.
         Returns:
             stable.assets.AssetListResponse.
 
@@ -372,5 +1036,7 @@ class AssetsClient(APIClient):
             "boostName": kwargs.get("boost_name"),
         }
 
+        if kwargs.get("autopaging"):
+            return AssetListResponse({"data": {"items": self._search_with_partitions(url, params)}})
         res = self._get(url, params=params)
         return AssetListResponse(res.json())
@@ -1,19 +1,81 @@
 # -*- coding: utf-8 -*-
 import io
 import json
+import os
+import threading
 import time
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor as Pool
 from copy import copy
 from datetime import datetime
 from functools import partial
-from typing import List
+from typing import Dict, List, Union
 from urllib.parse import quote
 
+import numpy as np
 import pandas as pd
 
 from cognite.client import _utils
 from cognite.client._api_client import APIClient, CogniteResource, CogniteResponse
-from cognite.client._auxiliary._protobuf_descriptors import _api_timeseries_data_v2_pb2
+from cognite.client._auxiliary import _protobuf_decoder
+from cognite.client.stable.events import EventListResponse
+
+
+# The names of the fields of each aggregate in responses, by the lower case names and aliases used in requests
+_AGGREGATE_FIELD_NAMES = {
+    "avg": "average",
+    "average": "average",
+    "max": "max",
+    "min": "min",
+    "count": "count",
+    "sum": "sum",
+    "int": "interpolation",
+    "interpolation": "interpolation",
+    "step": "stepInterpolation",
+    "stepinterpolation": "stepInterpolation",
+    "cv": "continuousVariance",
+    "continuousvariance": "continuousVariance",
+    "dv": "discreteVariance",
+    "discretevariance": "discreteVariance",
+    "tv": "totalVariation",
+    "totalvariation": "totalVariation",
+}
+
+
+def _values_to_list(values):
+    # String values are decoded into a categorical, whose items share the string objects of its categories
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+
+# A page of datapoints is either a list of datapoint dicts, as returned by the json api, or a tuple of timestamp and
+# value arrays from the protobuf decoder. Array pages are only turned into dicts when the dicts are asked for.
+
+
+def _page_to_datapoints(page):
+    if isinstance(page, tuple):
+        timestamps, values = page
+        return [{"timestamp": t, "value": v} for t, v in zip(timestamps.tolist(), _values_to_list(values))]
+    return page
+
+
+def _page_timestamps(page):
+    if isinstance(page, tuple):
+        return page[0]
+    return np.array([dp["timestamp"] for dp in page], dtype=np.int64)
+
+
+def _take_from_page(page, indices):
+    if isinstance(page, tuple):
+        return page[0][indices], page[1][indices]
+    return [page[i] for i in indices]
+
+
+def _concat_array_pages(pages):
+    timestamps = np.concatenate([timestamps for timestamps, _ in pages])
+    values = [values for _, values in pages]
+    if isinstance(values[0], pd.Categorical):
+        return timestamps, pd.api.types.union_categoricals(values)
+    return timestamps, np.concatenate(values)
 
 
 class DatapointsResponse(CogniteResponse):
@@ -21,17 +83,66 @@ class DatapointsResponse(CogniteResponse):
 
     def __init__(self, internal_representation):
         super().__init__(internal_representation)
-        item = self.to_json()
-        self.name = item.get("name")
-        self.datapoints = item.get("datapoints")
+        self._pages = None
+        self.name = self.to_json().get("name")
+
+    @classmethod
+    def _from_pages(cls, name, pages):
+        response = cls({"data": {"items": [{"name": name}]}})
+        response._pages = pages
+        return response
+
+    @property
+    def datapoints(self):
+        return self.to_json().get("datapoints")
 
     def to_json(self):
         """Returns data as a json object"""
-        return self.internal_representation["data"]["items"][0]
+        item = self.internal_representation["data"]["items"][0]
+        if self._pages is not None and "datapoints" not in item:
+            item["datapoints"] = [dp for page in self._pages for dp in _page_to_datapoints(page)]
+        return item
 
     def to_pandas(self):
-        """Returns data as a pandas dataframe"""
-        return pd.DataFrame(self.internal_representation["data"]["items"][0]["datapoints"])
+        """Returns data as a pandas dataframe. The values of string time series are categorical."""
+        arrays = self._get_arrays()
+        if arrays is not None:
+            return pd.DataFrame(OrderedDict([("timestamp", arrays[0]), ("value", arrays[1])]))
+        df = pd.DataFrame(self.datapoints)
+        if "value" in df.columns and df["value"].dtype == object:
+            df["value"] = df["value"].astype("category")
+        return df
+
+    def to_arrow(self):
+        """Returns data as a pyarrow Table with a timestamp column and a column for the values or each aggregate.
+
+        The values of string time series are dictionary encoded. Requires pyarrow.
+        """
+        pa = _utils.import_pyarrow()
+        return pa.Table.from_batches([self._to_record_batch()])
+
+    def _get_arrays(self):
+        # Returns the timestamps and values as arrays if all the datapoints were decoded from protobuf
+        if not self._pages or not all(isinstance(page, tuple) for page in self._pages):
+            return None
+        if len(self._pages) == 1:
+            return self._pages[0]
+        return _concat_array_pages(self._pages)
+
+    def _to_record_batch(self):
+        arrays = self._get_arrays()
+        if arrays is None:
+            columns = _utils.to_columns(self.datapoints or [], include_metadata=False)
+            return _utils.to_record_batch(columns, dictionary_columns=("value",))
+
+        pa = _utils.import_pyarrow()
+        timestamps, values = arrays
+        if isinstance(values, pd.Categorical):
+            categories = pa.array(values.categories.values.astype(object), pa.string())
+            values = pa.DictionaryArray.from_arrays(pa.array(values.codes, pa.int32()), categories)
+        else:
+            values = pa.array(values)
+        return pa.RecordBatch.from_arrays([pa.array(timestamps), values], ["timestamp", "value"])
 
 
 class DatapointsQuery(CogniteResource):
@@ -76,6 +187,37 @@ class DatapointsResponseIterator:
     def __len__(self):
         return len(self.datapoints_objects)
 
+    def to_arrow(self):
+        """Returns the datapoints of all the time series as one pyarrow Table in long format.
+
+        The table has a dictionary encoded name column, a timestamp column, and a column for the values or each
+        aggregate, which is null for time series without it. Requires pyarrow.
+        """
+        pa = _utils.import_pyarrow()
+        batches = [dps._to_record_batch() for dps in self.datapoints_objects]
+        fields = OrderedDict([("name", pa.dictionary(pa.int32(), pa.string()))])
+        for batch in batches:
+            for field in batch.schema:
+                existing_type = fields.get(field.name)
+                if existing_type is None or pa.types.is_null(existing_type):
+                    fields[field.name] = field.type
+                elif pa.types.is_integer(existing_type) and pa.types.is_floating(field.type):
+                    fields[field.name] = pa.float64()
+        schema = pa.schema([pa.field(name, type) for name, type in fields.items()])
+
+        aligned_batches = []
+        for dps, batch in zip(self.datapoints_objects, batches):
+            names = pa.array([dps.name] * batch.num_rows, pa.string()).dictionary_encode()
+            arrays = [names]
+            for field in list(schema)[1:]:
+                index = batch.schema.get_field_index(field.name)
+                if index == -1:
+                    arrays.append(pa.nulls(batch.num_rows, field.type))
+                else:
+                    arrays.append(batch.column(index).cast(field.type))
+            aligned_batches.append(pa.RecordBatch.from_arrays(arrays, schema=schema))
+        return pa.Table.from_batches(aligned_batches, schema=schema)
+
     def __iter__(self):
         return self
 
@@ -129,6 +271,42 @@ class LatestDatapointResponse(CogniteResponse):
         return pd.DataFrame([self.internal_representation["data"]["items"][0]])
 
 
+class _ExportProgress:
+    """Thread safe record of the time up to which each time series has been exported, persisted to a json file.
+
+    The query of the export is recorded along with the progress of each time series, and resuming the export of a time
+    series with another query is an error, since the files already written would not match the query.
+    """
+
+    def __init__(self, path, resume, query):
+        self._path = path
+        self._query = query
+        self._lock = threading.Lock()
+        self._records = {}
+        if resume and os.path.exists(path):
+            with open(path) as f:
+                self._records = json.load(f)
+
+    def get(self, name):
+        record = self._records.get(name)
+        if record is None:
+            return None
+        if not isinstance(record, dict) or record.get("query") != self._query:
+            raise ValueError(
+                "{} was partly exported with other parameters than {}, according to {}. Export to another directory or "
+                "without resuming.".format(name, self._query, self._path)
+            )
+        return record["exported_until"]
+
+    def update(self, name, timestamp):
+        with self._lock:
+            self._records[name] = {"query": self._query, "exported_until": timestamp}
+            tmp_path = self._path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._records, f)
+            os.replace(tmp_path, self._path)
+
+
 class DatapointsClient(APIClient):
     def __init__(self, **kwargs):
         super().__init__(version="0.5", **kwargs)
@@ -158,7 +336,10 @@ class DatapointsClient(APIClient):
         Keyword Arguments:
             workers (int):    Number of download workers to run in parallell. Defaults to 10.
 
-            include_outside_points (bool):      No description
+            include_outside_points (bool):      Whether to include the last datapoint before start and the first datapoint
+                                                at or after end. Only applicable when getting raw data. These are fetched
+                                                with separate small requests, so the time period is still downloaded in
+                                                parallel. Defaults to False.
 
             protobuf (bool):        Download the data using the binary protobuf format. Only applicable when getting raw data.
                                     Defaults to True.
@@ -195,30 +376,33 @@ class DatapointsClient(APIClient):
             )
 
         num_of_workers = kwargs.get("workers", self._num_of_workers)
-        if kwargs.get("include_outside_points") is True:
-            num_of_workers = 1
+        include_outside_points = kwargs.get("include_outside_points", False) and aggregates is None
+        protobuf = kwargs.get("protobuf", True)
 
         windows = _utils.get_datapoints_windows(start, end, granularity, num_of_workers)
 
+        # The windows are fetched without outside points, which would otherwise show up at every window boundary
         partial_get_dps = partial(
             self._get_datapoints_helper_wrapper,
             name=name,
             aggregates=aggregates,
             granularity=granularity,
-            protobuf=kwargs.get("protobuf", True),
-            include_outside_points=kwargs.get("include_outside_points", False),
+            protobuf=protobuf,
+            include_outside_points=False,
         )
 
-        with Pool(len(windows)) as p:
-            datapoints = p.map(partial_get_dps, windows)
-
-        concat_dps = []
-        [concat_dps.extend(el) for el in datapoints]
+        with Pool(len(windows) + (2 if include_outside_points else 0)) as p:
+            if include_outside_points:
+                before = p.submit(self._get_outside_datapoint, name, start, True, protobuf)
+                after = p.submit(self._get_outside_datapoint, name, end, False, protobuf)
+            pages = [page for window_pages in p.map(partial_get_dps, windows) for page in window_pages]
+            if include_outside_points:
+                pages = before.result() + pages + after.result()
 
-        return DatapointsResponse({"data": {"items": [{"name": name, "datapoints": concat_dps}]}})
+        return DatapointsResponse._from_pages(name, pages)
 
     def _get_datapoints_helper_wrapper(self, args, name, aggregates, granularity, protobuf, include_outside_points):
-        return self._get_datapoints_helper(
+        return self._get_datapoints_pages(
             name,
             aggregates,
             granularity,
@@ -228,6 +412,25 @@ class DatapointsClient(APIClient):
             include_outside_points=include_outside_points,
         )
 
+    def _get_outside_datapoint(self, name, timestamp, before, protobuf):
+        """Returns the last datapoint before timestamp, or the first datapoint at or after it if before is False.
+
+        The datapoint is returned as a list of at most one page with one datapoint. It is found by getting the outside
+        points of the 1 ms period starting at timestamp.
+        """
+        pages = self._get_datapoints_pages(
+            name, start=timestamp, end=timestamp + 1, protobuf=protobuf, include_outside_points=True
+        )
+        for page in reversed(pages) if before else pages:
+            timestamps = _page_timestamps(page)
+            if before:
+                indices = np.flatnonzero(timestamps < timestamp)[-1:]
+            else:
+                indices = np.flatnonzero(timestamps >= timestamp)[:1]
+            if len(indices) > 0:
+                return [_take_from_page(page, indices)]
+        return []
+
     def _get_datapoints_helper(self, name, aggregates=None, granularity=None, start=None, end=None, **kwargs):
         """Returns a list of datapoints for the given query.
 
@@ -257,6 +460,32 @@ class DatapointsClient(APIClient):
         Returns:
             list of datapoints: A list containing datapoint dicts.
         """
+        dps = []
+        for page in self._iter_datapoints_pages(name, aggregates, granularity, start, end, **kwargs):
+            dps.extend(page)
+        return dps
+
+    def _get_datapoints_pages(self, name, aggregates=None, granularity=None, start=None, end=None, **kwargs):
+        """Returns the pages of datapoints for the given query, with protobuf pages kept as arrays.
+
+        Takes the same arguments as _get_datapoints_helper.
+        """
+        return list(self._iter_raw_datapoints_pages(name, aggregates, granularity, start, end, **kwargs))
+
+    def _iter_datapoints_pages(self, name, aggregates=None, granularity=None, start=None, end=None, **kwargs):
+        """Yields the pages of datapoints for the given query in order, as lists of datapoint dicts.
+
+        Takes the same arguments as _get_datapoints_helper.
+        """
+        for page in self._iter_raw_datapoints_pages(name, aggregates, granularity, start, end, **kwargs):
+            yield _page_to_datapoints(page)
+
+    def _iter_raw_datapoints_pages(self, name, aggregates=None, granularity=None, start=None, end=None, **kwargs):
+        """Yields the pages of datapoints for the given query in order.
+
+        Pages downloaded with protobuf are tuples of timestamp and value arrays, and other pages are lists of datapoint
+        dicts. Takes the same arguments as _get_datapoints_helper.
+        """
         url = "/timeseries/data/{}".format(quote(name, safe=""))
 
         use_protobuf = kwargs.get("protobuf", True) and aggregates is None
@@ -272,25 +501,22 @@ class DatapointsClient(APIClient):
         }
 
         headers = {"accept": "application/protobuf"} if use_protobuf else {}
-        datapoints = []
-        while (not datapoints or len(datapoints[-1]) == limit) and params["end"] > params["start"]:
+        page_size = limit
+        while page_size == limit and params["end"] > params["start"]:
             res = self._get(url, params=params, headers=headers)
             if use_protobuf:
-                ts_data = _api_timeseries_data_v2_pb2.TimeseriesData()
-                ts_data.ParseFromString(res.content)
-                res = [{"timestamp": p.timestamp, "value": p.value} for p in ts_data.numericData.points]
+                page = _protobuf_decoder.decode_datapoints(res.content)
+                page_size = len(page[0])
             else:
-                res = res.json()["data"]["items"][0]["datapoints"]
+                page = res.json()["data"]["items"][0]["datapoints"]
+                page_size = len(page)
 
-            if not res:
+            if page_size == 0:
                 break
 
-            datapoints.append(res)
-            latest_timestamp = int(datapoints[-1][-1]["timestamp"])
+            yield page
+            latest_timestamp = int(page[0][-1]) if use_protobuf else int(page[-1]["timestamp"])
             params["start"] = latest_timestamp + (_utils.granularity_to_ms(granularity) if granularity else 1)
-        dps = []
-        [dps.extend(el) for el in datapoints]
-        return dps
 
     def _get_datapoints_user_defined_limit(self, name, aggregates, granularity, start, end, limit, **kwargs):
         """Returns a DatapointsResponse object with the requested data.
@@ -338,12 +564,8 @@ class DatapointsClient(APIClient):
         headers = {"accept": "application/protobuf"} if use_protobuf else {}
         res = self._get(url, params=params, headers=headers)
         if use_protobuf:
-            ts_data = _api_timeseries_data_v2_pb2.TimeseriesData()
-            ts_data.ParseFromString(res.content)
-            res = [{"timestamp": p.timestamp, "value": p.value} for p in ts_data.numericData.points]
-        else:
-            res = res.json()["data"]["items"][0]["datapoints"]
-
+            return DatapointsResponse._from_pages(name, [_protobuf_decoder.decode_datapoints(res.content)])
+        res = res.json()["data"]["items"][0]["datapoints"]
         return DatapointsResponse({"data": {"items": [{"name": name, "datapoints": res}]}})
 
     def _split_TimeseriesWithDatapoints_if_over_limit(
@@ -773,6 +995,306 @@ class DatapointsClient(APIClient):
 
         return df
 
+    def get_event_window_aggregates(
+        self,
+        events: Union[EventListResponse, List[Dict]],
+        time_series: List[str],
+        aggregates: List[str] = None,
+        workers: int = None,
+    ) -> pd.DataFrame:
+        """Returns aggregates of the raw datapoints of some time series between the start and end time of each event.
+
+        Overlapping event windows are merged, and windows separated by gaps shorter than the average window are fetched
+        as one span, so that many short events don't take a request each. The spans are fetched in parallel across time
+        series, and the aggregates for each event are then computed locally. String time series can't be aggregated,
+        and are rejected before any datapoints are fetched.
+
+        Args:
+            events (Union[EventListResponse, List[Dict]]): The events. Each event must have an id, a startTime and an
+                                                            endTime.
+            time_series (List[str]): The names of the time series to aggregate.
+            aggregates (List[str]): The aggregates to compute. Valid aggregates are: 'count, sum, mean/average/avg, min,
+                                    max'. Defaults to all of them.
+            workers (int): Number of download workers to run in parallel. Defaults to 10.
+
+        Returns:
+            pandas.DataFrame: A dataframe indexed by event id with a column for each time series and aggregate, named
+            '<time series>|<aggregate>'. Aggregates of events without datapoints are NaN, except count which is 0.
+
+        Examples:
+            Getting the mean and max temperature during each run of a pump::
+
+                client = CogniteClient()
+                runs = client.events.get_events(type="pump_run", asset_id=123, autopaging=True)
+                res = client.datapoints.get_event_window_aggregates(runs, ["temperature"], aggregates=["mean", "max"])
+                print(res)
+        """
+        if isinstance(events, EventListResponse):
+            events = events.to_json()
+        aggregates = aggregates or ["count", "sum", "mean", "min", "max"]
+        aggregates = [{"average": "mean", "avg": "mean"}.get(agg, agg) for agg in aggregates]
+        invalid = [agg for agg in aggregates if agg not in ("count", "sum", "mean", "min", "max")]
+        if invalid:
+            raise ValueError("Invalid aggregates: {}".format(invalid))
+        if any(event.get("startTime") is None or event.get("endTime") is None for event in events):
+            raise ValueError("All events must have a startTime and an endTime")
+
+        ids = np.array([event["id"] for event in events], dtype=np.int64)
+        starts = np.array([event["startTime"] for event in events], dtype=np.int64)
+        ends = np.array([event["endTime"] for event in events], dtype=np.int64)
+        spans = self._coalesce_windows(self._merge_windows(starts, ends))
+
+        tasks = [(name, span_start, span_end) for name in time_series for span_start, span_end in spans]
+        with Pool(workers or self._num_of_workers) as p:
+            is_string = list(p.map(self._is_string_time_series, time_series))
+            string_series = [name for name, string in zip(time_series, is_string) if string]
+            if string_series:
+                raise ValueError("Can't aggregate string time series: {}".format(string_series))
+            pages = list(p.map(lambda task: self._get_datapoints_pages(task[0], start=task[1], end=task[2]), tasks))
+
+        columns = {}
+        for i, name in enumerate(time_series):
+            # The spans are sorted and disjoint, so the datapoints of a time series are sorted by timestamp
+            series_pages = [page for span_pages in pages[i * len(spans) : (i + 1) * len(spans)] for page in span_pages]
+            timestamps, values = self._pages_to_numeric_arrays(name, series_pages)
+            for agg, column in self._aggregate_windows(timestamps, values, starts, ends, aggregates).items():
+                columns["{}|{}".format(name, agg)] = column
+        return pd.DataFrame(columns, index=pd.Index(ids, name="id"), columns=list(columns))
+
+    @staticmethod
+    def _merge_windows(starts, ends):
+        windows = []
+        for i in np.argsort(starts, kind="mergesort"):
+            if ends[i] <= starts[i]:
+                continue
+            if windows and starts[i] <= windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], int(ends[i]))
+            else:
+                windows.append([int(starts[i]), int(ends[i])])
+        return windows
+
+    def _is_string_time_series(self, name):
+        # The type of the latest datapoint tells, without fetching the time series metadata
+        items = self.get_latest(name).internal_representation["data"]["items"]
+        return bool(items) and isinstance(items[0].get("value"), str)
+
+    @staticmethod
+    def _coalesce_windows(windows):
+        # Gaps shorter than the average window are fetched along with the windows around them. This fetches at most
+        # twice the time covered by the windows themselves, and saves a request per window for many short events.
+        if not windows:
+            return windows
+        max_gap = sum(end - start for start, end in windows) / len(windows)
+        spans = [list(windows[0])]
+        for start, end in windows[1:]:
+            if start - spans[-1][1] <= max_gap:
+                spans[-1][1] = end
+            else:
+                spans.append([start, end])
+        return spans
+
+    @staticmethod
+    def _pages_to_numeric_arrays(name, pages):
+        pages = [
+            page
+            if isinstance(page, tuple)
+            else (_page_timestamps(page), np.array([dp["value"] for dp in page], dtype=object))
+            for page in pages
+        ]
+        if not pages:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+        timestamps, values = _concat_array_pages(pages)
+        if isinstance(values, pd.Categorical) or any(isinstance(value, str) for value in values[:1]):
+            raise ValueError("Can't aggregate string time series: {}".format([name]))
+        return timestamps, values.astype(np.float64)
+
+    @staticmethod
+    def _aggregate_windows(timestamps, values, starts, ends, aggregates):
+        # Each window [start, end) is a slice values[lo:hi] of the sorted datapoints. Reducing at the interleaved
+        # indices (lo, hi) reduces each slice at the even positions, and a padding value makes hi == len(values) valid.
+        lo = np.searchsorted(timestamps, starts, side="left")
+        hi = np.searchsorted(timestamps, np.maximum(starts, ends), side="left")
+        counts = hi - lo
+        non_empty = counts > 0
+        indices = np.stack([lo, hi], axis=1).ravel()
+
+        def reduce_windows(ufunc):
+            if len(indices) == 0:
+                return np.array([], dtype=np.float64)
+            return np.where(non_empty, ufunc.reduceat(np.append(values, 0.0), indices)[::2], np.nan)
+
+        res = {}
+        for agg in aggregates:
+            if agg == "count":
+                res[agg] = counts
+            elif agg == "sum":
+                res[agg] = reduce_windows(np.add)
+            elif agg == "mean":
+                res[agg] = reduce_windows(np.add) / np.maximum(counts, 1)
+            elif agg == "min":
+                res[agg] = reduce_windows(np.minimum)
+            else:
+                res[agg] = reduce_windows(np.maximum)
+        return res
+
+    def export_datapoints_to_parquet(
+        self,
+        time_series: List[str],
+        start,
+        end,
+        directory: str,
+        bucket_size: str = "1d",
+        aggregates: List[str] = None,
+        granularity: str = None,
+        workers: int = None,
+        resume: bool = True,
+    ) -> Dict[str, int]:
+        """Exports the datapoints of many time series to Parquet files partitioned by time series and time bucket.
+
+        The time series are exported in parallel, and each page of datapoints is written as it arrives, so memory usage
+        stays bounded by a page per worker. The datapoints of a bucket are written to
+        '<directory>/<time series>/<bucket start>.parquet', where the time series name is url quoted and the bucket start
+        is in ms since epoch. A file only gets its final name once its bucket is complete.
+
+        The time each time series has been exported up to is recorded in '<directory>/_progress.json', so an interrupted
+        export continues where it stopped when run again with the same start, end, bucket size, aggregates and
+        granularity. Relative times like '52w-ago' are resolved on each run, so use absolute times for exports which may
+        need to be resumed. Resuming an export with other parameters raises a ValueError. Requires pyarrow.
+
+        Args:
+            time_series (List[str]): The names of the time series to export.
+            start (Union[str, int, datetime]): Export datapoints after this time. Same format as for get_datapoints().
+            end (Union[str, int, datetime]): Export datapoints up to this time. Same format as for get_datapoints().
+            directory (str): The directory to write the files to.
+            bucket_size (str): The time span of each file, e.g. '1d' or '12hour'. Defaults to '1d'.
+            aggregates (List[str]): The aggregates to export instead of the raw datapoints.
+            granularity (str): The granularity of the aggregates.
+            workers (int): Number of time series to export in parallel. Defaults to 10.
+            resume (bool): Whether to continue from the recorded progress of an earlier export. Defaults to True.
+
+        Returns:
+            Dict[str, int]: The number of datapoints exported for each time series.
+
+        Examples:
+            Exporting a year of raw datapoints to daily files::
+
+                client = CogniteClient()
+                client.datapoints.export_datapoints_to_parquet(["ts1", "ts2"], start="52w-ago", end="now", directory="dps")
+        """
+        _utils.import_pyarrow()
+        start, end = _utils.interval_to_ms(start, end)
+        if aggregates:
+            aggregates = ",".join(aggregates)
+        bucket_ms = _utils.granularity_to_ms(bucket_size)
+        os.makedirs(directory, exist_ok=True)
+        query = {
+            "start": start,
+            "end": end,
+            "bucketSize": bucket_ms,
+            "aggregates": aggregates,
+            "granularity": granularity,
+        }
+        progress = _ExportProgress(os.path.join(directory, "_progress.json"), resume, query)
+        # Fail before exporting anything if the recorded progress is for another query
+        for name in time_series:
+            progress.get(name)
+
+        def export(name):
+            return self._export_time_series_to_parquet(
+                name, start, end, directory, bucket_ms, aggregates, granularity, progress
+            )
+
+        with Pool(workers or self._num_of_workers) as p:
+            counts = list(p.map(export, time_series))
+        return dict(zip(time_series, counts))
+
+    def _export_time_series_to_parquet(self, name, start, end, directory, bucket_ms, aggregates, granularity, progress):
+        import pyarrow.parquet as pq
+
+        exported_until = progress.get(name)
+        if exported_until is not None:
+            if exported_until >= end:
+                return 0
+            # A bucket is only complete once its file has been renamed, so restart the bucket that was in progress
+            start = max(start, exported_until - exported_until % bucket_ms)
+        series_directory = os.path.join(directory, quote(name, safe=""))
+        os.makedirs(series_directory, exist_ok=True)
+
+        schema = None
+        writer = None
+        bucket = None
+        count = 0
+        try:
+            for page in self._iter_raw_datapoints_pages(name, aggregates, granularity, start, end):
+                if schema is None:
+                    schema = self._get_parquet_export_schema(aggregates, page)
+                table = self._page_to_parquet_export_table(page, schema)
+                buckets = _page_timestamps(page) // bucket_ms
+                boundaries = [0] + (np.flatnonzero(np.diff(buckets)) + 1).tolist() + [len(buckets)]
+                for lo, hi in zip(boundaries[:-1], boundaries[1:]):
+                    if buckets[lo] != bucket:
+                        if writer is not None:
+                            self._close_parquet_bucket(writer, series_directory, bucket, bucket_ms, name, progress)
+                            writer = None
+                        bucket = int(buckets[lo])
+                        writer = pq.ParquetWriter(
+                            self._parquet_bucket_path(series_directory, bucket, bucket_ms, True), schema
+                        )
+                    writer.write_table(table.slice(lo, hi - lo))
+                count += len(buckets)
+            if writer is not None:
+                self._close_parquet_bucket(writer, series_directory, bucket, bucket_ms, name, progress)
+                writer = None
+        finally:
+            # Leave a readable file behind on errors. It keeps its temporary name, so the bucket is exported again.
+            if writer is not None:
+                writer.close()
+        progress.update(name, end)
+        return count
+
+    @staticmethod
+    def _get_parquet_export_schema(aggregates, page):
+        # The schema is fixed for all the files of a time series, so it comes from the requested aggregates, or from
+        # whether the time series is numeric or string, rather than from the values of a page
+        pa = _utils.import_pyarrow()
+        if aggregates:
+            names = [_AGGREGATE_FIELD_NAMES.get(agg.strip().lower(), agg.strip()) for agg in aggregates.split(",")]
+            fields = [(name, pa.float64()) for name in OrderedDict.fromkeys(names)]
+        elif isinstance(page, tuple):
+            fields = [("value", pa.string() if isinstance(page[1], pd.Categorical) else pa.float64())]
+        else:
+            fields = [("value", pa.string() if isinstance(page[0].get("value"), str) else pa.float64())]
+        return pa.schema([pa.field("timestamp", pa.int64())] + [pa.field(name, type) for name, type in fields])
+
+    @staticmethod
+    def _page_to_parquet_export_table(page, schema):
+        pa = _utils.import_pyarrow()
+        if isinstance(page, tuple):
+            columns = OrderedDict([("timestamp", page[0]), ("value", np.asarray(page[1]))])
+        else:
+            columns = _utils.to_columns(page, include_metadata=False)
+        unknown_columns = set(columns) - set(schema.names)
+        if unknown_columns:
+            raise ValueError("Unexpected datapoint fields {}".format(sorted(unknown_columns)))
+        num_of_rows = len(columns["timestamp"])
+        arrays = [
+            pa.array(columns[field.name], field.type) if field.name in columns else pa.nulls(num_of_rows, field.type)
+            for field in schema
+        ]
+        return pa.Table.from_batches([pa.RecordBatch.from_arrays(arrays, schema=schema)])
+
+    def _close_parquet_bucket(self, writer, series_directory, bucket, bucket_ms, name, progress):
+        writer.close()
+        os.replace(
+            self._parquet_bucket_path(series_directory, bucket, bucket_ms, True),
+            self._parquet_bucket_path(series_directory, bucket, bucket_ms, False),
+        )
+        progress.update(name, (bucket + 1) * bucket_ms)
+
+    @staticmethod
+    def _parquet_bucket_path(series_directory, bucket, bucket_ms, tmp):
+        return os.path.join(series_directory, "{}.parquet{}".format(bucket * bucket_ms, ".tmp" if tmp else ""))
+
     def post_datapoints_frame(self, dataframe) -> None:
         """Write a dataframe.
         The dataframe must have a 'timestamp' column with timestamps in milliseconds since epoch.
@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 import json
-from copy import deepcopy
-from typing import List
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor as Pool
+from typing import Dict, Iterator, List
 
+import numpy as np
 import pandas as pd
 
 from cognite.client._api_client import APIClient, CogniteCollectionResponse, CogniteResource, CogniteResponse
@@ -41,17 +44,11 @@ class EventListResponse(CogniteCollectionResponse):
     """Event List Response Object."""
 
     _RESPONSE_CLASS = EventResponse
+    _CATEGORICAL_COLUMNS = ("type", "subType", "source")
 
     def __init__(self, internal_representation):
         super().__init__(internal_representation)
 
-    def to_pandas(self):
-        items = deepcopy(self.to_json())
-        for d in items:
-            if d.get("metadata"):
-                d.update(d.pop("metadata"))
-        return pd.DataFrame(items)
-
 
 class Event(CogniteResource):
     """Data transfer object for events.
@@ -78,6 +75,155 @@ class Event(CogniteResource):
         self.asset_ids = asset_ids
 
 
+class EventIndex:
+    """In-memory index of events for fast overlap, point-in-time and asset queries.
+
+    The events are sorted by start time, and the max end time is kept per block of sorted events, so an overlap query
+    only checks the blocks which can contain overlapping events. Asset ids are kept in an inverted index. Events
+    without an end time are treated as ongoing, and events without a start time as having started at the beginning of
+    time.
+
+    Args:
+        events (List[Dict]): The events to index, e.g. from EventListResponse.to_json().
+
+    Examples:
+        Finding the events on some assets that were ongoing during an alarm::
+
+            client = CogniteClient()
+            index = EventIndex(client.events.get_events(type="maintenance", autopaging=True).to_json())
+            res = index.overlapping(alarm_start, alarm_end, asset_ids=[123, 456])
+            print(res.to_pandas())
+    """
+
+    _MIN_TIME = np.iinfo(np.int64).min
+    _MAX_TIME = np.iinfo(np.int64).max
+
+    def __init__(self, events: List[Dict]):
+        self._events = list(events)
+        n = len(self._events)
+        starts = np.array(
+            [self._MIN_TIME if e.get("startTime") is None else e["startTime"] for e in self._events], dtype=np.int64
+        )
+        ends = np.array(
+            [self._MAX_TIME if e.get("endTime") is None else e["endTime"] for e in self._events], dtype=np.int64
+        )
+        self._order = np.argsort(starts, kind="mergesort")
+        self._starts = starts[self._order]
+        self._ends = ends[self._order]
+        self._block_size = max(1, int(math.ceil(math.sqrt(n))))
+        self._block_max_ends = np.array(
+            [self._ends[i : i + self._block_size].max() for i in range(0, n, self._block_size)], dtype=np.int64
+        )
+
+        # Inverted index from asset id to the positions of its events in start time order, as slices of one array
+        ranks = np.empty(n, dtype=np.int64)
+        ranks[self._order] = np.arange(n, dtype=np.int64)
+        event_asset_ids = [e.get("assetIds") or [] for e in self._events]
+        flat_asset_ids = np.array([a for asset_ids in event_asset_ids for a in asset_ids], dtype=np.int64)
+        flat_positions = np.repeat(ranks, [len(asset_ids) for asset_ids in event_asset_ids])
+        asset_order = np.argsort(flat_asset_ids, kind="mergesort")
+        self._asset_ids, asset_counts = np.unique(flat_asset_ids[asset_order], return_counts=True)
+        self._asset_offsets = np.concatenate(([0], np.cumsum(asset_counts))).astype(np.int64)
+        self._asset_positions = flat_positions[asset_order]
+
+    def __len__(self):
+        return len(self._events)
+
+    def overlapping(self, start: int, end: int, asset_ids: List[int] = None) -> EventListResponse:
+        """Returns the events which overlap a time range, ordered by start time.
+
+        Args:
+            start (int): Start of the range in ms since epoch, inclusive.
+            end (int): End of the range in ms since epoch, inclusive.
+            asset_ids (List[int]): Only return events linked to any of these assets.
+        """
+        return self._to_response(self._overlapping_positions(start, end, asset_ids))
+
+    def at(self, timestamp: int, asset_ids: List[int] = None) -> EventListResponse:
+        """Returns the events which are ongoing at a point in time, ordered by start time.
+
+        Args:
+            timestamp (int): The point in time in ms since epoch.
+            asset_ids (List[int]): Only return events linked to any of these assets.
+        """
+        return self.overlapping(timestamp, timestamp, asset_ids=asset_ids)
+
+    def for_assets(self, asset_ids: List[int]) -> EventListResponse:
+        """Returns the events linked to any of the given assets, ordered by start time.
+
+        Args:
+            asset_ids (List[int]): The asset ids.
+        """
+        return self._to_response(self._asset_event_positions(asset_ids))
+
+    def _overlapping_positions(self, start, end, asset_ids):
+        # Only events starting before the end of the range can overlap it, and those are a prefix of the sorted events
+        num_of_candidates = int(np.searchsorted(self._starts, end, side="right"))
+        num_of_full_blocks = num_of_candidates // self._block_size
+        blocks = np.nonzero(self._block_max_ends[:num_of_full_blocks] >= start)[0]
+        candidate_ranges = [np.arange(b * self._block_size, (b + 1) * self._block_size) for b in blocks]
+        candidate_ranges.append(np.arange(num_of_full_blocks * self._block_size, num_of_candidates))
+        candidates = np.concatenate(candidate_ranges).astype(np.int64)
+        positions = candidates[self._ends[candidates] >= start]
+        if asset_ids is not None:
+            positions = np.intersect1d(positions, self._asset_event_positions(asset_ids), assume_unique=True)
+        return positions
+
+    def _asset_event_positions(self, asset_ids):
+        # Positions in the sorted order of the events linked to any of the assets
+        locations = np.searchsorted(self._asset_ids, asset_ids)
+        event_positions = []
+        for asset_id, location in zip(asset_ids, locations):
+            if location < len(self._asset_ids) and self._asset_ids[location] == asset_id:
+                event_positions.append(
+                    self._asset_positions[self._asset_offsets[location] : self._asset_offsets[location + 1]]
+                )
+        if not event_positions:
+            return np.array([], dtype=np.int64)
+        return np.unique(np.concatenate(event_positions))
+
+    def _to_response(self, positions):
+        return EventListResponse({"data": {"items": [self._events[i] for i in self._order[positions].tolist()]}})
+
+    def save(self, path: str) -> None:
+        """Saves the index to a .npz file.
+
+        Args:
+            path (str): The path to save the index to.
+        """
+        np.savez(
+            path,
+            events=np.array(json.dumps(self._events)),
+            order=self._order,
+            starts=self._starts,
+            ends=self._ends,
+            block_max_ends=self._block_max_ends,
+            asset_ids=self._asset_ids,
+            asset_offsets=self._asset_offsets,
+            asset_positions=self._asset_positions,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "EventIndex":
+        """Loads an index saved with save().
+
+        Args:
+            path (str): The path of the saved index.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            index = cls.__new__(cls)
+            index._events = json.loads(str(data["events"]))
+            index._order = data["order"]
+            index._starts = data["starts"]
+            index._ends = data["ends"]
+            index._block_max_ends = data["block_max_ends"]
+            index._block_size = max(1, int(math.ceil(math.sqrt(len(index._events)))))
+            index._asset_ids = data["asset_ids"]
+            index._asset_offsets = data["asset_offsets"]
+            index._asset_positions = data["asset_positions"]
+        return index
+
+
 class EventsClient(APIClient):
     def __init__(self, **kwargs):
         super().__init__(version="0.5", **kwargs)
@@ -102,6 +248,29 @@ class EventsClient(APIClient):
         res = self._get(url)
         return EventResponse(res.json())
 
+    def get_multiple_events_by_id(self, event_ids: List[int], ignore_missing: bool = False) -> EventListResponse:
+        """Returns an EventListResponse containing the events with the provided ids.
+
+        The ids are deduplicated and requested in chunks which are fetched in parallel.
+
+        Args:
+            event_ids (List[int]):  The event ids.
+            ignore_missing (bool):  Whether or not to leave out ids which don't exist instead of raising an APIError
+                                    listing them under extra["missing"]. Defaults to False.
+
+        Returns:
+            stable.events.EventListResponse: The events, in the same order as the given ids.
+
+        Examples:
+            Getting several events::
+
+                client = CogniteClient()
+                res = client.events.get_multiple_events_by_id([123, 234])
+                print(res)
+        """
+        items = self._retrieve_by_ids("/events/byids", event_ids, ignore_missing=ignore_missing)
+        return EventListResponse({"data": {"items": items}})
+
     def get_events(self, type=None, sub_type=None, asset_id=None, **kwargs) -> EventListResponse:
         """Returns an EventListReponse object containing events matching the query.
 
@@ -119,6 +288,9 @@ class EventsClient(APIClient):
             max_start_time (string): Only return events form before this time.
             autopaging (bool):      Whether or not to automatically page through results. If set to true, limit will be
                                     disregarded. Defaults to False.
+            workers (int):          If set together with autopaging, the events are fetched with this many parallel
+                                    workers in windows of start time, as in iter_events(), and are returned ordered by
+                                    start time. Events without a start time are not included. Defaults to None.
 
         Returns:
             stable.events.EventListResponse: A data object containing the requested event.
@@ -131,6 +303,20 @@ class EventsClient(APIClient):
                 print(res.to_pandas())
         """
         autopaging = kwargs.get("autopaging", False)
+        if autopaging and kwargs.get("workers"):
+            items = []
+            for window in self.iter_events(
+                type,
+                sub_type,
+                asset_id,
+                min_start_time=kwargs.get("min_start_time"),
+                max_start_time=kwargs.get("max_start_time"),
+                workers=kwargs["workers"],
+                has_description=kwargs.get("has_description"),
+            ):
+                items.extend(window.to_json())
+            return EventListResponse({"data": {"items": items}})
+
         url = "/events"
 
         params = {
@@ -148,9 +334,125 @@ class EventsClient(APIClient):
         res = self._get(url, params=params, autopaging=autopaging)
         return EventListResponse(res.json())
 
+    def iter_events(
+        self,
+        type=None,
+        sub_type=None,
+        asset_id=None,
+        min_start_time: int = None,
+        max_start_time: int = None,
+        workers: int = None,
+        has_description: bool = None,
+    ) -> Iterator[EventListResponse]:
+        """Iterates over all events matching the query in windows of start time, fetching the windows in parallel.
+
+        The start time range is split into windows which are sized from how many events a probe of each window finds,
+        and each window is paged through by one of the workers. Windows are yielded in order of start time, while up to
+        `workers` windows ahead are being fetched. Events without a start time are not included.
+
+        Args:
+            type (str):             Type (class) of event, e.g. 'failure'.
+            sub_type (str):         Sub-type of event, e.g. 'electrical'.
+            asset_id (int):         Return events associated with this assetId.
+            min_start_time (int):   Only return events which start at or after this time, in ms since epoch. Defaults
+                                    to the start time of the first event.
+            max_start_time (int):   Only return events which start before this time, in ms since epoch. Defaults to
+                                    just after the start time of the last event.
+            workers (int):          Number of windows to fetch in parallel. Defaults to 10.
+            has_description (bool): Return only events that have a textual description.
+
+        Yields:
+            stable.events.EventListResponse: The events of each window, ordered by start time.
+
+        Examples:
+            Exporting all events of a type to csv files, one window at a time::
+
+                client = CogniteClient()
+                for i, window in enumerate(client.events.iter_events(type="maintenance", workers=20)):
+                    window.to_pandas().to_csv("events_{}.csv".format(i))
+        """
+        workers = workers or self._num_of_workers
+        query = {"type": type, "subtype": sub_type, "assetId": asset_id, "hasDescription": has_description}
+        windows = self._get_event_windows(query, min_start_time, max_start_time, workers)
+        with Pool(workers) as p:
+            futures = deque()
+            for window in windows:
+                futures.append(p.submit(self._get_events_in_window, query, window))
+                if len(futures) >= workers:
+                    yield EventListResponse({"data": {"items": futures.popleft().result()}})
+            while futures:
+                yield EventListResponse({"data": {"items": futures.popleft().result()}})
+
+    def _get_event_windows(self, query, min_start_time, max_start_time, workers):
+        if min_start_time is None:
+            first = self._search_events_by_start_time(query, None, max_start_time, "asc", 1)
+            if not first:
+                return []
+            min_start_time = first[0]["startTime"]
+        if max_start_time is None:
+            last = self._search_events_by_start_time(query, min_start_time, None, "desc", 1)
+            if not last:
+                return []
+            max_start_time = last[0]["startTime"] + 1
+        if max_start_time <= min_start_time:
+            return []
+
+        # Start with a few coarse windows per worker, then split the windows which a probe shows to be dense
+        num_of_windows = min(workers * 4, max_start_time - min_start_time)
+        boundaries = [
+            min_start_time + (max_start_time - min_start_time) * i // num_of_windows for i in range(num_of_windows + 1)
+        ]
+        coarse_windows = list(zip(boundaries[:-1], boundaries[1:]))
+        with Pool(workers) as p:
+            probes = p.map(
+                lambda window: self._search_events_by_start_time(query, window[0], window[1] - 1, "asc", self._LIMIT),
+                coarse_windows,
+            )
+
+        windows = []
+        for (start, end), probe in zip(coarse_windows, probes):
+            if len(probe) < self._LIMIT:
+                windows.append((start, end))
+                continue
+            # The probe is sorted by start time, so the time span it covers estimates the density of the window. There
+            # are no events between the start of the window and the first event of the probe.
+            first_start_time = probe[0]["startTime"]
+            covered = max(1, probe[-1]["startTime"] - first_start_time)
+            num_of_splits = max(1, min(end - first_start_time, math.ceil((end - first_start_time) / covered)))
+            boundaries = [
+                first_start_time + (end - first_start_time) * i // num_of_splits for i in range(num_of_splits + 1)
+            ]
+            boundaries[0] = start
+            windows.extend(zip(boundaries[:-1], boundaries[1:]))
+        return windows
+
+    def _search_events_by_start_time(self, query, min_start_time, max_start_time, dir, limit):
+        params = {
+            "type": query["type"],
+            "subtype": query["subtype"],
+            "assetIds": str([query["assetId"]] if query["assetId"] is not None else []),
+            "minStartTime": min_start_time,
+            "maxStartTime": max_start_time,
+            "sort": "startTime",
+            "dir": dir,
+            "limit": limit,
+        }
+        return self._get("/events/search", params=params).json()["data"]["items"]
+
+    def _get_events_in_window(self, query, window):
+        params = dict(query, minStartTime=window[0], maxStartTime=window[1], limit=self._LIMIT)
+        items = self._get("/events", params=params, autopaging=True).json()["data"]["items"]
+        # Windows share their boundaries, so only keep the events which start within this window
+        items = [
+            item for item in items if item.get("startTime") is not None and window[0] <= item["startTime"] < window[1]
+        ]
+        return sorted(items, key=lambda item: item["startTime"])
+
     def post_events(self, events: List[Event]) -> EventListResponse:
         """Adds a list of events and returns an EventListResponse object containing created events.
 
+        Large lists are split into several requests which are sent in parallel.
+
         Args:
             events (List[stable.events.Event]):    List of events to create.
 
@@ -170,9 +472,8 @@ class EventsClient(APIClient):
         """
         url = "/events"
         items = [event.camel_case_dict() for event in events]
-        body = {"items": items}
-        res = self._post(url, body=body)
-        return EventListResponse(res.json())
+        res = self._bulk_request("post", url, items)
+        return EventListResponse(self._merge_item_responses(res))
 
     def delete_events(self, event_ids: List[int]) -> None:
         """Deletes a list of events.
@@ -190,8 +491,7 @@ class EventsClient(APIClient):
                 res = client.events.delete_events(event_ids=[1,2,3,4,5])
         """
         url = "/events/delete"
-        body = {"items": event_ids}
-        self._post(url, body=body)
+        self._bulk_request("post", url, event_ids)
 
     def search_for_events(
         self,
@@ -236,6 +536,9 @@ class EventsClient(APIClient):
             dir (str):              Sort direction (desc or asc)
             limit (int):            Return up to this many results. Max is 1000, default is 25.
             offset (int):           Offset from the first result. Sum of limit and offset must not exceed 1000. Default is 0.
+            autopaging (bool):      Whether or not to get all results, regardless of the limit of 1000 results per
+                                    query. The query is split into ranges of created time which are searched in
+                                    parallel, and limit and offset are disregarded. Defaults to False.
 
         Returns:
             stable.events.EventListResponse.
@@ -269,5 +572,7 @@ class EventsClient(APIClient):
             "offset": kwargs.get("offset"),
         }
 
+        if kwargs.get("autopaging"):
+            return EventListResponse({"data": {"items": self._search_with_partitions(url, params)}})
         res = self._get(url, params=params)
         return EventListResponse(res.json())
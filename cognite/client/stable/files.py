@@ -48,9 +48,7 @@ class FileListResponse(CogniteCollectionResponse):
     """File List Response Object"""
 
     _RESPONSE_CLASS = FileInfoResponse
-
-    def to_pandas(self):
-        return pd.DataFrame(self.to_json())
+    _CATEGORICAL_COLUMNS = ("source", "fileType", "directory")
 
 
 class FilesClient(APIClient):
@@ -177,9 +175,14 @@ class FilesClient(APIClient):
                 res = client.files.delete_files([123, 234])
         """
         url = "/files/delete"
-        body = {"items": file_ids}
-        res = self._post(url, body=body)
-        return res.json()["data"]
+        merged = {}
+        for res in self._bulk_request("post", url, file_ids):
+            for key, value in res["data"].items():
+                if isinstance(value, list):
+                    merged.setdefault(key, []).extend(value)
+                else:
+                    merged[key] = value
+        return merged
 
     def list_files(self, name=None, directory=None, file_type=None, source=None, **kwargs) -> FileListResponse:
         """Get list of files matching query.
@@ -253,3 +256,26 @@ class FilesClient(APIClient):
         url = "/files/{}".format(id)
         res = self._get(url)
         return FileInfoResponse(res.json())
+
+    def get_multiple_file_infos_by_id(self, ids: List[int], ignore_missing: bool = False) -> FileListResponse:
+        """Returns information about several files.
+
+        The ids are deduplicated and requested in chunks which are fetched in parallel.
+
+        Args:
+            ids (List[int]):        Ids of the files.
+            ignore_missing (bool):  Whether or not to leave out ids which don't exist instead of raising an APIError
+                                    listing them under extra["missing"]. Defaults to False.
+
+        Returns:
+            stable.files.FileListResponse: The file infos, in the same order as the given ids.
+
+        Examples:
+            Getting information about several files::
+
+                client = CogniteClient()
+                res = client.files.get_multiple_file_infos_by_id([12345, 23456])
+                print(res)
+        """
+        items = self._retrieve_by_ids("/files/byids", ids, ignore_missing=ignore_missing)
+        return FileListResponse({"data": {"items": items}})
@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-from copy import deepcopy
 from typing import List
 from urllib.parse import quote
 
@@ -44,22 +43,7 @@ class TimeSeriesListResponse(CogniteCollectionResponse):
     """Time series Response Object"""
 
     _RESPONSE_CLASS = TimeSeriesResponse
-
-    def to_pandas(self, include_metadata: bool = True):
-        """Returns data as a pandas dataframe
-
-        Args:
-            include_metadata (bool): Whether or not to include metadata fields in the resulting dataframe
-        """
-        items = deepcopy(self.internal_representation["data"]["items"])
-        if items and items[0].get("metadata") is None:
-            return pd.DataFrame(items)
-        for d in items:
-            if d.get("metadata"):
-                metadata = d.pop("metadata")
-                if include_metadata:
-                    d.update(metadata)
-        return pd.DataFrame(items)
+    _CATEGORICAL_COLUMNS = ("unit", "source")
 
 
 class TimeSeries(CogniteResource):
@@ -170,8 +154,7 @@ class TimeSeriesClient(APIClient):
         """
         url = "/timeseries"
         items = [ts.camel_case_dict() for ts in time_series]
-        body = {"items": items}
-        self._post(url, body=body)
+        self._bulk_request("post", url, items)
 
     def update_time_series(self, time_series: List[TimeSeries]) -> None:
         """Update an existing time series.
@@ -196,8 +179,7 @@ class TimeSeriesClient(APIClient):
         """
         url = "/timeseries"
         items = [ts.camel_case_dict() for ts in time_series]
-        body = {"items": items}
-        self._put(url, body=body)
+        self._bulk_request("put", url, items)
 
     def delete_time_series(self, name) -> None:
         """Delete a timeseries.
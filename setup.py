@@ -13,6 +13,13 @@ setup(
     author="Erlend Vollset",
     author_email="erlend.vollset@cognite.com",
     install_requires=["requests", "pandas", "protobuf", "cognite-logger==0.4.*"],
+    extras_require={"arrow": ["pyarrow"]},
+    entry_points={
+        "console_scripts": [
+            "cognite-export=cognite.client.cli.export:main",
+            "cognite-ingest=cognite.client.cli.ingest:main",
+        ]
+    },
     python_requires=">=3.5",
     packages=["cognite." + p for p in find_packages(where="cognite")],
     zip_safe=False,
@@ -0,0 +1,46 @@
+from unittest import mock
+
+import pytest
+
+from cognite.client.cli import export
+
+
+class TestExport:
+    def test_main(self, tmpdir):
+        time_series_file = tmpdir.join("time_series.txt")
+        time_series_file.write("b\n\nc\n")
+        with mock.patch.object(export, "CogniteClient") as client:
+            client.return_value.datapoints.export_datapoints_to_parquet.return_value = {"a": 1, "b": 2, "c": 3}
+            export.main(
+                [
+                    "a",
+                    "--time-series-file",
+                    str(time_series_file),
+                    "--start",
+                    "1000",
+                    "--end",
+                    "1d-ago",
+                    "-o",
+                    str(tmpdir),
+                    "--aggregates",
+                    "avg,max",
+                    "--granularity",
+                    "1h",
+                    "--no-resume",
+                ]
+            )
+        client.return_value.datapoints.export_datapoints_to_parquet.assert_called_once_with(
+            ["a", "b", "c"],
+            start=1000,
+            end="1d-ago",
+            directory=str(tmpdir),
+            bucket_size="1d",
+            aggregates=["avg", "max"],
+            granularity="1h",
+            workers=None,
+            resume=False,
+        )
+
+    def test_main_without_time_series(self, tmpdir):
+        with pytest.raises(SystemExit):
+            export.main(["--start", "1w-ago", "-o", str(tmpdir)])
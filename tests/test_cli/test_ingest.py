@@ -0,0 +1,137 @@
+import io
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from cognite.client import APIError
+from cognite.client.cli import ingest
+
+
+@pytest.fixture
+def wide_csv(tmpdir):
+    path = tmpdir.join("wide.csv")
+    path.write("timestamp,a,b\n1000,1.5,\n2000,2.5,x\n3000,,y\n")
+    return str(path)
+
+
+@pytest.fixture
+def long_csv(tmpdir):
+    path = tmpdir.join("long.csv")
+    path.write("time,tag,v\n1970-01-01T00:00:01Z,a,1\n1970-01-01T00:00:01Z,b,2\n1970-01-01T00:00:02Z,a,3\n")
+    return str(path)
+
+
+class TestReadFile:
+    def test_read_wide_file(self, wide_csv):
+        datapoints = ingest.read_file(wide_csv)
+        assert ["a", "b"] == sorted(datapoints)
+        assert [1000, 2000] == datapoints["a"][0].tolist()
+        assert np.float64 == datapoints["a"][1].dtype
+        assert [1.5, 2.5] == datapoints["a"][1].tolist()
+        assert [2000, 3000] == datapoints["b"][0].tolist()
+        assert ["x", "y"] == datapoints["b"][1].tolist()
+
+    def test_read_long_file(self, long_csv):
+        datapoints = ingest.read_file(
+            long_csv, wide=False, timestamp_column="time", name_column="tag", value_column="v"
+        )
+        assert [1000, 2000] == datapoints["a"][0].tolist()
+        assert [1.0, 3.0] == datapoints["a"][1].tolist()
+        assert [1000] == datapoints["b"][0].tolist()
+
+    def test_read_file_without_timestamp_column(self, long_csv):
+        with pytest.raises(ValueError, match="timestamp"):
+            ingest.read_file(long_csv)
+
+
+class TestCreateMissingTimeSeries:
+    def test_create_missing_time_series(self):
+        existing = {"b", "e"}
+
+        def post_time_series(time_series):
+            if existing & {ts.name for ts in time_series}:
+                raise APIError("Duplicates", 409, None)
+
+        client = mock.MagicMock(_num_of_workers=2)
+        client.time_series.post_time_series.side_effect = post_time_series
+        datapoints = {name: (np.array([1]), np.array([1.0])) for name in "abcdef"}
+        datapoints["f"] = (np.array([1]), np.array(["x"], dtype=object))
+
+        assert ["a", "c", "d", "f"] == sorted(ingest.create_missing_time_series(client, datapoints))
+        created = [ts for call in client.time_series.post_time_series.call_args_list for ts in call[0][0]]
+        assert [True] == [ts.is_string for ts in created if ts.name == "f"][:1]
+
+    def test_create_missing_time_series_leaves_out_listed_duplicates(self):
+        def post_time_series(time_series):
+            duplicates = [{"name": ts.name} for ts in time_series if ts.name in ("b", "e")]
+            if duplicates:
+                raise APIError("Duplicates", 409, None, extra={"duplicates": duplicates})
+
+        client = mock.MagicMock(_num_of_workers=2)
+        client.time_series.post_time_series.side_effect = post_time_series
+        datapoints = {name: (np.array([1]), np.array([1.0])) for name in "abcdef"}
+
+        assert ["a", "c", "d", "f"] == sorted(ingest.create_missing_time_series(client, datapoints))
+        assert 2 == client.time_series.post_time_series.call_count
+
+    def test_create_missing_time_series_raises_other_errors(self):
+        client = mock.MagicMock(_num_of_workers=2)
+        client.time_series.post_time_series.side_effect = APIError("Bad request", 400, None)
+        with pytest.raises(APIError):
+            ingest.create_missing_time_series(client, {"a": (np.array([1]), np.array([1.0]))})
+
+
+class TestUpload:
+    def test_get_batches(self):
+        datapoints = {"a": (np.arange(7), np.arange(7.0)), "b": (np.arange(2), np.arange(2.0))}
+        batches = ingest.get_batches(datapoints, batch_size=3)
+        assert [[("a", 3)], [("a", 3)], [("a", 1), ("b", 2)]] == [
+            [(name, len(timestamps)) for name, timestamps, _ in batch] for batch in batches
+        ]
+
+    def test_upload_retries_failed_batches(self):
+        calls = []
+
+        def post(url, body):
+            calls.append(body)
+            if len(calls) == 1:
+                raise APIError("Service unavailable", 503, None)
+
+        client = mock.MagicMock(_num_of_workers=1)
+        client.datapoints._post.side_effect = post
+        with mock.patch.object(ingest.time, "sleep"):
+            failed = ingest.upload(
+                client, {"a": (np.array([1, 2]), np.array([1.0, 2.0]))}, retries=1, out=io.StringIO()
+            )
+        assert [] == failed
+        assert 2 == len(calls)
+        assert {
+            "items": [{"name": "a", "datapoints": [{"timestamp": 1, "value": 1.0}, {"timestamp": 2, "value": 2.0}]}]
+        } == calls[1]
+
+    def test_upload_returns_batches_which_still_fail(self):
+        client = mock.MagicMock(_num_of_workers=1)
+        client.datapoints._post.side_effect = APIError("Service unavailable", 503, None)
+        with mock.patch.object(ingest.time, "sleep"):
+            failed = ingest.upload(client, {"a": (np.array([1]), np.array([1.0]))}, retries=2, out=io.StringIO())
+        assert 1 == len(failed)
+        assert 3 == client.datapoints._post.call_count
+
+
+class TestMain:
+    def test_main(self, wide_csv, tmpdir):
+        other_csv = tmpdir.join("other.csv")
+        other_csv.write("timestamp,a\n4000,4.5\n")
+        with mock.patch.object(ingest, "CogniteClient") as client:
+            client.return_value._num_of_workers = 2
+            ingest.main([wide_csv, str(other_csv), "--processes", "1"])
+        posted = client.return_value.datapoints._post.call_args_list
+        timestamps = sorted(
+            (item["name"], dp["timestamp"])
+            for call in posted
+            for item in call[1]["body"]["items"]
+            for dp in item["datapoints"]
+        )
+        assert [("a", 1000), ("a", 2000), ("a", 4000), ("b", 2000), ("b", 3000)] == timestamps
+        assert 1 == client.return_value.time_series.post_time_series.call_count
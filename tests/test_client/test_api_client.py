@@ -8,6 +8,7 @@ import pytest
 
 from cognite.client import APIError
 from cognite.client._api_client import APIClient, _model_hosting_emulator_url_converter
+from cognite.client.exceptions import BulkOperationError
 from tests.conftest import MockReturnValue
 
 RESPONSE = {
@@ -298,3 +299,107 @@ class TestRequests:
     )
     def test_nostromo_emulator_url_converter(self, input, expected):
         assert expected == _model_hosting_emulator_url_converter(input)
+
+
+class TestBulkRequest:
+    @pytest.fixture
+    def mock_post(self, api_client):
+        def post(url, body):
+            if "fail" in body["items"]:
+                raise APIError("Bad item", 400, "request-id")
+            return MockReturnValue(json_data={"data": {"items": [{"id": item} for item in body["items"]]}})
+
+        with mock.patch.object(api_client, "_post", side_effect=post) as m:
+            yield m
+
+    def test_bulk_request_splits_into_chunks(self, api_client, url, mock_post):
+        res = api_client._bulk_request("post", url, list(range(5)), limit=2, workers=3)
+        assert [[0, 1], [2, 3], [4]] == [call[1]["body"]["items"] for call in mock_post.call_args_list]
+        assert {"data": {"items": [{"id": i} for i in range(5)]}} == api_client._merge_item_responses(res)
+
+    def test_bulk_request_single_chunk_error_is_raised_as_is(self, api_client, url, mock_post):
+        with pytest.raises(APIError) as e:
+            api_client._bulk_request("post", url, [1, "fail"], limit=2)
+        assert not isinstance(e.value, BulkOperationError)
+
+    def test_bulk_request_partial_failure(self, api_client, url, mock_post):
+        with pytest.raises(BulkOperationError) as e:
+            api_client._bulk_request("post", url, [0, 1, "fail", 3, 4], limit=2)
+        assert [0, 1, 4] == e.value.successful
+        assert ["fail", 3] == e.value.failed
+        assert 1 == len(e.value.errors)
+        assert 400 == e.value.code
+        assert [{"data": {"items": [{"id": 0}, {"id": 1}]}}, {"data": {"items": [{"id": 4}]}}] == e.value.responses
+        assert 3 == mock_post.call_count
+
+
+class TestRetrieveByIds:
+    @pytest.fixture
+    def mock_post(self, api_client):
+        existing_ids = set(range(10))
+
+        def post(url, body):
+            missing = [{"id": id} for id in body["items"] if id not in existing_ids]
+            if missing:
+                raise APIError("Not found", 400, "request-id", extra={"missing": missing})
+            return MockReturnValue(json_data={"data": {"items": [{"id": id} for id in body["items"]]}})
+
+        with mock.patch.object(api_client, "_post", side_effect=post) as m:
+            with mock.patch.object(api_client, "_LIMIT", 3):
+                yield m
+
+    def test_retrieve_by_ids(self, api_client, url, mock_post):
+        res = api_client._retrieve_by_ids(url, [5, 1, 5, 7, 2, 1, 0])
+        assert [5, 1, 7, 2, 0] == [item["id"] for item in res]
+        assert [[5, 1, 7], [2, 0]] == [call[1]["body"]["items"] for call in mock_post.call_args_list]
+
+    def test_retrieve_by_ids_missing(self, api_client, url, mock_post):
+        with pytest.raises(APIError) as e:
+            api_client._retrieve_by_ids(url, [1, 100, 2, 3, 200])
+        assert {"missing": [100, 200]} == e.value.extra
+
+    def test_retrieve_by_ids_ignore_missing(self, api_client, url, mock_post):
+        res = api_client._retrieve_by_ids(url, [1, 100, 2, 3, 200], ignore_missing=True)
+        assert [1, 2, 3] == [item["id"] for item in res]
+        assert [[1, 2], [1, 100, 2], [3], [3, 200]] == sorted(
+            call[1]["body"]["items"] for call in mock_post.call_args_list
+        )
+
+    def test_retrieve_by_ids_bad_request_without_missing_ids_is_raised(self, api_client, url):
+        with mock.patch.object(api_client, "_post", side_effect=APIError("Invalid ids", 400)):
+            with pytest.raises(APIError, match="Invalid ids"):
+                api_client._retrieve_by_ids(url, [1, 2])
+
+    def test_retrieve_by_ids_other_errors_are_raised(self, api_client, url):
+        with mock.patch.object(api_client, "_post", side_effect=APIError("Server error", 500)):
+            with pytest.raises(APIError) as e:
+                api_client._retrieve_by_ids(url, [1, 2])
+        assert 500 == e.value.code
+
+
+class TestSearchWithPartitions:
+    @pytest.fixture
+    def mock_get(self, api_client):
+        created_times = [0, 1, 2, 5, 5, 5, 5, 8, 9, 9, 20]
+        items = [{"id": i, "createdTime": created_time} for i, created_time in enumerate(created_times)]
+
+        def get(url, params):
+            matches = [
+                item for item in items if params["minCreatedTime"] <= item["createdTime"] <= params["maxCreatedTime"]
+            ]
+            return MockReturnValue(json_data={"data": {"items": matches[: params["limit"]]}})
+
+        with mock.patch.object(api_client, "_get", side_effect=get) as m:
+            with mock.patch.object(api_client, "_LIMIT", 3):
+                yield m
+
+    def test_search_with_partitions(self, api_client, url, mock_get):
+        res = api_client._search_with_partitions(url, {"name": "a", "minCreatedTime": 0, "maxCreatedTime": 10})
+        # Only 3 of the 4 items created at 5 can be found, since a single millisecond can't be split further
+        assert [0, 1, 2, 3, 4, 5, 7, 8, 9] == [item["id"] for item in res]
+        assert all("a" == call[1]["params"]["name"] for call in mock_get.call_args_list)
+
+    def test_search_with_partitions_without_time_range(self, api_client, url, mock_get):
+        res = api_client._search_with_partitions(url, {"minCreatedTime": None, "maxCreatedTime": None})
+        assert 10 == len(res)
+        assert 10 == len({item["id"] for item in res})
@@ -0,0 +1,116 @@
+import math
+import random
+import struct
+
+import numpy as np
+import pytest
+
+from cognite.client._auxiliary import _protobuf_decoder
+from cognite.client._auxiliary._protobuf_descriptors import _api_timeseries_data_v2_pb2
+
+
+def serialize(points, string_points=()):
+    ts_data = _api_timeseries_data_v2_pb2.TimeseriesData()
+    for timestamp, value in points:
+        point = ts_data.numericData.points.add()
+        point.timestamp = timestamp
+        point.value = value
+    for timestamp, value in string_points:
+        point = ts_data.stringData.points.add()
+        point.timestamp = timestamp
+        point.value = value
+    return ts_data.SerializeToString()
+
+
+def random_points(rng, n):
+    special_values = [0.0, -0.0, math.inf, -math.inf, math.nan, 5e-324, 1.7976931348623157e308]
+    timestamps = rng.choice(
+        [
+            lambda: rng.randint(1500000000000, 1600000000000),
+            lambda: rng.choice([0, 1, -1, 2 ** 63 - 1, -(2 ** 63)]),
+            lambda: rng.randint(-(2 ** 63), 2 ** 63 - 1),
+        ]
+    )
+    return [
+        (timestamps(), rng.choice(special_values) if rng.random() < 0.2 else rng.uniform(-1e6, 1e6)) for _ in range(n)
+    ]
+
+
+def assert_same_as_protobuf(content):
+    timestamps, values = _protobuf_decoder.decode_numeric_datapoints(content)
+    expected_timestamps, expected_values = _protobuf_decoder._decode_numeric_datapoints_with_protobuf(content)
+    assert np.int64 == timestamps.dtype
+    assert np.float64 == values.dtype
+    assert expected_timestamps.tolist() == timestamps.tolist()
+    np.testing.assert_array_equal(expected_values.view(np.int64), values.view(np.int64))
+
+
+class TestDecodeNumericDatapoints:
+    @pytest.mark.parametrize("seed", range(50))
+    def test_random_points(self, seed):
+        rng = random.Random(seed)
+        content = serialize(random_points(rng, rng.choice([0, 1, 2, 100, 1000])))
+        assert_same_as_protobuf(content)
+        # Decoded without falling back to the generated classes
+        _protobuf_decoder._decode_numeric_datapoints(content)
+
+    def test_regular_points(self):
+        points = [(1500000000000 + i * 1000, float(i) + 0.5) for i in range(1000)]
+        timestamps, values = _protobuf_decoder.decode_numeric_datapoints(serialize(points))
+        assert [p[0] for p in points] == timestamps.tolist()
+        assert [p[1] for p in points] == values.tolist()
+
+    def test_empty_message(self):
+        timestamps, values = _protobuf_decoder.decode_numeric_datapoints(b"")
+        assert 0 == len(timestamps) == len(values)
+
+    def test_ignores_string_data(self):
+        content = serialize([], string_points=[(2, "a")])
+        assert_same_as_protobuf(content)
+        assert [] == _protobuf_decoder.decode_numeric_datapoints(content)[0].tolist()
+
+    def test_repeated_numeric_data_fields_are_merged(self):
+        content = serialize([(1, 1.5), (2, 2.5)]) + serialize([(3, 0.0)])
+        assert_same_as_protobuf(content)
+        assert [1, 2, 3] == _protobuf_decoder.decode_numeric_datapoints(content)[0].tolist()
+
+    def test_falls_back_to_protobuf_for_unknown_fields(self):
+        # A point with an unknown fixed32 field 3 after the value
+        record = b"\x08\x01\x11" + struct.pack("<d", 1.5) + b"\x1d" + struct.pack("<f", 1.0)
+        content = b"\x12" + bytes([len(record) + 2]) + b"\x0a" + bytes([len(record)]) + record
+        with pytest.raises(_protobuf_decoder._UnsupportedEncoding):
+            _protobuf_decoder._decode_numeric_datapoints(content)
+        assert ([1], [1.5]) == tuple(a.tolist() for a in _protobuf_decoder.decode_numeric_datapoints(content))
+
+
+class TestDecodeStringDatapoints:
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_points(self, seed):
+        rng = random.Random(seed)
+        distinct_values = ["", "on", "off", "ø" * 100, "fault: {}".format("x" * 200)]
+        points = [
+            (rng.choice([0, -1, 1500000000000 + i, 2 ** 63 - 1]), rng.choice(distinct_values))
+            for i in range(rng.choice([1, 500]))
+        ]
+        content = serialize([], string_points=points)
+        timestamps, values = _protobuf_decoder.decode_string_datapoints(content)
+        expected_timestamps, expected_values = _protobuf_decoder._decode_string_datapoints_with_protobuf(content)
+        assert expected_timestamps.tolist() == timestamps.tolist()
+        assert list(expected_values) == list(values)
+        assert len(set(v for _, v in points)) == len(values.categories)
+        # Decoded without falling back to the generated classes
+        _protobuf_decoder._decode_string_datapoints(content)
+
+    def test_empty_string_data(self):
+        timestamps, values = _protobuf_decoder.decode_string_datapoints(b"")
+        assert 0 == len(timestamps) == len(values)
+
+    def test_values_share_string_objects(self):
+        content = serialize([], string_points=[(i, "running") for i in range(10)])
+        _, values = _protobuf_decoder.decode_datapoints(content)
+        assert 1 == len({id(value) for value in values})
+
+    def test_decode_datapoints_of_numeric_data(self):
+        timestamps, values = _protobuf_decoder.decode_datapoints(serialize([(1, 1.5)]))
+        assert [1] == timestamps.tolist()
+        assert np.float64 == values.dtype
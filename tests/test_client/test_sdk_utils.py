@@ -66,6 +66,18 @@ class TestFirstFit:
 
 
 class TestMisc:
+    def test_get_file_md5(self, tmpdir):
+        file_path = tmpdir.join("file.txt")
+        file_path.write("content")
+        assert "9a0364b9e99bb480dd25e1f0284c8555" == utils.get_file_md5(str(file_path), chunk_size=3)
+
+    @pytest.mark.parametrize(
+        "collection, chunk_size, expected_output",
+        [([], 2, []), ([1, 2, 3], 2, [[1, 2], [3]]), ([1, 2], 2, [[1, 2]]), ([1, 2], 5, [[1, 2]])],
+    )
+    def test_split_into_chunks(self, collection, chunk_size, expected_output):
+        assert expected_output == utils.split_into_chunks(collection, chunk_size)
+
     @pytest.mark.parametrize(
         "start, end, granularity, num_of_workers, expected_output",
         [
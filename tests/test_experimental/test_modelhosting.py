@@ -1,11 +1,15 @@
 import gzip
 import json
 import os
+import shutil
 import time
+from concurrent.futures import Future
+from copy import deepcopy
 from random import randint
 from unittest import mock
 
 import pytest
+import requests
 
 from cognite.client import APIError, CogniteClient
 from cognite.client.experimental.model_hosting.models import (
@@ -16,6 +20,9 @@ from cognite.client.experimental.model_hosting.models import (
     ModelResponse,
     ModelVersionCollectionResponse,
     ModelVersionResponse,
+    ModelVersionWaiter,
+    OnlinePredictionBatcher,
+    PredictionCache,
     PredictionError,
 )
 from cognite.client.experimental.model_hosting.schedules import ScheduleCollectionResponse, ScheduleResponse
@@ -81,6 +88,85 @@ class TestSourcePackages:
         assert "my_model" == sp.package_name
         source_packages.delete_source_package(id=sp.id)
 
+    source_package_response = {
+        "data": {
+            "items": [
+                {
+                    "isDeprecated": False,
+                    "packageName": "my_model",
+                    "isUploaded": True,
+                    "name": "test-sp",
+                    "availableOperations": ["TRAIN", "PREDICT"],
+                    "createdTime": 0,
+                    "runtimeVersion": "0.1",
+                    "id": 1,
+                    "metadata": {},
+                    "description": "",
+                    "project": "string",
+                }
+            ]
+        }
+    }
+
+    @mock.patch("requests.sessions.Session.get")
+    @mock.patch("requests.sessions.Session.put")
+    @mock.patch("requests.sessions.Session.post")
+    def test_build_and_upload_source_package_with_cache(
+        self, post_mock, put_mock, get_mock, source_package_directory, source_package_file_path, tmpdir
+    ):
+        post_mock.return_value = MockReturnValue(json_data={"data": {"id": 1, "uploadUrl": "https://upload.here"}})
+        put_mock.return_value = MockReturnValue()
+        get_mock.side_effect = [
+            MockReturnValue(json_data={"data": {"items": []}}),
+            MockReturnValue(json_data=self.source_package_response),
+        ]
+        cache_directory = str(tmpdir)
+
+        with mock.patch.object(source_packages, "_build_distribution", return_value=source_package_file_path) as build:
+            for i in range(2):
+                sp = source_packages.build_and_upload_source_package(
+                    name="test-sp",
+                    runtime_version="0.1",
+                    package_directory=source_package_directory,
+                    use_cache=True,
+                    cache_directory=cache_directory,
+                )
+                assert 1 == sp.id
+            assert 1 == build.call_count
+
+        assert 1 == post_mock.call_count
+        body = get_call_args_data_from_mock(post_mock, 0, decompress_gzip=True)
+        assert "my_model" == body["packageName"]
+        assert ["TRAIN", "PREDICT"] == body["availableOperations"]
+        assert "packageHash" in body["metadata"]
+
+    def test_package_hash_ignores_build_artifacts(self, source_package_directory, tmpdir):
+        package_directory = tmpdir.join("package")
+        shutil.copytree(source_package_directory, str(package_directory))
+        package_hash = source_packages._get_package_hash(str(package_directory), "name")
+
+        package_directory.join("dist", "my_model-0.1.tar.gz").write("tarball", ensure=True)
+        assert package_hash == source_packages._get_package_hash(str(package_directory), "name")
+        assert package_hash != source_packages._get_package_hash(str(package_directory), "other name")
+
+        package_directory.join("my_model", "model.py").write("changed", mode="a")
+        assert package_hash != source_packages._get_package_hash(str(package_directory), "name")
+
+    def test_package_hash_includes_subpackages_named_like_build_artifacts(self, source_package_directory, tmpdir):
+        package_directory = tmpdir.join("package")
+        shutil.copytree(source_package_directory, str(package_directory))
+        package_directory.join("my_model", "build", "__init__.py").write("", ensure=True)
+        package_hash = source_packages._get_package_hash(str(package_directory), "name")
+
+        package_directory.join("my_model", "build", "__init__.py").write("changed")
+        changed_package_hash = source_packages._get_package_hash(str(package_directory), "name")
+        assert package_hash != changed_package_hash
+
+        package_directory.join("my_model", "build", "__pycache__", "__init__.cpython-37.pyc").write("", ensure=True)
+        package_directory.join("my_model.egg-info", "PKG-INFO").write("", ensure=True)
+        package_directory.join("build", "lib", "model.py").write("", ensure=True)
+        assert changed_package_hash == source_packages._get_package_hash(str(package_directory), "name")
+
     def test_list_source_packages(self, created_source_package):
         res = source_packages.list_source_packages()
         assert len(res) > 0
@@ -166,6 +252,99 @@ class TestModels:
         with pytest.raises(PredictionError, match="User error"):
             models.online_predict(model_id=1)
 
+    @staticmethod
+    def double_instances(url, data, **kwargs):
+        instances = json.loads(gzip.decompress(data).decode())["instances"]
+        return MockReturnValue(json_data={"data": {"predictions": [2 * instance for instance in instances]}})
+
+    @mock.patch("requests.sessions.Session.put")
+    def test_predict_on_model_in_chunks(self, mock_put):
+        mock_put.side_effect = self.double_instances
+        predictions = models.online_predict(model_id=1, instances=list(range(10)), chunk_size=3)
+        assert [2 * i for i in range(10)] == predictions
+        assert 4 == mock_put.call_count
+
+    @mock.patch("requests.sessions.Session.put")
+    def test_online_prediction_batcher(self, mock_put):
+        mock_put.side_effect = self.double_instances
+        with OnlinePredictionBatcher(models, model_id=1, max_batch_size=5, max_latency_ms=1000) as batcher:
+            futures = [batcher.predict(i) for i in range(10)]
+            assert [2 * i for i in range(10)] == [future.result(timeout=5) for future in futures]
+        assert 2 == mock_put.call_count
+
+    @mock.patch("requests.sessions.Session.put")
+    def test_online_prediction_batcher_prediction_error(self, mock_put):
+        mock_put.return_value = MockReturnValue(json_data={"error": {"message": "User error", "code": 200}})
+        with OnlinePredictionBatcher(models, model_id=1, max_latency_ms=1) as batcher:
+            future = batcher.predict(1)
+            with pytest.raises(PredictionError, match="User error"):
+                future.result(timeout=5)
+
+    @mock.patch("requests.sessions.Session.put")
+    def test_online_prediction_batcher_wrong_number_of_predictions(self, mock_put):
+        mock_put.return_value = MockReturnValue(json_data={"data": {"predictions": [1]}})
+        with OnlinePredictionBatcher(models, model_id=1, max_batch_size=2, max_latency_ms=1000) as batcher:
+            futures = [batcher.predict(1), batcher.predict(2)]
+            for future in futures:
+                with pytest.raises(PredictionError, match="1 predictions for 2 instances"):
+                    future.result(timeout=5)
+
+    def test_online_prediction_batcher_predict_after_close(self):
+        batcher = OnlinePredictionBatcher(models, model_id=1)
+        batcher.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            batcher.predict(1)
+
+    def test_online_prediction_batcher_fails_instances_left_after_close(self):
+        batcher = OnlinePredictionBatcher(models, model_id=1)
+        # An instance queued behind the close marker is never sent by the worker
+        future = Future()
+        batcher._queue.put(batcher._CLOSE)
+        batcher._queue.put((1, future))
+        batcher.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            future.result(timeout=5)
+
+    @mock.patch("requests.sessions.Session.put")
+    def test_predict_on_model_version_with_cache(self, mock_put):
+        mock_put.side_effect = self.double_instances
+        cache = PredictionCache()
+        assert [2, 4, 6] == models.online_predict(model_id=1, version_id=1, instances=[1, 2, 3], cache=cache)
+        assert [4, 8, 8, 2] == models.online_predict(model_id=1, version_id=1, instances=[2, 4, 4, 1], cache=cache)
+        assert [4] == json.loads(gzip.decompress(mock_put.call_args[1]["data"]).decode())["instances"]
+        models.online_predict(model_id=1, version_id=1, instances=[1], args={"k": "v"}, cache=cache)
+        assert 3 == mock_put.call_count
+        assert 5 == len(cache)
+
+    @mock.patch("requests.sessions.Session.get")
+    @mock.patch("requests.sessions.Session.put")
+    def test_predict_on_model_with_cache_bypassed_on_active_version_change(self, mock_put, mock_get):
+        model = {
+            "id": 1,
+            "name": "model",
+            "project": "project",
+            "description": "",
+            "createdTime": 0,
+            "metadata": {},
+            "isDeprecated": False,
+            "activeVersionId": 1,
+            "inputFields": [],
+            "outputFields": [],
+        }
+        mock_get.return_value = MockReturnValue(json_data={"data": {"items": [model]}})
+        mock_put.side_effect = self.double_instances
+        cache = PredictionCache(active_version_ttl=0)
+
+        models.online_predict(model_id=1, instances=[1], cache=cache)
+        models.online_predict(model_id=1, instances=[1], cache=cache)
+        assert 1 == mock_put.call_count
+        assert mock_put.call_args[0][0].endswith("/analytics/models/1/versions/1/predict")
+
+        mock_get.return_value = MockReturnValue(json_data={"data": {"items": [dict(model, activeVersionId=2)]}})
+        models.online_predict(model_id=1, instances=[1], cache=cache)
+        assert 2 == mock_put.call_count
+        assert mock_put.call_args[0][0].endswith("/analytics/models/1/versions/2/predict")
+
     def test_deprecate_model(self, created_model):
         res = models.deprecate_model(id=created_model.id)
         assert isinstance(res, ModelResponse)
@@ -174,6 +353,28 @@ class TestModels:
         assert model.is_deprecated is True
 
 
+class TestPredictionCache:
+    def test_least_recently_used_is_evicted(self):
+        cache = PredictionCache(max_size=2)
+        cache._put("a", 1)
+        cache._put("b", 2)
+        assert (True, 1) == cache._get("a")
+        cache._put("c", 3)
+        assert (False, None) == cache._get("b")
+        assert (True, 1) == cache._get("a")
+        assert (True, 3) == cache._get("c")
+
+    def test_expired_predictions_are_not_returned(self):
+        cache = PredictionCache(ttl=10)
+        with mock.patch("time.time", return_value=0):
+            cache._put("a", 1)
+        with mock.patch("time.time", return_value=5):
+            assert (True, 1) == cache._get("a")
+        with mock.patch("time.time", return_value=11):
+            assert (False, None) == cache._get("a")
+        assert 0 == len(cache)
+
+
 class TestVersions:
     model_version_response = {
         "data": {
@@ -353,6 +554,71 @@ class TestVersions:
         assert {"name": "artifact1.txt"} in post_artifacts_call_args
         assert {"name": "sub_dir/artifact2.txt"} in post_artifacts_call_args
 
+    @pytest.fixture
+    def artifacts_directory(self, tmpdir):
+        tmpdir.join("artifact1.txt").write("content1")
+        tmpdir.mkdir("sub_dir").join("artifact2.txt").write("content2")
+        yield str(tmpdir)
+
+    @mock.patch("requests.sessions.Session.put")
+    @mock.patch("requests.sessions.Session.post")
+    @mock.patch("requests.sessions.Session.get")
+    def test_upload_artifacts_from_directory_sync(self, get_mock, post_mock, put_mock, artifacts_directory):
+        post_mock.return_value = MockReturnValue(json_data={"data": {"uploadUrl": "https://upload.here"}})
+        put_mock.return_value = MockReturnValue()
+        get_mock.return_value = MockReturnValue(json_data={"data": {"items": []}})
+
+        models.upload_artifacts_from_directory(model_id=1, version_id=1, directory=artifacts_directory, sync=True)
+        assert 2 == post_mock.call_count
+        assert os.path.isfile(os.path.join(artifacts_directory, ".artifacts_manifest.json"))
+
+        get_mock.return_value = MockReturnValue(
+            json_data={
+                "data": {"items": [{"name": "artifact1.txt", "size": 8}, {"name": "sub_dir/artifact2.txt", "size": 8}]}
+            }
+        )
+        models.upload_artifacts_from_directory(model_id=1, version_id=1, directory=artifacts_directory, sync=True)
+        assert 2 == post_mock.call_count
+
+        with open(os.path.join(artifacts_directory, "artifact1.txt"), "w") as f:
+            f.write("CONTENT1")
+        models.upload_artifacts_from_directory(model_id=1, version_id=1, directory=artifacts_directory, sync=True)
+        assert 3 == post_mock.call_count
+        assert {"name": "artifact1.txt"} == get_call_args_data_from_mock(post_mock, 2, decompress_gzip=True)
+
+    @mock.patch("requests.sessions.Session.put")
+    @mock.patch("requests.sessions.Session.post")
+    def test_upload_artifacts_from_directory_skips_manifest(self, post_mock, put_mock, artifacts_directory):
+        post_mock.return_value = MockReturnValue(json_data={"data": {"uploadUrl": "https://upload.here"}})
+        put_mock.return_value = MockReturnValue()
+        with open(os.path.join(artifacts_directory, ".artifacts_manifest.json"), "w") as f:
+            f.write("{}")
+
+        models.upload_artifacts_from_directory(model_id=1, version_id=1, directory=artifacts_directory)
+        assert 2 == post_mock.call_count
+        names = [get_call_args_data_from_mock(post_mock, i, decompress_gzip=True)["name"] for i in range(2)]
+        assert ".artifacts_manifest.json" not in names
+
+    @mock.patch("requests.sessions.Session.get")
+    def test_download_artifacts(self, get_mock, tmpdir):
+        def get_response(url, *args, **kwargs):
+            if url.endswith("/artifacts"):
+                return MockReturnValue(
+                    json_data={"data": {"items": [{"name": "a1", "size": 2}, {"name": "sub_dir/a2", "size": 2}]}}
+                )
+            if "/artifacts/" in url:
+                return MockReturnValue(json_data={"data": {"downloadUrl": "https://download.me/" + url[-2:]}})
+            return MockReturnValue(content=url[-2:].encode())
+
+        get_mock.side_effect = get_response
+        models.download_artifacts(model_id=1, version_id=1, directory=str(tmpdir), sync=True)
+        assert b"a1" == tmpdir.join("a1").read_binary()
+        assert b"a2" == tmpdir.join("sub_dir", "a2").read_binary()
+        assert 5 == get_mock.call_count
+
+        models.download_artifacts(model_id=1, version_id=1, directory=str(tmpdir), sync=True)
+        assert 6 == get_mock.call_count
+
     @mock.patch("requests.sessions.Session.put")
     def test_deprecate_model_version(self, mock_put):
         mock_put.return_value = MockReturnValue(json_data=self.model_version_response)
@@ -404,6 +670,88 @@ class TestVersions:
             models.online_predict(model_id=1, version_id=1)
 
 
+class TestModelVersionWaiter:
+    @staticmethod
+    def model_versions_response(statuses):
+        items = []
+        for id, status in statuses.items():
+            item = deepcopy(TestVersions.model_version_response["data"]["items"][0])
+            item.update({"id": id, "status": status})
+            items.append(item)
+        return MockReturnValue(json_data={"data": {"items": items}})
+
+    @mock.patch("requests.sessions.Session.get")
+    def test_wait_for_model_versions(self, get_mock):
+        get_mock.side_effect = [
+            self.model_versions_response({1: "TRAINING", 2: "DEPLOYING", 3: "READY"}),
+            self.model_versions_response({1: "READY", 2: "FAILED", 3: "READY"}),
+        ]
+        with ModelVersionWaiter(models, initial_poll_interval=0.01) as waiter:
+            futures = [waiter.wait_for(1, 1), waiter.wait_for(1, 2)]
+            assert ["READY", "FAILED"] == [future.result(timeout=5).status for future in futures]
+        assert 2 == get_mock.call_count
+
+    @mock.patch("requests.sessions.Session.get")
+    def test_wait_for_model_versions_timeout(self, get_mock):
+        get_mock.return_value = self.model_versions_response({1: "TRAINING"})
+        with ModelVersionWaiter(models, initial_poll_interval=0.01, timeout=0) as waiter:
+            with pytest.raises(TimeoutError, match="TRAINING"):
+                waiter.wait_for(1, 1).result(timeout=5)
+
+    @mock.patch("requests.sessions.Session.get")
+    def test_wait_for_model_versions_survives_failed_polls(self, get_mock):
+        get_mock.side_effect = [
+            requests.exceptions.ConnectionError("Connection reset"),
+            MockReturnValue(content=b"not json"),
+            self.model_versions_response({1: "READY"}),
+        ]
+        with ModelVersionWaiter(models, initial_poll_interval=0.01) as waiter:
+            assert "READY" == waiter.wait_for(1, 1).result(timeout=5).status
+        assert 3 == get_mock.call_count
+
+    @mock.patch("requests.sessions.Session.get")
+    def test_wait_for_model_versions_timeout_while_polls_fail(self, get_mock):
+        get_mock.side_effect = requests.exceptions.ConnectionError("Connection reset")
+        with ModelVersionWaiter(models, initial_poll_interval=0.01, timeout=0) as waiter:
+            with pytest.raises(TimeoutError, match="could not be polled"):
+                waiter.wait_for(1, 1).result(timeout=5)
+
+    @mock.patch("requests.sessions.Session.get")
+    def test_wait_for_model_version_not_listed_yet(self, get_mock):
+        get_mock.side_effect = [self.model_versions_response({}), self.model_versions_response({1: "READY"})]
+        with ModelVersionWaiter(models, initial_poll_interval=0.01) as waiter:
+            assert "READY" == waiter.wait_for(1, 1).result(timeout=5).status
+        assert 2 == get_mock.call_count
+
+    @mock.patch("requests.sessions.Session.get")
+    def test_wait_for_model_version_not_found(self, get_mock):
+        get_mock.return_value = self.model_versions_response({2: "READY"})
+        with ModelVersionWaiter(models, initial_poll_interval=0.01, not_found_grace_period=0.05) as waiter:
+            with pytest.raises(APIError, match="not found"):
+                waiter.wait_for(1, 1).result(timeout=5)
+        assert get_mock.call_count > 1
+
+    @mock.patch("requests.sessions.Session.get")
+    def test_wait_for_does_not_cut_polling_interval_short(self, get_mock):
+        get_mock.return_value = self.model_versions_response({1: "READY", 2: "READY"})
+        waiter = ModelVersionWaiter(models, initial_poll_interval=10)
+        waiter.wait_for(1, 1)
+        time.sleep(0.05)
+        waiter.wait_for(1, 2)
+        time.sleep(0.05)
+        assert 0 == get_mock.call_count
+        waiter.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            waiter.wait_for(1, 1)
+
+    @mock.patch("requests.sessions.Session.get")
+    def test_wait_for_model_versions_blocking(self, get_mock):
+        get_mock.return_value = self.model_versions_response({1: "READY", 2: "READY"})
+        with mock.patch("random.uniform", return_value=0):
+            versions = models.wait_for_model_versions([(1, 2), (1, 1)])
+        assert [2, 1] == [version.id for version in versions]
+
+
 class TestSchedules:
     schedule_response = {
         "data": {
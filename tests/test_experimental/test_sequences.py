@@ -1,12 +1,14 @@
+import json
 from time import sleep
 from typing import List
+from unittest import mock
 
 import pandas as pd
 import pytest
 
 from cognite.client import APIError, CogniteClient
 from cognite.client.experimental.sequences import Column, Row, RowValue, Sequence, SequenceDataResponse
-from tests.conftest import generate_random_string
+from tests.conftest import MockReturnValue, generate_random_string
 
 sequences = CogniteClient().experimental.sequences
 
@@ -124,3 +126,197 @@ class TestSequences:
         # Check that we now can't fetch it
         with pytest.raises(APIError):
             sequences.get_sequence_by_id(sequence_that_is_created_retrieved_by_id.id)
+
+
+class TestSequenceDataResponse:
+    @pytest.fixture
+    def data_response(self):
+        return SequenceDataResponse(
+            rows=[
+                Row(row_number=1, values=[RowValue(column_id=1, value=1.5), RowValue(column_id=2, value=3)]),
+                Row(row_number=2, values=[RowValue(column_id=2, value=4), RowValue(column_id=3, value="a")]),
+                Row(row_number=3, values=[RowValue(column_id=1, value=2.5), RowValue(column_id=2, value=5)]),
+            ]
+        )
+
+    def test_to_pandas(self, data_response):
+        df = data_response.to_pandas()
+        assert [1, 2, 3] == list(df.columns)
+        assert [1.5, 2.5] == df[1].dropna().tolist()
+        assert pd.isna(df[1][1])
+        assert [3, 4, 5] == df[2].tolist()
+        assert pd.isna(df[3][0]) and "a" == df[3][1] and pd.isna(df[3][2])
+
+    def test_to_pandas_with_column_value_types(self, data_response):
+        data_response.columns = [
+            Column(id=1, name="c1", external_id="c1", value_type="DOUBLE", metadata={}),
+            Column(id=2, name="c2", external_id="c2", value_type="LONG", metadata={}),
+            Column(id=3, name="c3", external_id="c3", value_type="STRING", metadata={}),
+        ]
+        df = data_response.to_pandas()
+        assert "float64" == df[1].dtype
+        assert "int64" == df[2].dtype
+        assert "object" == df[3].dtype
+
+    def test_to_pandas_long_column_with_missing_values(self):
+        data_response = SequenceDataResponse(
+            rows=[Row(row_number=1, values=[RowValue(column_id=1, value=1)]), Row(row_number=2, values=[])],
+            columns=[Column(id=1, name="c1", external_id="c1", value_type="LONG", metadata={})],
+        )
+        df = data_response.to_pandas()
+        assert "float64" == df[1].dtype
+        assert pd.isna(df[1][1])
+
+    def test_to_pandas_long_column_with_null_values(self):
+        data_response = SequenceDataResponse.from_JSON(
+            {
+                "rows": [
+                    {"rowNumber": 1, "values": [{"columnId": 1, "value": 1}]},
+                    {"rowNumber": 2, "values": [{"columnId": 1, "value": None}]},
+                ]
+            },
+            columns=[Column(id=1, name="c1", external_id="c1", value_type="LONG", metadata={})],
+        )
+        df = data_response.to_pandas()
+        assert "float64" == df[1].dtype
+        assert pd.isna(df[1][1])
+
+    def test_to_pandas_empty(self):
+        df = SequenceDataResponse(rows=[]).to_pandas()
+        assert isinstance(df, pd.DataFrame)
+        assert df.empty
+
+
+class TestSequenceDataPaging:
+    NUM_OF_ROWS = 95
+    SERVER_LIMIT = 10
+
+    @pytest.fixture
+    def mock_get_sequence(self):
+        sequence = {
+            "id": 1,
+            "columns": [{"id": 1, "name": "c1", "valueType": "LONG", "metadata": {}}],
+            "description": None,
+            "metadata": {},
+        }
+        with mock.patch.object(
+            sequences, "_get", return_value=mock.MagicMock(text=json.dumps({"data": {"items": [sequence]}}))
+        ) as get:
+            with mock.patch.object(sequences, "_columns_by_id", {}):
+                yield get
+
+    @pytest.fixture
+    def mock_getdata(self, mock_get_sequence):
+        """Serves rows 0..NUM_OF_ROWS-1 with a page size of 10, and records the requested ranges."""
+        requests = []
+
+        def getdata(url, body):
+            request = body["items"][0]
+            requests.append(request)
+            inclusive_from = request["inclusiveFrom"] or 0
+            inclusive_to = self.NUM_OF_ROWS - 1 if request["inclusiveTo"] is None else request["inclusiveTo"]
+            row_numbers = list(range(inclusive_from, min(inclusive_to, self.NUM_OF_ROWS - 1) + 1))[
+                : min(request["limit"], self.SERVER_LIMIT)
+            ]
+            rows = [{"rowNumber": i, "values": [{"columnId": 1, "value": i * 2}]} for i in row_numbers]
+            return MockReturnValue(json_data={"data": {"items": [{"rows": rows}]}})
+
+        with mock.patch.object(sequences, "_post", side_effect=getdata):
+            with mock.patch.object(sequences, "_DATA_LIMIT", 10):
+                yield requests
+
+    def test_get_data_from_sequence_autopaging(self, mock_getdata):
+        res = sequences.get_data_from_sequence(id=1, inclusive_from=0, inclusive_to=999, autopaging=True, workers=4)
+        assert list(range(self.NUM_OF_ROWS)) == [row.rowNumber for row in res.rows]
+        assert [i * 2 for i in range(self.NUM_OF_ROWS)] == [row.values[0].value for row in res.rows]
+        assert {0, 250, 500, 750} <= {request["inclusiveFrom"] for request in mock_getdata}
+
+    @pytest.mark.parametrize("autopaging", [False, True])
+    def test_get_data_from_sequence_uses_column_value_types(self, mock_getdata, autopaging):
+        res = sequences.get_data_from_sequence(id=1, inclusive_from=0, inclusive_to=999, autopaging=autopaging)
+        assert "int64" == res.to_pandas()[1].dtype
+
+    def test_iter_data_from_sequence_uses_column_value_types(self, mock_getdata):
+        for block in sequences.iter_data_from_sequence(id=1, inclusive_from=0, inclusive_to=199, block_size=25):
+            assert "int64" == block.to_pandas()[1].dtype
+
+    def test_sequence_is_retrieved_once(self, mock_getdata, mock_get_sequence):
+        sequences.get_data_from_sequence(id=1, inclusive_from=0, inclusive_to=9)
+        list(sequences.iter_data_from_sequence(id=1, inclusive_from=0, inclusive_to=9))
+        assert 1 == mock_get_sequence.call_count
+
+    def test_get_data_from_sequence_with_columns(self, mock_getdata, mock_get_sequence):
+        columns = [Column(id=1, name="c1", value_type="LONG", metadata={})]
+        res = sequences.get_data_from_sequence(id=1, inclusive_from=0, inclusive_to=9, columns=columns)
+        assert "int64" == res.to_pandas()[1].dtype
+        assert 0 == mock_get_sequence.call_count
+
+    def test_get_data_from_sequence_autopaging_open_range(self, mock_getdata):
+        res = sequences.get_data_from_sequence(id=1, autopaging=True)
+        assert list(range(self.NUM_OF_ROWS)) == [row.rowNumber for row in res.rows]
+        assert 11 == len(mock_getdata)
+
+    @pytest.mark.parametrize("inclusive_to", [None, 999])
+    def test_get_data_from_sequence_with_lower_server_limit(self, mock_getdata, inclusive_to):
+        with mock.patch.object(TestSequenceDataPaging, "SERVER_LIMIT", 7):
+            res = sequences.get_data_from_sequence(id=1, inclusive_from=0, inclusive_to=inclusive_to, autopaging=True)
+        assert list(range(self.NUM_OF_ROWS)) == res.row_numbers
+
+    def test_get_data_from_sequence_without_autopaging(self, mock_getdata):
+        res = sequences.get_data_from_sequence(id=1, inclusive_from=0, inclusive_to=999, limit=5)
+        assert list(range(5)) == [row.rowNumber for row in res.rows]
+        assert 1 == len(mock_getdata)
+
+    def test_iter_data_from_sequence(self, mock_getdata):
+        blocks = list(
+            sequences.iter_data_from_sequence(id=1, inclusive_from=0, inclusive_to=199, block_size=25, workers=3)
+        )
+        assert 4 == len(blocks)
+        assert list(range(self.NUM_OF_ROWS)) == [row.rowNumber for block in blocks for row in block.rows]
+
+    def test_iter_data_from_sequence_open_range(self, mock_getdata):
+        blocks = list(sequences.iter_data_from_sequence(id=1))
+        assert 10 == len(blocks)
+        assert list(range(self.NUM_OF_ROWS)) == [row.rowNumber for block in blocks for row in block.rows]
+
+    def test_concat_pages_with_different_columns(self):
+        first = SequenceDataResponse.from_JSON({"rows": [{"rowNumber": 0, "values": [{"columnId": 1, "value": 1}]}]})
+        second = SequenceDataResponse.from_JSON({"rows": [{"rowNumber": 1, "values": [{"columnId": 2, "value": 2}]}]})
+        res = SequenceDataResponse._concat([first, second])
+        assert [0, 1] == res.row_numbers
+        assert [[1], [2]] == [[value.value for value in row.values] for row in res.rows]
+        assert [[1], [2]] == [[value.columnId for value in row.values] for row in res.rows]
+
+
+class TestPostSequenceData:
+    @pytest.fixture
+    def mock_post(self):
+        with mock.patch.object(sequences, "_post") as post:
+            with mock.patch.object(sequences, "_POST_DATA_ROW_LIMIT", 3):
+                with mock.patch.object(sequences, "_POST_DATA_VALUE_LIMIT", 5):
+                    yield post
+
+    @staticmethod
+    def posted_rows(post_mock):
+        bodies = [call[1]["body"] for call in post_mock.call_args_list]
+        return sorted([body["items"][0]["rows"] for body in bodies], key=lambda rows: rows[0]["rowNumber"])
+
+    def test_post_data_frame_to_sequence(self, mock_post):
+        df = pd.DataFrame({1: [1.0, None, 3.0, 4.0], 2: ["a", "b", None, "d"]}, index=[10, 11, 12, 13])
+        sequences.post_data_frame_to_sequence(id=1, dataframe=df)
+        rows = [row for chunk in self.posted_rows(mock_post) for row in chunk]
+        assert [
+            {"rowNumber": 10, "values": [{"columnId": 1, "value": 1.0}, {"columnId": 2, "value": "a"}]},
+            {"rowNumber": 11, "values": [{"columnId": 2, "value": "b"}]},
+            {"rowNumber": 12, "values": [{"columnId": 1, "value": 3.0}]},
+            {"rowNumber": 13, "values": [{"columnId": 1, "value": 4.0}, {"columnId": 2, "value": "d"}]},
+        ] == rows
+        assert "/sequences/1/postdata" == mock_post.call_args[0][0]
+
+    def test_post_data_to_sequence_is_split_by_limits(self, mock_post):
+        rows = [
+            Row(row_number=i, values=[RowValue(column_id=1, value=i), RowValue(column_id=2, value=i)]) for i in range(7)
+        ]
+        sequences.post_data_to_sequence(id=1, rows=rows)
+        chunks = self.posted_rows(mock_post)
+        assert [[0, 1], [2, 3], [4, 5], [6]] == [[row["rowNumber"] for row in chunk] for chunk in chunks]
@@ -1,10 +1,12 @@
 import time
+from unittest import mock
 
 import pandas as pd
 import pytest
 
-from cognite.client import CogniteClient
-from cognite.client.stable.assets import Asset, AssetListResponse, AssetResponse
+from cognite.client import APIError, CogniteClient
+from cognite.client.exceptions import BulkOperationError
+from cognite.client.stable.assets import Asset, AssetHierarchy, AssetListResponse, AssetResponse
 from tests.conftest import generate_random_string
 
 assets = CogniteClient(debug=True).assets
@@ -43,6 +45,14 @@ def test_get_asset():
     assert res.to_pandas().shape[1] == 1
 
 
+def test_get_asset_gets_only_the_asset():
+    response = {"data": {"items": [{"id": 1, "name": "pump", "depth": 1}]}}
+    with mock.patch.object(assets, "_get", return_value=mock.Mock(json=lambda: response)) as get:
+        res = assets.get_asset(1)
+    assert "/assets/1" == get.call_args[0][0]
+    assert (1, "pump") == (res.id, res.name)
+
+
 def test_attributes_not_none():
     asset = assets.get_asset(6354653755843357)
     for key, val in asset.__dict__.items():
@@ -102,3 +112,301 @@ def test_delete_assets(created_asset):
 def test_search_for_assets():
     res = assets.search_for_assets()
     assert len(res.to_json()) > 0
+
+
+@pytest.fixture
+def asset_hierarchy():
+    #      1          7
+    #    /   \        |
+    #   2     3       8
+    #  / \     \
+    # 4   5     6
+    parents = {1: None, 2: 1, 3: 1, 4: 2, 5: 2, 6: 3, 7: None, 8: 7}
+    return AssetHierarchy(
+        [{"id": id, "parentId": parent_id, "lastUpdatedTime": id * 10} for id, parent_id in parents.items()]
+    )
+
+
+class TestAssetHierarchy:
+    def test_structure(self, asset_hierarchy):
+        assert 8 == len(asset_hierarchy)
+        assert [1, 7] == sorted(asset_hierarchy.roots())
+        assert [4, 5] == sorted(asset_hierarchy.children(2))
+        assert 2 == asset_hierarchy.parent(5)
+        assert asset_hierarchy.parent(1) is None
+        assert 2 == asset_hierarchy.depth(6)
+        assert 80 == asset_hierarchy.last_updated_time
+        assert isinstance(asset_hierarchy[4], AssetResponse)
+        assert 4 == asset_hierarchy[4].id
+
+    def test_ancestors_and_path(self, asset_hierarchy):
+        assert [2, 1] == asset_hierarchy.ancestors(4)
+        assert [1, 3, 6] == asset_hierarchy.path(6)
+        assert [7] == asset_hierarchy.path(7)
+
+    def test_subtree(self, asset_hierarchy):
+        assert [1, 2, 3, 4, 5, 6] == sorted(asset_hierarchy.subtree(1))
+        assert [1, 2, 3] == sorted(asset_hierarchy.subtree(1, depth=1))
+        assert [3, 6] == sorted(asset_hierarchy.subtree(3))
+        assert asset_hierarchy.is_in_subtree(6, 1)
+        assert asset_hierarchy.is_in_subtree(2, 2)
+        assert not asset_hierarchy.is_in_subtree(6, 2)
+        assert not asset_hierarchy.is_in_subtree(8, 1)
+
+    def test_lowest_common_ancestor(self, asset_hierarchy):
+        assert 2 == asset_hierarchy.lowest_common_ancestor(4, 5)
+        assert 1 == asset_hierarchy.lowest_common_ancestor(4, 6)
+        assert 2 == asset_hierarchy.lowest_common_ancestor(2, 5)
+        assert 2 == asset_hierarchy.lowest_common_ancestor(5, 2)
+        assert 6 == asset_hierarchy.lowest_common_ancestor(6, 6)
+        assert asset_hierarchy.lowest_common_ancestor(4, 8) is None
+
+    def test_update_moves_subtree(self, asset_hierarchy):
+        asset_hierarchy.update([{"id": 2, "parentId": 8, "lastUpdatedTime": 100}, {"id": 9, "parentId": 4}])
+        assert [7, 8, 2, 4, 9] == asset_hierarchy.path(9)
+        assert [1, 3, 6] == sorted(asset_hierarchy.subtree(1))
+        assert 100 == asset_hierarchy.last_updated_time
+
+    def test_remove(self, asset_hierarchy):
+        asset_hierarchy.remove([2])
+        assert 2 not in asset_hierarchy
+        assert [1, 4, 5, 7] == sorted(asset_hierarchy.roots())
+
+    def test_unknown_asset(self, asset_hierarchy):
+        with pytest.raises(KeyError):
+            asset_hierarchy.subtree(123)
+
+    def test_cycle(self):
+        with pytest.raises(ValueError):
+            AssetHierarchy([{"id": 1, "parentId": 2}, {"id": 2, "parentId": 1}])
+
+    def test_refresh_asset_hierarchy(self, asset_hierarchy):
+        changed = [{"id": 6, "parentId": 2, "lastUpdatedTime": 90}, {"id": 10, "parentId": 6, "lastUpdatedTime": 95}]
+        with mock.patch.object(
+            assets, "search_for_assets", return_value=AssetListResponse({"data": {"items": changed}})
+        ):
+            assert changed == assets.refresh_asset_hierarchy(asset_hierarchy)
+            assert 80 == assets.search_for_assets.call_args[1]["min_last_updated_time"]
+        assert [1, 2, 6, 10] == asset_hierarchy.path(10)
+        assert 95 == asset_hierarchy.last_updated_time
+
+    def test_refresh_asset_hierarchy_with_many_assets_updated_at_once(self, asset_hierarchy):
+        # More assets than fit in a page share a timestamp
+        changed = [{"id": 10 + i, "parentId": 1, "lastUpdatedTime": 90} for i in range(5)]
+        changed.append({"id": 20, "parentId": 1, "lastUpdatedTime": 95})
+
+        def search_for_assets(min_last_updated_time=None, max_last_updated_time=None, autopaging=False, **kwargs):
+            items = [
+                item
+                for item in changed
+                if min_last_updated_time <= item["lastUpdatedTime"] <= (max_last_updated_time or float("inf"))
+            ]
+            if not autopaging:
+                items = items[: kwargs["limit"]]
+            return AssetListResponse({"data": {"items": items}})
+
+        with mock.patch.object(assets, "search_for_assets", side_effect=search_for_assets):
+            with mock.patch.object(assets, "_LIMIT", 3):
+                refreshed = assets.refresh_asset_hierarchy(asset_hierarchy)
+        assert sorted(item["id"] for item in changed) == sorted(item["id"] for item in refreshed)
+        assert all(asset_id in asset_hierarchy for asset_id in range(10, 15))
+        assert 95 == asset_hierarchy.last_updated_time
+
+
+class TestCrawlAssetSubtree:
+    @pytest.fixture
+    def mock_subtree(self):
+        # Root 1 with 3 children, each with 3 children, each with 5 children
+        items = {1: {"id": 1, "parentId": None, "depth": 0}}
+        next_id = 2
+        for parent_depth in range(3):
+            for parent in [item for item in list(items.values()) if item["depth"] == parent_depth]:
+                for _ in range(3 if parent_depth < 2 else 5):
+                    items[next_id] = {"id": next_id, "parentId": parent["id"], "depth": parent_depth + 1}
+                    next_id += 1
+        hierarchy = AssetHierarchy(list(items.values()))
+
+        def get_asset_subtree(asset_id, depth=None, limit=None, cursor=None, autopaging=False):
+            ids = hierarchy.subtree(asset_id, depth=depth)
+            start = int(cursor or 0)
+            end = len(ids) if autopaging else start + 2
+            next_cursor = str(end) if end < len(ids) else None
+            return AssetListResponse(
+                {"data": {"items": [items[id] for id in ids[start:end]], "nextCursor": next_cursor}}
+            )
+
+        with mock.patch.object(assets, "get_asset_subtree", side_effect=get_asset_subtree) as m:
+            yield items, m
+
+    def test_crawl_asset_subtree(self, mock_subtree):
+        items, get_mock = mock_subtree
+        res = assets.crawl_asset_subtree(1, split_depth=1, workers=3)
+        assert isinstance(res, AssetListResponse)
+        assert sorted(items) == sorted(asset.id for asset in res)
+        branches = {call[0][0] for call in get_mock.call_args_list}
+        assert {1, 2, 3, 4} == branches
+
+    def test_crawl_asset_subtree_with_sink(self, mock_subtree):
+        items, _ = mock_subtree
+        pages = []
+        assert assets.crawl_asset_subtree(1, split_depth=2, sink=pages.append) is None
+        ids = [item["id"] for page in pages for item in page]
+        assert sorted(items) == sorted(ids)
+        assert len(pages) > 1
+
+    def test_crawl_asset_subtree_deeper_than_tree(self, mock_subtree):
+        items, _ = mock_subtree
+        res = assets.crawl_asset_subtree(1, split_depth=5)
+        assert sorted(items) == sorted(asset.id for asset in res)
+
+
+class TestPostAssetHierarchy:
+    @pytest.fixture
+    def mock_post(self):
+        next_id = [100]
+
+        def post(url, body):
+            items = []
+            for item in body["items"]:
+                items.append(dict(item, id=next_id[0]))
+                next_id[0] += 1
+            return mock.Mock(json=lambda: {"data": {"items": items}})
+
+        with mock.patch.object(assets, "_post", side_effect=post) as m:
+            with mock.patch.object(assets, "_LIMIT", 2):
+                yield m
+
+    def test_post_asset_hierarchy(self, mock_post):
+        to_post = [
+            Asset("pump", parent_ref_id="area"),
+            Asset("valve", parent_name="pump"),
+            Asset("area", ref_id="area", parent_name="plant"),
+            Asset("plant"),
+            Asset("other area", parent_name="plant"),
+            Asset("sensor", parent_id=42),
+        ]
+        res = assets.post_asset_hierarchy(to_post, workers=2)
+
+        names = [asset.name for asset in res]
+        assert ["pump", "valve", "area", "plant", "other area", "sensor"] == names
+        created = {asset.name: asset for asset in res}
+        assert created["area"].id == created["pump"].parent_id
+        assert created["pump"].id == created["valve"].parent_id
+        assert created["plant"].id == created["area"].parent_id
+        assert 42 == created["sensor"].parent_id
+
+        posted_levels = [[item["name"] for item in call[1]["body"]["items"]] for call in mock_post.call_args_list]
+        assert [["plant", "sensor"], ["area", "other area"], ["pump"], ["valve"]] == posted_levels
+        assert to_post[0].parent_id is None and to_post[0].parent_ref_id == "area"
+
+    def test_post_assets_with_references_above_limit_uses_hierarchy(self, mock_post):
+        to_post = [Asset("root", ref_id="root")] + [Asset("child", parent_ref_id="root") for _ in range(2)]
+        res = assets.post_assets(to_post)
+        assert 3 == len(res)
+        assert 2 == mock_post.call_count
+        assert {res[0].id} == {asset.parent_id for asset in res[1:]}
+
+    def test_post_assets_above_limit(self, mock_post):
+        res = assets.post_assets([Asset("a"), Asset("b"), Asset("c")])
+        assert ["a", "b", "c"] == [asset.name for asset in res]
+        assert 2 == mock_post.call_count
+
+    def test_post_asset_hierarchy_with_cycle(self, mock_post):
+        with pytest.raises(ValueError):
+            assets.post_asset_hierarchy(
+                [Asset("a", ref_id="a", parent_ref_id="b"), Asset("b", ref_id="b", parent_ref_id="a")]
+            )
+        assert 0 == mock_post.call_count
+
+    def test_post_asset_hierarchy_with_unknown_parent(self, mock_post):
+        with pytest.raises(ValueError):
+            assets.post_asset_hierarchy([Asset("a", parent_ref_id="b")])
+
+    def test_post_asset_hierarchy_with_failing_request(self, mock_post):
+        post = mock_post.side_effect
+
+        def fail_on_c(url, body):
+            if "c" in [item["name"] for item in body["items"]]:
+                raise APIError("Something went wrong", 500)
+            return post(url, body)
+
+        mock_post.side_effect = fail_on_c
+        to_post = [
+            Asset("plant"),
+            Asset("a", parent_name="plant"),
+            Asset("b", parent_name="plant"),
+            Asset("c", parent_name="plant"),
+            Asset("pump", parent_name="a"),
+        ]
+        with pytest.raises(BulkOperationError) as e:
+            assets.post_asset_hierarchy(to_post)
+
+        assert 500 == e.value.code
+        assert ["plant", "a", "b"] == [item["name"] for item in e.value.successful]
+        assert e.value.successful[0]["id"] == e.value.successful[1]["parentId"]
+        assert [to_post[3], to_post[4]] == e.value.failed
+        assert 3 == mock_post.call_count
+
+
+class TestSyncAssetHierarchy:
+    @pytest.fixture
+    def current_assets(self):
+        items = [
+            {"id": 1, "name": "plant", "sourceId": "plant", "parentId": None, "metadata": {}},
+            {"id": 2, "name": "area", "sourceId": "area", "parentId": 1, "metadata": {"a": "b"}},
+            {"id": 3, "name": "pump", "sourceId": "pump", "parentId": 2, "description": "old"},
+            {"id": 4, "name": "old valve", "sourceId": "valve", "parentId": 3},
+            {"id": 5, "name": "unmanaged", "parentId": 1},
+        ]
+        with mock.patch.object(assets, "get_assets", return_value=AssetListResponse({"data": {"items": items}})):
+            yield items
+
+    @pytest.fixture
+    def desired_assets(self):
+        return [
+            Asset("plant", source_id="plant"),
+            Asset("area", source_id="area", parent_ref_id="plant", metadata={"a": "b"}),
+            Asset("new area", source_id="new area", parent_ref_id="plant"),
+            Asset("pump", source_id="pump", parent_ref_id="new area", description="new"),
+        ]
+
+    def test_diff_asset_hierarchy(self, current_assets, desired_assets):
+        diff = assets.diff_asset_hierarchy(desired_assets, delete=True)
+        assert ["new area"] == [asset.name for asset in diff.create]
+        assert 1 == diff.create[0].parent_id and diff.create[0].parent_ref_id is None
+        assert [{"id": 3, "description": {"set": "new"}}] == diff.update
+        assert {3: "new area"} == diff._new_parents
+        assert [4] == diff.delete
+        assert desired_assets[2].parent_ref_id == "plant"
+
+    def test_diff_asset_hierarchy_from_data_frame(self, current_assets):
+        df = pd.DataFrame({"name": ["plant", "area"], "source_id": ["plant", "area"], "parent_ref_id": [None, "plant"]})
+        assert 0 == len(assets.diff_asset_hierarchy(df))
+
+    def test_diff_asset_hierarchy_clears_fields(self, current_assets):
+        desired = [Asset("area", source_id="area", parent_id=1, description="", metadata={})]
+        assert [{"id": 2, "description": {"set": ""}, "metadata": {"set": {}}}] == assets.diff_asset_hierarchy(
+            desired
+        ).update
+
+    def test_diff_asset_hierarchy_from_data_frame_with_parent_ids(self, current_assets):
+        df = pd.DataFrame(
+            {"name": ["plant", "pump"], "source_id": ["plant", "pump"], "parent_id": [None, 1], "metadata": [{}, None]}
+        )
+        diff = assets.diff_asset_hierarchy(df)
+        assert [{"id": 3, "parentId": {"set": 1}}] == diff.update
+        assert int == type(diff.update[0]["parentId"]["set"])
+
+    def test_diff_asset_hierarchy_requires_unique_source_ids(self, current_assets):
+        with pytest.raises(ValueError):
+            assets.diff_asset_hierarchy([Asset("a", source_id="a"), Asset("b", source_id="a")])
+
+    def test_sync_asset_hierarchy(self, current_assets, desired_assets):
+        created = AssetListResponse({"data": {"items": [{"id": 10, "name": "new area", "sourceId": "new area"}]}})
+        with mock.patch.object(assets, "post_asset_hierarchy", return_value=created) as post_hierarchy:
+            with mock.patch.object(assets, "_post") as post:
+                assets.sync_asset_hierarchy(desired_assets, delete=True)
+        assert 1 == post_hierarchy.call_count
+        calls = {call[0][0]: call[1]["body"]["items"] for call in post.call_args_list}
+        assert [{"id": 3, "description": {"set": "new"}, "parentId": {"set": 10}}] == calls["/assets/update"]
+        assert [4] == calls["/assets/delete"]
@@ -12,6 +12,7 @@ from cognite.client.stable.datapoints import (
     Datapoint,
     DatapointsQuery,
     DatapointsResponse,
+    DatapointsResponseIterator,
     LatestDatapointResponse,
     TimeseriesWithDatapoints,
 )
@@ -22,6 +23,7 @@ from tests.conftest import (
     TEST_TS_REASONABLE_INTERVAL,
     TEST_TS_REASONABLE_INTERVAL_DATETIME,
 )
+from tests.utils import import_pyarrow, requires_pyarrow
 
 client = CogniteClient()
 
@@ -255,3 +257,351 @@ class TestMultiTimeseriesDatapoints:
 
         assert isinstance(result[0], TimeseriesWithDatapoints)
         assert len(result) == 1
+
+
+class TestEventWindowAggregates:
+    @pytest.fixture
+    def mock_get_latest(self):
+        def get_latest(name):
+            value = "on" if name == "string" else 1.0
+            return LatestDatapointResponse({"data": {"items": [{"timestamp": 0, "value": value}]}})
+
+        with mock.patch.object(client.datapoints, "get_latest", side_effect=get_latest) as m:
+            yield m
+
+    @pytest.fixture
+    def mock_get_dps(self, mock_get_latest):
+        def get_dps(name, start=None, end=None, **kwargs):
+            offset = 0 if name == "a" else 3
+            timestamps = np.array([t for t in range(start - start % 10, end, 10) if t >= start], dtype=np.int64)
+            # Split the span into two pages, the first one possibly empty
+            middle = len(timestamps) // 2
+            return [
+                (timestamps[:middle], (timestamps[:middle] % 97 + offset).astype(np.float64)),
+                (timestamps[middle:], (timestamps[middle:] % 97 + offset).astype(np.float64)),
+            ]
+
+        with mock.patch.object(client.datapoints, "_get_datapoints_pages", side_effect=get_dps) as m:
+            yield m
+
+    def test_get_event_window_aggregates(self, mock_get_dps):
+        events = [
+            {"id": 1, "startTime": 0, "endTime": 1000},
+            {"id": 2, "startTime": 500, "endTime": 1500},
+            {"id": 3, "startTime": 5000, "endTime": 5003},
+            {"id": 4, "startTime": 10000, "endTime": 10505},
+        ]
+        res = client.datapoints.get_event_window_aggregates(events, ["a", "b"], workers=3)
+
+        # The two overlapping events are fetched as one window, and the other windows are too far apart to be joined
+        assert 2 * 3 == mock_get_dps.call_count
+        assert [1, 2, 3, 4] == list(res.index)
+        assert ["{}|{}".format(n, a) for n in "ab" for a in ["count", "sum", "mean", "min", "max"]] == list(res.columns)
+        for name, offset in [("a", 0), ("b", 3)]:
+            for event in events:
+                values = pd.Series(
+                    [float(t % 97 + offset) for t in range(0, 20000, 10) if event["startTime"] <= t < event["endTime"]]
+                )
+                row = res.loc[event["id"]]
+                assert len(values) == row[name + "|count"]
+                if len(values):
+                    assert values.sum() == pytest.approx(row[name + "|sum"])
+                    assert values.mean() == pytest.approx(row[name + "|mean"])
+                    assert values.min() == row[name + "|min"]
+                    assert values.max() == row[name + "|max"]
+                else:
+                    assert row[[name + "|sum", name + "|mean", name + "|min", name + "|max"]].isnull().all()
+
+    def test_get_event_window_aggregates_with_aliases(self, mock_get_dps):
+        res = client.datapoints.get_event_window_aggregates(
+            [{"id": 1, "startTime": 0, "endTime": 100}], ["a"], aggregates=["avg"]
+        )
+        assert ["a|mean"] == list(res.columns)
+        assert 45.0 == res.loc[1, "a|mean"]
+
+    def test_get_event_window_aggregates_coalesces_nearby_windows(self, mock_get_dps):
+        events = [{"id": i, "startTime": i * 150, "endTime": i * 150 + 100} for i in range(10)]
+        events.append({"id": 10, "startTime": 100000, "endTime": 100100})
+        res = client.datapoints.get_event_window_aggregates(events, ["a"], aggregates=["count"])
+
+        spans = sorted((call[1]["start"], call[1]["end"]) for call in mock_get_dps.call_args_list)
+        assert [(0, 1450), (100000, 100100)] == spans
+        assert [10] * 11 == list(res["a|count"])
+
+    def test_get_event_window_aggregates_of_string_time_series(self, mock_get_dps):
+        with pytest.raises(ValueError, match="string time series: \\['string'\\]"):
+            client.datapoints.get_event_window_aggregates([{"id": 1, "startTime": 0, "endTime": 100}], ["a", "string"])
+        assert 0 == mock_get_dps.call_count
+
+    def test_get_event_window_aggregates_without_end_time(self):
+        with pytest.raises(ValueError, match="endTime"):
+            client.datapoints.get_event_window_aggregates([{"id": 1, "startTime": 0}], ["a"])
+
+
+class TestDatapointsToArrow:
+    @requires_pyarrow
+    def test_to_arrow(self):
+        pa = import_pyarrow()
+        dps = [{"timestamp": 1000, "value": 1.5}, {"timestamp": 2000, "value": 2.5}]
+        table = DatapointsResponse({"data": {"items": [{"name": "a", "datapoints": dps}]}}).to_arrow()
+        assert ["timestamp", "value"] == table.column_names
+        assert pa.int64() == table.schema.field("timestamp").type
+        assert pa.float64() == table.schema.field("value").type
+        assert [1.5, 2.5] == table.column("value").to_pylist()
+
+    @requires_pyarrow
+    def test_iterator_to_arrow(self):
+        pa = import_pyarrow()
+        responses = DatapointsResponseIterator(
+            [
+                DatapointsResponse({"data": {"items": [{"name": "a", "datapoints": [{"timestamp": 1, "max": 1}]}]}}),
+                DatapointsResponse({"data": {"items": [{"name": "b", "datapoints": []}]}}),
+                DatapointsResponse(
+                    {"data": {"items": [{"name": "c", "datapoints": [{"timestamp": 2, "max": 2.5, "min": 0.5}]}]}}
+                ),
+            ]
+        )
+        table = responses.to_arrow()
+        assert ["name", "timestamp", "max", "min"] == table.column_names
+        assert pa.types.is_dictionary(table.schema.field("name").type)
+        assert pa.float64() == table.schema.field("max").type
+        assert ["a", "c"] == table.column("name").to_pylist()
+        assert [1.0, 2.5] == table.column("max").to_pylist()
+        assert [None, 0.5] == table.column("min").to_pylist()
+
+    @requires_pyarrow
+    def test_to_arrow_from_decoded_pages(self):
+        pa = import_pyarrow()
+        pages = [
+            (np.array([1, 2], dtype=np.int64), np.array([1.5, 2.5])),
+            (np.array([3], dtype=np.int64), np.array([3.5])),
+        ]
+        res = DatapointsResponse._from_pages("a", pages)
+        table = res.to_arrow()
+        assert pa.int64() == table.schema.field("timestamp").type
+        assert [1, 2, 3] == table.column("timestamp").to_pylist()
+        assert [1.5, 2.5, 3.5] == table.column("value").to_pylist()
+        # Built from the arrays without creating datapoint dicts
+        assert "datapoints" not in res.internal_representation["data"]["items"][0]
+
+    @requires_pyarrow
+    def test_to_arrow_from_decoded_string_pages(self):
+        pa = import_pyarrow()
+        pages = [
+            (np.array([1, 2], dtype=np.int64), pd.Categorical(["on", "off"])),
+            (np.array([3], dtype=np.int64), pd.Categorical(["fault"])),
+        ]
+        table = DatapointsResponse._from_pages("a", pages).to_arrow()
+        assert pa.types.is_dictionary(table.schema.field("value").type)
+        assert ["on", "off", "fault"] == table.column("value").to_pylist()
+
+    def test_decoded_pages_to_json_and_pandas(self):
+        pages = [(np.array([1, 2], dtype=np.int64), pd.Categorical(["on", "off"])), [{"timestamp": 3, "value": "on"}]]
+        res = DatapointsResponse._from_pages("a", pages)
+        assert "a" == res.name
+        assert [1, 2, 3] == [dp["timestamp"] for dp in res.datapoints]
+        assert ["on", "off", "on"] == [dp["value"] for dp in res.datapoints]
+        df = DatapointsResponse._from_pages("a", pages[:1]).to_pandas()
+        assert [1, 2] == df["timestamp"].tolist()
+        assert "category" == df["value"].dtype
+
+
+class TestExportDatapointsToParquet:
+    DAY = 86400000
+
+    @staticmethod
+    def pages(name, aggregates=None, granularity=None, start=None, end=None, **kwargs):
+        timestamps = [t for t in range(0, 3 * TestExportDatapointsToParquet.DAY, 3600000) if start <= t < end]
+        for i in range(0, len(timestamps), 10):
+            page_timestamps = np.array(timestamps[i : i + 10], dtype=np.int64)
+            yield page_timestamps, (page_timestamps // 3600000).astype(np.float64)
+
+    @staticmethod
+    def read_export(directory, name):
+        import pyarrow.parquet as pq
+
+        series_directory = directory.join(name)
+        return sorted(
+            row
+            for path in series_directory.listdir()
+            for row in zip(*[pq.read_table(str(path)).column(c).to_pylist() for c in ["timestamp", "value"]])
+        )
+
+    @requires_pyarrow
+    def test_export_datapoints_to_parquet(self, tmpdir):
+        with mock.patch.object(client.datapoints, "_iter_raw_datapoints_pages", side_effect=self.pages):
+            counts = client.datapoints.export_datapoints_to_parquet(
+                ["a", "b/c"], start=0, end=3 * self.DAY, directory=str(tmpdir), workers=2
+            )
+        assert {"a": 72, "b/c": 72} == counts
+        assert ["0.parquet", "172800000.parquet", "86400000.parquet"] == sorted(
+            p.basename for p in tmpdir.join("b%2Fc").listdir()
+        )
+        expected = [(t, float(t // 3600000)) for t in range(0, 3 * self.DAY, 3600000)]
+        assert expected == self.read_export(tmpdir, "a")
+
+    @requires_pyarrow
+    def test_export_datapoints_to_parquet_resumes(self, tmpdir):
+        import pyarrow.parquet as pq
+
+        def failing_pages(name, aggregates=None, granularity=None, start=None, end=None, **kwargs):
+            for i, page in enumerate(self.pages(name, start=start, end=end)):
+                if i == 4:
+                    raise RuntimeError("connection lost")
+                yield page
+
+        with mock.patch.object(client.datapoints, "_iter_raw_datapoints_pages", side_effect=failing_pages):
+            with pytest.raises(RuntimeError):
+                client.datapoints.export_datapoints_to_parquet(["a"], start=0, end=3 * self.DAY, directory=str(tmpdir))
+        assert ["0.parquet", "86400000.parquet.tmp"] == sorted(p.basename for p in tmpdir.join("a").listdir())
+        # The unfinished file is closed properly
+        assert 16 == pq.read_table(str(tmpdir.join("a", "86400000.parquet.tmp"))).num_rows
+
+        with mock.patch.object(client.datapoints, "_iter_raw_datapoints_pages", side_effect=self.pages) as m:
+            counts = client.datapoints.export_datapoints_to_parquet(
+                ["a"], start=0, end=3 * self.DAY, directory=str(tmpdir)
+            )
+        # Continues from the first incomplete bucket
+        assert self.DAY == m.call_args[0][3]
+        assert {"a": 48} == counts
+        expected = [(t, float(t // 3600000)) for t in range(0, 3 * self.DAY, 3600000)]
+        assert expected == self.read_export(tmpdir, "a")
+
+        with mock.patch.object(client.datapoints, "_iter_raw_datapoints_pages", side_effect=self.pages) as m:
+            counts = client.datapoints.export_datapoints_to_parquet(
+                ["a"], start=0, end=3 * self.DAY, directory=str(tmpdir)
+            )
+        assert {"a": 0} == counts
+        assert 0 == m.call_count
+
+    @requires_pyarrow
+    def test_export_datapoints_to_parquet_does_not_resume_other_queries(self, tmpdir):
+        with mock.patch.object(client.datapoints, "_iter_raw_datapoints_pages", side_effect=self.pages):
+            client.datapoints.export_datapoints_to_parquet(["a"], start=0, end=self.DAY, directory=str(tmpdir))
+        with mock.patch.object(client.datapoints, "_iter_raw_datapoints_pages", side_effect=self.pages) as m:
+            with pytest.raises(ValueError, match="other parameters"):
+                client.datapoints.export_datapoints_to_parquet(
+                    ["b", "a"], start=0, end=2 * self.DAY, directory=str(tmpdir)
+                )
+            assert 0 == m.call_count
+            counts = client.datapoints.export_datapoints_to_parquet(
+                ["a"], start=0, end=2 * self.DAY, directory=str(tmpdir), resume=False
+            )
+        assert {"a": 48} == counts
+
+    @requires_pyarrow
+    def test_export_aggregates_with_missing_and_null_columns(self, tmpdir):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        def pages(name, aggregates=None, granularity=None, start=None, end=None, **kwargs):
+            assert "avg,max" == aggregates
+            yield [{"timestamp": 0, "average": None, "max": 1}, {"timestamp": 1, "max": 2}]
+            yield [{"timestamp": 2, "average": 2.5}]
+
+        with mock.patch.object(client.datapoints, "_iter_raw_datapoints_pages", side_effect=pages):
+            counts = client.datapoints.export_datapoints_to_parquet(
+                ["a"], start=0, end=self.DAY, directory=str(tmpdir), aggregates=["avg", "max"], granularity="1s"
+            )
+        assert {"a": 3} == counts
+        table = pq.read_table(str(tmpdir.join("a", "0.parquet")))
+        assert ["timestamp", "average", "max"] == table.column_names
+        assert pa.float64() == table.schema.field("average").type
+        assert [None, None, 2.5] == table.column("average").to_pylist()
+        assert [1.0, 2.0, None] == table.column("max").to_pylist()
+
+    @requires_pyarrow
+    def test_export_string_datapoints(self, tmpdir):
+        import pyarrow.parquet as pq
+
+        def pages(name, aggregates=None, granularity=None, start=None, end=None, **kwargs):
+            yield np.array([0, 1], dtype=np.int64), pd.Categorical(["on", "off"])
+
+        with mock.patch.object(client.datapoints, "_iter_raw_datapoints_pages", side_effect=pages):
+            client.datapoints.export_datapoints_to_parquet(["a"], start=0, end=self.DAY, directory=str(tmpdir))
+        assert ["on", "off"] == pq.read_table(str(tmpdir.join("a", "0.parquet"))).column("value").to_pylist()
+
+
+class TestProtobufPaging:
+    def test_get_datapoints_helper_decodes_protobuf_pages(self):
+        from cognite.client._auxiliary._protobuf_descriptors import _api_timeseries_data_v2_pb2
+
+        def get(url, params=None, headers=None):
+            ts_data = _api_timeseries_data_v2_pb2.TimeseriesData()
+            for t in range(params["start"], min(params["end"], params["start"] + params["limit"])):
+                point = ts_data.numericData.points.add()
+                point.timestamp = t
+                point.value = t / 2
+            return mock.MagicMock(content=ts_data.SerializeToString())
+
+        with mock.patch.object(client.datapoints, "_get", side_effect=get) as m:
+            with mock.patch.object(client.datapoints, "_LIMIT", 4):
+                dps = client.datapoints._get_datapoints_helper("a", start=0, end=10)
+        assert 3 == m.call_count
+        assert [{"timestamp": t, "value": t / 2} for t in range(10)] == dps
+
+    def test_get_datapoints_helper_decodes_string_pages(self):
+        from cognite.client._auxiliary._protobuf_descriptors import _api_timeseries_data_v2_pb2
+
+        def get(url, params=None, headers=None):
+            ts_data = _api_timeseries_data_v2_pb2.TimeseriesData()
+            for t in range(params["start"], params["end"]):
+                point = ts_data.stringData.points.add()
+                point.timestamp = t
+                point.value = "on" if t % 2 else "off"
+            return mock.MagicMock(content=ts_data.SerializeToString())
+
+        with mock.patch.object(client.datapoints, "_get", side_effect=get):
+            dps = client.datapoints._get_datapoints_helper("a", start=0, end=4)
+        assert [{"timestamp": t, "value": "on" if t % 2 else "off"} for t in range(4)] == dps
+        df = DatapointsResponse({"data": {"items": [{"name": "a", "datapoints": dps}]}}).to_pandas()
+        assert "category" == df["value"].dtype
+        assert ["off", "on"] == sorted(df["value"].cat.categories)
+
+    @requires_pyarrow
+    def test_string_values_to_arrow(self):
+        pa = import_pyarrow()
+        dps = [{"timestamp": 1, "value": "on"}, {"timestamp": 2, "value": "on"}]
+        table = DatapointsResponse({"data": {"items": [{"name": "a", "datapoints": dps}]}}).to_arrow()
+        assert pa.types.is_dictionary(table.schema.field("value").type)
+        assert ["on", "on"] == table.column("value").to_pylist()
+
+
+class TestIncludeOutsidePoints:
+    TIMESTAMPS = [-50, 5, 10, 20, 35, 40, 99, 100, 150]
+
+    def get(self, url, params=None, headers=None):
+        from cognite.client._auxiliary._protobuf_descriptors import _api_timeseries_data_v2_pb2
+
+        inside = [t for t in self.TIMESTAMPS if params["start"] <= t < params["end"]][: params["limit"]]
+        if params["includeOutsidePoints"]:
+            before = [t for t in self.TIMESTAMPS if t < params["start"]][-1:]
+            after = [t for t in self.TIMESTAMPS if t >= params["end"]][:1]
+            inside = before + inside + after
+        ts_data = _api_timeseries_data_v2_pb2.TimeseriesData()
+        for t in inside:
+            point = ts_data.numericData.points.add()
+            point.timestamp = t
+            point.value = t
+        return mock.MagicMock(content=ts_data.SerializeToString())
+
+    @pytest.mark.parametrize("start, end", [(10, 100), (11, 99), (0, 200), (-100, 30), (151, 300)])
+    def test_outside_points_are_stitched_in(self, start, end):
+        with mock.patch.object(client.datapoints, "_get", side_effect=self.get) as m:
+            res = client.datapoints.get_datapoints("a", start, end, include_outside_points=True, workers=4)
+        expected = (
+            [t for t in self.TIMESTAMPS if t < start][-1:]
+            + [t for t in self.TIMESTAMPS if start <= t < end]
+            + [t for t in self.TIMESTAMPS if t >= end][:1]
+        )
+        assert expected == [dp["timestamp"] for dp in res.to_json()["datapoints"]]
+        # The windows are fetched in parallel, with outside points only in the two boundary requests
+        window_calls = [c for c in m.call_args_list if not c[1]["params"]["includeOutsidePoints"]]
+        assert 4 == len(window_calls)
+        assert 2 == m.call_count - len(window_calls)
+
+    def test_without_outside_points(self):
+        with mock.patch.object(client.datapoints, "_get", side_effect=self.get) as m:
+            res = client.datapoints.get_datapoints("a", 10, 100, workers=4)
+        assert [10, 20, 35, 40, 99] == [dp["timestamp"] for dp in res.to_json()["datapoints"]]
+        assert 4 == m.call_count
@@ -5,6 +5,7 @@ import pytest
 from cognite.client.stable.events import EventListResponse, EventResponse
 from cognite.client.stable.files import FileInfoResponse
 from cognite.client.stable.time_series import TimeSeriesResponse
+from tests.utils import import_pyarrow, requires_pyarrow
 
 
 @pytest.fixture(scope="module", params=["ts", "file", "event", "eventlist"])
@@ -33,3 +34,68 @@ class TestDTOs:
         get_response_obj.to_pandas()
         get_response_obj.to_json()
         assert repr == get_response_obj.internal_representation
+
+
+class TestCollectionToPandas:
+    EVENTS = [
+        {"id": 1, "type": "a", "startTime": 10, "metadata": {"md1": "x", "type": "md_type"}, "assetIds": [1, 2]},
+        {"id": 2, "type": "b", "startTime": 20, "endTime": 30},
+        {"id": 3, "type": "a", "startTime": 30, "metadata": {"md2": "y"}},
+    ]
+
+    def test_to_pandas(self):
+        df = EventListResponse({"data": {"items": deepcopy(self.EVENTS)}}).to_pandas()
+        assert ["id", "type", "startTime", "assetIds", "md1", "endTime", "md2"] == list(df.columns)
+        assert "int64" == df["id"].dtype
+        assert "int64" == df["startTime"].dtype
+        assert "Int64" == df["endTime"].dtype
+        assert "category" == df["type"].dtype
+        # Fields take precedence over metadata with the same name
+        assert ["a", "b", "a"] == list(df["type"])
+        assert ["x", None, None] == list(df["md1"])
+        assert [[1, 2], None, None] == list(df["assetIds"])
+
+    def test_to_pandas_keeps_precision_of_large_ids(self):
+        items = [{"id": 2 ** 62 + 1, "parentId": 2 ** 62 + 3}, {"id": 2 ** 62 + 3, "parentId": None}]
+        df = EventListResponse({"data": {"items": items}}).to_pandas()
+        assert [2 ** 62 + 1, 2 ** 62 + 3] == df["id"].tolist()
+        assert 2 ** 62 + 3 == df["parentId"][0]
+        assert df["parentId"].isnull()[1]
+
+    def test_to_pandas_with_columns(self):
+        df = EventListResponse({"data": {"items": deepcopy(self.EVENTS)}}).to_pandas(columns=["md2", "id", "unknown"])
+        assert ["md2", "id", "unknown"] == list(df.columns)
+        assert [None, None, "y"] == list(df["md2"])
+        assert [None, None, None] == list(df["unknown"])
+
+    def test_to_pandas_without_metadata(self):
+        df = EventListResponse({"data": {"items": deepcopy(self.EVENTS)}}).to_pandas(include_metadata=False)
+        assert ["id", "type", "startTime", "assetIds", "endTime"] == list(df.columns)
+
+    def test_to_pandas_empty(self):
+        assert EventListResponse({"data": {"items": []}}).to_pandas().empty
+
+
+class TestCollectionToArrow:
+    @requires_pyarrow
+    def test_to_arrow(self):
+        pa = import_pyarrow()
+        table = EventListResponse({"data": {"items": deepcopy(TestCollectionToPandas.EVENTS)}}).to_arrow()
+        assert ["id", "type", "startTime", "assetIds", "md1", "endTime", "md2"] == table.column_names
+        assert pa.int64() == table.schema.field("id").type
+        assert pa.types.is_dictionary(table.schema.field("type").type)
+        assert pa.list_(pa.int64()) == table.schema.field("assetIds").type
+        assert [1, 2, 3] == table.column("id").to_pylist()
+        assert [None, 30, None] == table.column("endTime").to_pylist()
+
+    @requires_pyarrow
+    def test_to_arrow_with_columns(self):
+        table = EventListResponse({"data": {"items": deepcopy(TestCollectionToPandas.EVENTS)}}).to_arrow(
+            columns=["id", "md2"]
+        )
+        assert ["id", "md2"] == table.column_names
+        assert [None, None, "y"] == table.column("md2").to_pylist()
+
+    @requires_pyarrow
+    def test_to_arrow_empty(self):
+        assert 0 == EventListResponse({"data": {"items": []}}).to_arrow().num_rows
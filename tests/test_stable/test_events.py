@@ -1,8 +1,12 @@
+import random
+from unittest import mock
+
 import pandas as pd
 import pytest
 
 import cognite.client.stable.events
 from cognite.client import APIError, CogniteClient
+from tests.conftest import MockReturnValue
 
 events = CogniteClient().events
 
@@ -84,3 +88,113 @@ def test_delete_event(post_event):
 
 def test_search_for_events(get_post_event_obj):
     events.search_for_events(description="hahaha")
+
+
+class TestIterEvents:
+    @pytest.fixture
+    def mock_get(self):
+        # Sparse events early on, and a dense burst of events later
+        start_times = list(range(0, 100000, 1000)) + list(range(500000, 500500))
+        items = [{"id": i, "type": "t", "startTime": start_time} for i, start_time in enumerate(start_times)]
+        items.append({"id": len(items), "type": "t", "startTime": None})
+
+        def get(url, params, autopaging=False):
+            matches = [item for item in items if item["startTime"] is not None]
+            if params.get("minStartTime") is not None:
+                matches = [item for item in matches if item["startTime"] >= params["minStartTime"]]
+            if params.get("maxStartTime") is not None:
+                matches = [item for item in matches if item["startTime"] <= params["maxStartTime"]]
+            if url == "/events/search":
+                matches = sorted(matches, key=lambda item: item["startTime"], reverse=params["dir"] == "desc")
+            if not autopaging:
+                matches = matches[: params["limit"]]
+            return MockReturnValue(json_data={"data": {"items": matches}})
+
+        with mock.patch.object(events, "_get", side_effect=get) as m:
+            with mock.patch.object(events, "_LIMIT", 100):
+                yield m
+
+    def test_iter_events(self, mock_get):
+        windows = list(events.iter_events(type="t", workers=2))
+        ids = [item["id"] for window in windows for item in window.to_json()]
+        assert list(range(600)) == ids
+        start_times = [window.to_json()[0]["startTime"] for window in windows if len(window) > 0]
+        assert sorted(start_times) == start_times
+        # The dense burst is split into several windows
+        assert sum(1 for window in windows if len(window) and window.to_json()[0]["startTime"] >= 500000) > 1
+
+    def test_iter_events_with_time_range(self, mock_get):
+        windows = list(events.iter_events(min_start_time=50000, max_start_time=500100, workers=3))
+        start_times = [item["startTime"] for window in windows for item in window.to_json()]
+        assert list(range(50000, 100000, 1000)) + list(range(500000, 500100)) == start_times
+
+    def test_get_events_with_workers(self, mock_get):
+        res = events.get_events(type="t", autopaging=True, workers=4)
+        assert isinstance(res, cognite.client.stable.events.EventListResponse)
+        assert list(range(600)) == [event.id for event in res]
+
+
+class TestEventIndex:
+    @pytest.fixture(scope="class")
+    def index_events(self):
+        rng = random.Random(42)
+        index_events = []
+        for i in range(500):
+            start = rng.randint(0, 100000)
+            event = {"id": i, "startTime": start, "assetIds": rng.sample(range(20), rng.randint(0, 3))}
+            if i % 10 != 0:
+                event["endTime"] = start + rng.randint(0, 5000)
+            index_events.append(event)
+        return index_events
+
+    @staticmethod
+    def brute_force(index_events, start, end, asset_ids=None):
+        matches = [
+            e
+            for e in index_events
+            if e["startTime"] <= end
+            and e.get("endTime", float("inf")) >= start
+            and (asset_ids is None or set(asset_ids) & set(e["assetIds"]))
+        ]
+        return sorted(e["id"] for e in matches)
+
+    def test_overlapping(self, index_events):
+        index = cognite.client.stable.events.EventIndex(index_events)
+        rng = random.Random(1)
+        for _ in range(100):
+            start = rng.randint(-1000, 110000)
+            end = start + rng.randint(0, 3000)
+            res = index.overlapping(start, end)
+            assert isinstance(res, cognite.client.stable.events.EventListResponse)
+            assert self.brute_force(index_events, start, end) == sorted(e.id for e in res)
+            start_times = [e.start_time for e in res]
+            assert sorted(start_times) == start_times
+
+    def test_at_with_asset_ids(self, index_events):
+        index = cognite.client.stable.events.EventIndex(index_events)
+        for timestamp in range(0, 100000, 7919):
+            expected = self.brute_force(index_events, timestamp, timestamp, asset_ids=[3, 4])
+            assert expected == sorted(e.id for e in index.at(timestamp, asset_ids=[3, 4]))
+
+    def test_for_assets(self, index_events):
+        index = cognite.client.stable.events.EventIndex(index_events)
+        expected = sorted(e["id"] for e in index_events if {5, 19} & set(e["assetIds"]))
+        assert expected == sorted(e.id for e in index.for_assets([5, 19, 1000]))
+        assert 0 == len(index.for_assets([1000]))
+
+    def test_empty_index(self):
+        index = cognite.client.stable.events.EventIndex([])
+        assert 0 == len(index)
+        assert 0 == len(index.overlapping(0, 1000))
+        assert 0 == len(index.for_assets([1]))
+
+    def test_save_and_load(self, index_events, tmpdir):
+        index = cognite.client.stable.events.EventIndex(index_events)
+        path = str(tmpdir.join("index.npz"))
+        index.save(path)
+        loaded = cognite.client.stable.events.EventIndex.load(path)
+        assert len(index) == len(loaded)
+        assert (
+            index.overlapping(1000, 2000, asset_ids=[1]).to_json()
+            == loaded.overlapping(1000, 2000, asset_ids=[1]).to_json()
+        )
@@ -1,9 +1,22 @@
 import gzip
 import json
 
+import pytest
+
 
 def get_call_args_data_from_mock(mock, index, decompress_gzip=False):
     data = mock.call_args_list[index][1]["data"]
     if decompress_gzip:
         data = gzip.decompress(data).decode()
     return json.loads(data)
+
+
+def import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+    return pyarrow
+
+
+requires_pyarrow = pytest.mark.skipif(import_pyarrow() is None, reason="pyarrow is not installed")